@@ -90,6 +90,43 @@ class TradeAttribution:
         self.attributed_trades: List[AttributedTrade] = []
         self.round_trips: List[Dict] = []
 
+    @classmethod
+    def from_ledger(
+        cls,
+        ledger: np.ndarray,
+        price_data: pd.DataFrame,
+        symbol: str = 'NQ',
+        point_value: float = 20.0,
+        regime_series: pd.Series = None,
+        atr_series: pd.Series = None
+    ) -> 'TradeAttribution':
+        """
+        Attribution of a VectorEngine run from its trade ledger
+        (``result['trades']``, see vector_engine.TRADE_DTYPE): round trips
+        and MAE/MFE come from the ledger instead of pairing fills and
+        rescanning bars. ``price_data`` is the frame the run used.
+        """
+        attribution = cls([], price_data, regime_series, atr_series)
+        index = attribution.price_data.index
+        for rec in ledger:
+            entry_price = float(rec['entry_price'])
+            side = int(rec['side'])
+            attribution.round_trips.append({
+                'symbol': symbol,
+                'side': 'BUY' if side == 1 else 'SELL',
+                'entry_time': index[rec['entry_bar']],
+                'exit_time': index[rec['exit_bar']],
+                'entry_price': entry_price,
+                'exit_price': float(rec['exit_price']),
+                'quantity': 1,
+                'realized_pnl': side * (float(rec['exit_price']) - entry_price) * point_value,
+                # Ledger excursions are points; attribution uses signed % of entry
+                'mae': -float(rec['mae']) / entry_price,
+                'mfe': float(rec['mfe']) / entry_price,
+                'hold_bars': int(rec['exit_bar'] - rec['entry_bar'] + 1),
+            })
+        return attribution
+
     def _build_round_trips(self) -> List[Dict]:
         """
         Convert sequential trade log into round-trip trades (entry + exit pairs).
@@ -317,7 +354,10 @@ class TradeAttribution:
             exit_quality = self._calculate_exit_quality(exit_time, exit_price, side)
 
             # MAE/MFE
-            mae, mfe = self._calculate_mae_mfe(entry_time, exit_time, entry_price, side)
+            if 'mae' in rt:
+                mae, mfe = rt['mae'], rt['mfe']
+            else:
+                mae, mfe = self._calculate_mae_mfe(entry_time, exit_time, entry_price, side)
 
             # MAE/MFE ratios
             if abs(mae) > 0:
@@ -335,11 +375,14 @@ class TradeAttribution:
             mae_ratio = abs(pnl_pct / mae) if mae != 0 else 0
 
             # Hold time
-            try:
-                mask = (self.price_data.index >= entry_time) & (self.price_data.index <= exit_time)
-                hold_bars = mask.sum()
-            except Exception:
-                hold_bars = 0
+            if 'hold_bars' in rt:
+                hold_bars = rt['hold_bars']
+            else:
+                try:
+                    mask = (self.price_data.index >= entry_time) & (self.price_data.index <= exit_time)
+                    hold_bars = mask.sum()
+                except Exception:
+                    hold_bars = 0
 
             # Timing context
             hour = entry_time.hour if hasattr(entry_time, 'hour') else 0
@@ -750,7 +793,8 @@ class WinLossDecomposition:
 def analyze_trades(
     trade_log: List[Dict],
     price_data: pd.DataFrame,
-    regime_series: pd.Series = None
+    regime_series: pd.Series = None,
+    ledger: Optional[np.ndarray] = None
 ) -> Dict:
     """
     Main entry point for trade attribution analysis.
@@ -759,12 +803,16 @@ def analyze_trades(
         trade_log: Portfolio trade log
         price_data: OHLCV DataFrame
         regime_series: Optional regime labels
+        ledger: Optional VectorEngine trade ledger, used instead of trade_log
 
     Returns:
         Complete attribution analysis
     """
     # Build attribution
-    attribution = TradeAttribution(trade_log, price_data, regime_series)
+    if ledger is not None:
+        attribution = TradeAttribution.from_ledger(ledger, price_data, regime_series=regime_series)
+    else:
+        attribution = TradeAttribution(trade_log, price_data, regime_series)
     trades_df = attribution.attribute_trades()
 
     if trades_df.empty:
@@ -0,0 +1,501 @@
+"""
+Columnar Bar Cache
+==================
+Binary on-disk cache for normalized OHLCV frames.
+
+Parsing the A2API CSVs (1M+ bars) with pandas takes ~8s per load, and the
+research engine, WFO and sweep optimizers construct data handlers over and
+over. The first load of a source file writes its *normalized* frame (ET
+wall-clock DatetimeIndex, capitalized columns, Volume present, sorted) as raw
+little-endian column files plus a JSON manifest. Later loads read the columns
+back with ``np.fromfile`` and skip CSV parsing and timestamp normalization
+entirely.
+
+Layout:
+    <cache_dir>/<source-name>-<path-digest>/
+        manifest.json   - source fingerprint, row count, column dtypes
+        index.i8        - DatetimeIndex as int64 ticks (unit in manifest)
+        Open.col ...    - one file per numeric column
+        levels/<interval>/  - resampled pyramid levels, same layout
+
+Large sources can be written incrementally with ``open_writer`` (one chunk
+at a time, so peak memory is bounded by the chunk size), and ``load`` can
+read a ``[start, end]`` window: the index file is memory-mapped and
+binary-searched, and only the matching row range of each column is read.
+
+An entry is valid only while its source fingerprint (path + size + mtime +
+content hash) still matches. The content hash is a blake2b digest over the
+file size and its first and last megabyte, so validating a multi-GB source
+costs two small reads instead of a full pass over the file.
+
+Plain CSV entries also record an append anchor (size, head/tail block
+hashes, trailing newline). When a source has only grown since it was
+cached (same head, same bytes at the old end), ``appended_offset`` reports
+where the new rows start and ``open_writer(..., resume=True)`` appends the
+parsed tail to the existing columns instead of rebuilding the entry.
+
+Entries are keyed by absolute source path, so ``prune`` runs whenever a new
+entry is written: it drops entries whose source file no longer exists and
+then the oldest entries beyond ``max_entries``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+_HASH_BLOCK = 1 << 20  # 1 MB head/tail sample for the content hash
+_MANIFEST = "manifest.json"
+_INDEX_FILE = "index.i8"
+_LEVELS_DIR = "levels"
+# Compressed sources cannot be tail-appended
+_ARCHIVE_EXTS = (".zip", ".gz", ".zst", ".bz2", ".xz")
+DEFAULT_MAX_ENTRIES = 64
+
+
+def default_cache_dir() -> str:
+    """Default cache root, next to the yfinance download cache."""
+    return os.path.join(os.getcwd(), "cache", "bars")
+
+
+def source_fingerprint(path: str) -> Dict[str, Any]:
+    """Fingerprint a source file by path, size, mtime and sampled content hash."""
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(st.st_size).encode())
+    with open(abs_path, "rb") as f:
+        digest.update(f.read(_HASH_BLOCK))
+        if st.st_size > _HASH_BLOCK:
+            f.seek(max(_HASH_BLOCK, st.st_size - _HASH_BLOCK))
+            digest.update(f.read(_HASH_BLOCK))
+    return {
+        "path": abs_path,
+        "size": int(st.st_size),
+        "mtime": float(st.st_mtime),
+        "content_hash": digest.hexdigest(),
+    }
+
+
+def _block_hash(f, offset: int, length: int) -> str:
+    f.seek(offset)
+    return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+def append_anchor(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Markers that let a later load recognize that a plain CSV only grew:
+    its size, hashes of the first and last block, and whether it ends on a
+    complete line. None for compressed sources.
+    """
+    if path.lower().endswith(_ARCHIVE_EXTS):
+        return None
+    size = os.path.getsize(path)
+    tail_start = max(0, size - _HASH_BLOCK)
+    with open(path, "rb") as f:
+        anchor = {
+            "size": int(size),
+            "head_hash": _block_hash(f, 0, min(size, _HASH_BLOCK)),
+            "tail_hash": _block_hash(f, tail_start, size - tail_start),
+        }
+        f.seek(max(0, size - 1))
+        anchor["ends_with_newline"] = size > 0 and f.read(1) == b"\n"
+    return anchor
+
+
+class BarCache:
+    """
+    Reads and writes normalized bar frames keyed by source file fingerprint.
+    """
+
+    def __init__(self, cache_dir: str = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_entries = max_entries
+
+    def entry_dir(self, source_path: str) -> str:
+        """Directory holding the cached columns for a source file."""
+        abs_path = os.path.abspath(source_path)
+        name = os.path.basename(abs_path)
+        path_digest = hashlib.sha1(abs_path.encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{name}-{path_digest}")
+
+    def level_dir(self, source_path: str, level: str) -> str:
+        """Directory holding a resampled pyramid level of a source file."""
+        return os.path.join(self.entry_dir(source_path), _LEVELS_DIR, level)
+
+    def read_manifest(self, source_path: str, level: str = None) -> Optional[Dict[str, Any]]:
+        """Return the manifest for a source file, or None if absent/corrupt."""
+        entry = self.level_dir(source_path, level) if level else self.entry_dir(source_path)
+        manifest_path = os.path.join(entry, _MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != CACHE_VERSION:
+            return None
+        return manifest
+
+    def is_valid(self, source_path: str, manifest: Dict[str, Any] = None) -> bool:
+        """True if the cached entry still matches the source file."""
+        manifest = manifest or self.read_manifest(source_path)
+        if manifest is None or not os.path.exists(source_path):
+            return False
+        return manifest.get("source") == source_fingerprint(source_path)
+
+    def load(self, source_path: str, start=None, end=None) -> Optional[pd.DataFrame]:
+        """
+        Load the cached frame for a source file; None on miss or stale entry.
+        With ``start``/``end``, only rows inside the inclusive window are read.
+        """
+        manifest = self.read_manifest(source_path)
+        if manifest is None or not self.is_valid(source_path, manifest):
+            return None
+        try:
+            return self._read_frame(self.entry_dir(source_path), manifest, start, end)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Bar cache read failed for {source_path}: {e}")
+            return None
+
+    def load_level(self, source_path: str, level: str) -> Optional[pd.DataFrame]:
+        """Load a cached pyramid level; None on miss or stale entry."""
+        manifest = self.read_manifest(source_path, level)
+        if manifest is None or not self.is_valid(source_path, manifest):
+            return None
+        try:
+            return self._read_frame(self.level_dir(source_path, level), manifest)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Bar cache read failed for {source_path} [{level}]: {e}")
+            return None
+
+    def store_levels(self, source_path: str, levels: Dict[str, pd.DataFrame]) -> bool:
+        """Write resampled pyramid levels derived from a source file."""
+        try:
+            fingerprint = source_fingerprint(source_path)
+            for level, df in levels.items():
+                entry = self.level_dir(source_path, level)
+                if os.path.exists(entry):
+                    shutil.rmtree(entry)
+                os.makedirs(entry, exist_ok=True)
+                manifest = self._write_frame(entry, df)
+                manifest["source"] = fingerprint
+                manifest["level"] = level
+                self._write_manifest(entry, manifest)
+            return True
+        except OSError as e:
+            logger.warning(f"Bar cache level write failed for {source_path}: {e}")
+            return False
+
+    def store(self, source_path: str, df: pd.DataFrame) -> bool:
+        """
+        Write a normalized frame for a source file.
+
+        Only numeric columns are stored. The manifest is written last, so a
+        crash mid-write leaves an entry that simply reads as a miss.
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            return False
+        entry = self.entry_dir(source_path)
+        try:
+            fingerprint = source_fingerprint(source_path)
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            os.makedirs(entry, exist_ok=True)
+            manifest = self._write_frame(entry, df)
+            manifest["source"] = fingerprint
+            manifest["anchor"] = append_anchor(source_path)
+            self._write_manifest(entry, manifest)
+        except OSError as e:
+            logger.warning(f"Bar cache write failed for {source_path}: {e}")
+            return False
+        self.prune(keep=entry)
+        return True
+
+    def open_writer(self, source_path: str, resume: bool = False) -> "BarCacheWriter":
+        """
+        Start an incremental (chunk-by-chunk) write of a source file's entry.
+        With ``resume=True`` chunks are appended to the existing entry.
+        """
+        return BarCacheWriter(self, source_path, resume=resume)
+
+    def appended_offset(self, source_path: str) -> Optional[int]:
+        """
+        Byte offset where new rows start if the source only grew since it
+        was cached (the cached bytes are unchanged), else None.
+        """
+        manifest = self.read_manifest(source_path)
+        anchor = manifest.get("anchor") if manifest else None
+        if not anchor or not anchor.get("ends_with_newline") or not os.path.exists(source_path):
+            return None
+        old_size = anchor["size"]
+        if os.path.getsize(source_path) <= old_size:
+            return None
+        tail_start = max(0, old_size - _HASH_BLOCK)
+        try:
+            with open(source_path, "rb") as f:
+                if _block_hash(f, 0, min(old_size, _HASH_BLOCK)) != anchor["head_hash"]:
+                    return None
+                if _block_hash(f, tail_start, old_size - tail_start) != anchor["tail_hash"]:
+                    return None
+        except OSError:
+            return None
+        return old_size
+
+    def prune(self, keep: str = None) -> int:
+        """
+        Drop entries whose source file no longer exists, then the least
+        recently written entries beyond ``max_entries``. Entries without a
+        manifest are skipped (they may be mid-write). Returns the number of
+        entries removed.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+
+        removed = 0
+        live = []
+        for name in names:
+            entry = os.path.join(self.cache_dir, name)
+            manifest_path = os.path.join(entry, _MANIFEST)
+            try:
+                with open(manifest_path, "r") as f:
+                    source = json.load(f).get("source") or {}
+                written = os.path.getmtime(manifest_path)
+            except (OSError, ValueError, AttributeError):
+                continue
+            if entry != keep and not os.path.exists(source.get("path", "")):
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+            else:
+                live.append((entry == keep, written, entry))
+
+        if self.max_entries is not None and len(live) > self.max_entries:
+            live.sort()
+            for _, _, entry in live[:len(live) - self.max_entries]:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def invalidate(self, source_path: str):
+        """Drop the cached entry for a source file."""
+        entry = self.entry_dir(source_path)
+        if os.path.exists(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Column file IO
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _column_file(column: str) -> str:
+        return f"{column}.col"
+
+    def _write_frame(self, entry: str, df: pd.DataFrame) -> Dict[str, Any]:
+        index = df.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        unit = np.datetime_data(index.dtype)[0]
+        np.ascontiguousarray(index.asi8, dtype="<i8").tofile(os.path.join(entry, _INDEX_FILE))
+
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                continue
+            arr = np.ascontiguousarray(series.to_numpy())
+            arr = arr.astype(arr.dtype.newbyteorder("<"), copy=False)
+            arr.tofile(os.path.join(entry, self._column_file(str(col))))
+            columns[str(col)] = arr.dtype.str
+
+        return {
+            "version": CACHE_VERSION,
+            "rows": int(len(df)),
+            "index_name": index.name,
+            "index_unit": unit,
+            "columns": columns,
+        }
+
+    @staticmethod
+    def _write_manifest(entry: str, manifest: Dict[str, Any]):
+        tmp_path = os.path.join(entry, _MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(entry, _MANIFEST))
+
+    @staticmethod
+    def _window_rows(entry: str, manifest: Dict[str, Any], start, end):
+        """Row range [lo, hi) of the cached index inside [start, end]."""
+        rows = manifest["rows"]
+        index_path = os.path.join(entry, _INDEX_FILE)
+        if os.path.getsize(index_path) != rows * 8:
+            raise ValueError(f"index file size does not match {rows} rows")
+        if rows == 0:
+            return 0, 0
+        unit = manifest["index_unit"]
+
+        def to_tick(ts) -> int:
+            return int(pd.Timestamp(ts).to_datetime64().astype(f"M8[{unit}]").view("i8"))
+
+        ticks = np.memmap(index_path, dtype="<i8", mode="r", shape=(rows,))
+        try:
+            lo = 0 if start is None else int(np.searchsorted(ticks, to_tick(start), side="left"))
+            hi = rows if end is None else int(np.searchsorted(ticks, to_tick(end), side="right"))
+        finally:
+            del ticks
+        return lo, max(lo, hi)
+
+    def _read_frame(self, entry: str, manifest: Dict[str, Any], start=None, end=None) -> pd.DataFrame:
+        lo, hi = self._window_rows(entry, manifest, start, end)
+        count = hi - lo
+        ticks = np.fromfile(os.path.join(entry, _INDEX_FILE), dtype="<i8", count=count, offset=lo * 8)
+        if len(ticks) != count:
+            raise ValueError(f"index has {len(ticks)} rows, expected {count}")
+        index = pd.DatetimeIndex(ticks.view(f"M8[{manifest['index_unit']}]"), name=manifest.get("index_name"))
+
+        data = {}
+        for col, dtype in manifest["columns"].items():
+            itemsize = np.dtype(dtype).itemsize
+            arr = np.fromfile(os.path.join(entry, self._column_file(col)), dtype=dtype,
+                              count=count, offset=lo * itemsize)
+            if len(arr) != count:
+                raise ValueError(f"column {col} has {len(arr)} rows, expected {count}")
+            data[col] = arr
+        return pd.DataFrame(data, index=index, copy=False)
+
+
+class BarCacheWriter:
+    """
+    Appends normalized chunks to a cache entry.
+
+    Chunks must arrive in ascending time order with the same columns; any
+    violation aborts the write (the entry then simply reads as a miss).
+    Nothing is valid until ``commit()`` writes the manifest.
+
+    A resumed writer continues an existing entry: its first chunk must start
+    strictly after the last cached bar, and derived pyramid levels are
+    dropped on commit.
+    """
+
+    def __init__(self, cache: BarCache, source_path: str, resume: bool = False):
+        self.source_path = source_path
+        self.entry = cache.entry_dir(source_path)
+        self.rows = 0
+        self.failed = False
+        self.resume = resume
+        self._cache = cache
+        self._columns: Optional[Dict[str, str]] = None
+        self._unit: Optional[str] = None
+        self._index_name = None
+        self._last_tick: Optional[int] = None
+        try:
+            self._fingerprint = source_fingerprint(source_path)
+            self._anchor = append_anchor(source_path)
+            if resume:
+                self._resume_from(cache.read_manifest(source_path))
+            else:
+                if os.path.exists(self.entry):
+                    shutil.rmtree(self.entry)
+                os.makedirs(self.entry, exist_ok=True)
+        except (OSError, ValueError) as e:
+            self._fail(f"Bar cache write failed for {source_path}: {e}")
+
+    def _resume_from(self, manifest: Optional[Dict[str, Any]]):
+        if manifest is None:
+            raise ValueError("no cached entry to append to")
+        rows = manifest["rows"]
+        index_path = os.path.join(self.entry, _INDEX_FILE)
+        if os.path.getsize(index_path) != rows * 8:
+            raise ValueError("cached index does not match its manifest")
+        self.rows = rows
+        self._columns = dict(manifest["columns"])
+        self._unit = manifest["index_unit"]
+        self._index_name = manifest.get("index_name")
+        if rows:
+            last = np.fromfile(index_path, dtype="<i8", count=1, offset=(rows - 1) * 8)
+            self._last_tick = int(last[0])
+
+    def append(self, df: pd.DataFrame) -> bool:
+        """Append one chunk; returns False once the write has failed."""
+        if self.failed or df.empty:
+            return not self.failed
+        if not isinstance(df.index, pd.DatetimeIndex):
+            return self._fail("chunk has no DatetimeIndex")
+
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        if self._columns is None:
+            self._unit = np.datetime_data(index.dtype)[0]
+            self._index_name = index.name
+            self._columns = {}
+            for col in df.columns:
+                dtype = df[col].dtype
+                if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                    self._columns[str(col)] = np.dtype(dtype).newbyteorder("<").str
+        ticks = index.as_unit(self._unit).asi8
+        if not index.is_monotonic_increasing or (self._last_tick is not None and ticks[0] < self._last_tick):
+            return self._fail(f"chunks of {self.source_path} are not in time order")
+        if self.resume and self._last_tick is not None and ticks[0] == self._last_tick:
+            return self._fail(f"appended rows of {self.source_path} overlap the last cached bar")
+
+        try:
+            with open(os.path.join(self.entry, _INDEX_FILE), "ab") as f:
+                np.ascontiguousarray(ticks, dtype="<i8").tofile(f)
+            for col, dtype in self._columns.items():
+                if col not in df.columns:
+                    return self._fail(f"column {col} missing from chunk")
+                arr = df[col].to_numpy()
+                if not np.can_cast(arr.dtype, dtype, casting="same_kind"):
+                    return self._fail(f"column {col} changed dtype to {arr.dtype}")
+                with open(os.path.join(self.entry, BarCache._column_file(col)), "ab") as f:
+                    np.ascontiguousarray(arr, dtype=dtype).tofile(f)
+        except OSError as e:
+            return self._fail(f"Bar cache write failed for {self.source_path}: {e}")
+
+        self._last_tick = int(ticks[-1])
+        self.rows += len(df)
+        return True
+
+    def commit(self) -> bool:
+        """Write the manifest, making the entry valid."""
+        if self.failed or self._columns is None:
+            self.abort()
+            return False
+        manifest = {
+            "version": CACHE_VERSION,
+            "rows": int(self.rows),
+            "index_name": self._index_name,
+            "index_unit": self._unit,
+            "columns": self._columns,
+            "source": self._fingerprint,
+            "anchor": self._anchor,
+        }
+        try:
+            if self.resume:
+                shutil.rmtree(os.path.join(self.entry, _LEVELS_DIR), ignore_errors=True)
+            BarCache._write_manifest(self.entry, manifest)
+        except OSError as e:
+            self._fail(f"Bar cache write failed for {self.source_path}: {e}")
+            return False
+        if not self.resume:
+            self._cache.prune(keep=self.entry)
+        return True
+
+    def abort(self):
+        """Discard a partial entry."""
+        self.failed = True
+        shutil.rmtree(self.entry, ignore_errors=True)
+
+    def _fail(self, reason: str) -> bool:
+        logger.warning(reason)
+        self.abort()
+        return False
@@ -0,0 +1,164 @@
+"""
+Bounded Bar History
+===================
+Fixed-capacity, per-symbol history of replayed bars.
+
+The data handlers used to append every ``Bar`` to a list forever, so a
+15-year 1m event run held millions of objects just so
+``get_latest_bars(symbol, N)`` could slice the tail. ``BarHistory`` keeps
+only the last ``capacity`` bars in numpy arrays, so memory is O(lookback)
+instead of O(history).
+
+The arrays are ``2 * capacity`` long and written linearly; when the end is
+reached the last ``capacity`` bars are copied to the front (amortized O(1)
+per bar). Any tail of up to ``capacity`` bars is therefore contiguous, and
+``window(N)`` returns a ``BarWindow`` over zero-copy slices. Once bars
+have been dropped, the handlers' ``get_latest_bars`` raises for windows
+longer than the retained bars instead of returning a shorter one;
+strategies declare larger lookbacks up front (``Strategy.history_bars``).
+
+A window is only valid until the next bar is appended: its views point at
+live buffer memory that later appends may overwrite.
+"""
+
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .schema import Bar
+
+# Covers most in-repo lookbacks; longer ones (NqOrbEnhanced's HTF filter,
+# CleanOrb15m's macro filter) declare Strategy.history_bars
+DEFAULT_HISTORY = 5000
+
+
+class BarWindow:
+    """
+    The most recent bars of one symbol, oldest first.
+
+    Behaves like a read-only list of ``Bar`` (len, indexing, slicing,
+    iteration), and exposes the fields as read-only numpy views for
+    vectorized indicator code: ``open``, ``high``, ``low``, ``close``,
+    ``volume`` and ``timestamps``.
+    """
+
+    __slots__ = ('bars', 'timestamps', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, bars, timestamps, open, high, low, close, volume):
+        self.bars = bars
+        self.timestamps = timestamps
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def __iter__(self) -> Iterator[Bar]:
+        return iter(self.bars)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return BarWindow(self.bars[item], self.timestamps[item], self.open[item], self.high[item],
+                             self.low[item], self.close[item], self.volume[item])
+        return self.bars[item]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (BarWindow, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BarWindow({list(self.bars)!r})"
+
+    def to_list(self):
+        """The bars as a plain list."""
+        return self.bars.tolist()
+
+
+class BarHistory:
+    """
+    Ring buffer of the last ``capacity`` bars of one symbol.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY):
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = int(capacity)
+        self._start = 0
+        self._end = 0
+        self._last: Optional[Bar] = None
+        self.dropped = 0  # bars evicted past the capacity
+        self._allocate(2 * self.capacity)
+
+    def _allocate(self, size: int):
+        self._bars = np.empty(size, dtype=object)
+        self._times = np.empty(size, dtype=object)
+        self._open = np.empty(size, dtype=np.float64)
+        self._high = np.empty(size, dtype=np.float64)
+        self._low = np.empty(size, dtype=np.float64)
+        self._close = np.empty(size, dtype=np.float64)
+        self._volume = np.empty(size, dtype=np.float64)
+
+    def _buffers(self):
+        return (self._bars, self._times, self._open, self._high, self._low, self._close, self._volume)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, bar: Bar):
+        end = self._end
+        if end == len(self._bars):
+            self._compact()
+            end = self._end
+        # Scalar stores into separate 1-D arrays are ~2x cheaper than one
+        # column store into a 2-D array
+        self._bars[end] = bar
+        self._times[end] = bar.timestamp
+        self._open[end] = bar.open
+        self._high[end] = bar.high
+        self._low[end] = bar.low
+        self._close[end] = bar.close
+        self._volume[end] = bar.volume
+        self._end = end + 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+            self.dropped += 1
+        self._last = bar
+
+    def _compact(self):
+        """Move the retained bars to the front of the buffers."""
+        n = self._end - self._start
+        src = slice(self._start, self._end)
+        for buf in self._buffers():
+            buf[:n] = buf[src]
+        # Drop references to evicted bars
+        self._bars[n:] = None
+        self._times[n:] = None
+        self._start, self._end = 0, n
+
+    def latest(self) -> Optional[Bar]:
+        return self._last
+
+    def reserve(self, capacity: int):
+        """Grow the capacity, keeping the retained bars."""
+        if capacity <= self.capacity:
+            return
+        n = len(self)
+        retained = [buf[self._start:self._end].copy() for buf in self._buffers()]
+        self.capacity = int(capacity)
+        self._allocate(2 * self.capacity)
+        for buf, values in zip(self._buffers(), retained):
+            buf[:n] = values
+        self._start, self._end = 0, n
+
+    def window(self, n: int) -> BarWindow:
+        """The last ``n`` bars (fewer if not enough history)."""
+        n = max(0, min(int(n), len(self)))
+        sl = slice(self._end - n, self._end)
+        views = [buf[sl] for buf in self._buffers()]
+        for view in views:
+            view.flags.writeable = False
+        return BarWindow(*views)
@@ -0,0 +1,102 @@
+"""
+Multi-Timeframe Bar Pyramid
+===========================
+Derives 5m/15m/30m/1h/daily bars from a fine-grained (usually 1m) base once,
+so multi-interval studies pay for one load instead of one resample each.
+
+Levels are built as a cascade (1m -> 5m -> 15m -> 30m, then 1h and daily
+from 30m). OHLCV aggregation (first/max/min/last/sum) is associative and
+each level's bins nest inside the bins it is derived into, so the cascade
+gives exactly the same bars as resampling the base directly.
+
+ET session alignment (the index is naive ET wall clock):
+- Sub-hour levels are anchored at midnight, so 09:30 (RTH open, the ORB
+  window start) and 18:00 (overnight session open) are always bin edges.
+  This matches the historical ``df.resample(freq)`` output.
+- Hourly bars are offset by 30 minutes (09:30-10:30, ...), so the first RTH
+  hour is not mixed with pre-market bars.
+- Daily bars follow the CME session: 18:00 ET to 18:00 ET, labelled with the
+  date the session ends. Overnight bars therefore belong to the next
+  trading day, the same convention the overnight strategy uses.
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+PYRAMID_LEVELS = ('5m', '15m', '30m', '1h', '1d')
+
+_OHLCV_LOGIC = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+}
+
+_SESSION_OPEN = pd.Timedelta(hours=18)
+
+
+def interval_minutes(interval: str) -> Optional[int]:
+    """'15m' -> 15, '1h' -> 60, '1d' -> 1440; None if unrecognized."""
+    match = re.fullmatch(r'(\d+)\s*(m|min|h|d)', str(interval).strip().lower())
+    if not match:
+        return None
+    value, unit = int(match.group(1)), match.group(2)
+    return value * {'m': 1, 'min': 1, 'h': 60, 'd': 1440}[unit]
+
+
+def interval_to_freq(interval: str) -> Optional[str]:
+    """Pandas frequency string for an interval ('15m' -> '15min')."""
+    minutes = interval_minutes(interval)
+    if minutes is None:
+        return None
+    if minutes % 60 == 0 and minutes < 1440:
+        return f"{minutes // 60}h"
+    return f"{minutes}min"
+
+
+def resample_bars(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Resamples OHLCV bars to ``interval`` on ET session-aligned bins."""
+    minutes = interval_minutes(interval)
+    if minutes is None:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    logic = {k: v for k, v in _OHLCV_LOGIC.items() if k in df.columns}
+
+    if minutes >= 1440:
+        # CME session day: [18:00 prev day, 18:00), labelled by end date
+        out = df.resample('24h', offset='18h').agg(logic).dropna()
+        out.index = (out.index + pd.Timedelta(days=1)).normalize()
+        return out
+
+    if minutes >= 60:
+        out = df.resample(f"{minutes}min", offset='30min').agg(logic)
+    else:
+        out = df.resample(f"{minutes}min").agg(logic)
+    return out.dropna()
+
+
+def build_pyramid(df: pd.DataFrame, levels: Iterable[str] = PYRAMID_LEVELS) -> Dict[str, pd.DataFrame]:
+    """
+    Builds every requested level coarser than the base frame's spacing,
+    each derived from the previous (finer) level.
+    """
+    if len(df) < 2:
+        return {}
+    base_minutes = (df.index[1] - df.index[0]).total_seconds() / 60
+
+    pyramid = {}
+    source = df
+    for level in sorted(levels, key=lambda lv: interval_minutes(lv) or 0):
+        minutes = interval_minutes(level)
+        if minutes is None or minutes <= base_minutes:
+            continue
+        bars = resample_bars(source, level)
+        pyramid[level] = bars
+        # Offset hourly bins (17:30-18:30) straddle the 18:00 session edge,
+        # so hourly and daily bars are both derived from sub-hour levels.
+        if minutes < 60:
+            source = bars
+    return pyramid
@@ -1,3 +1,4 @@
+import io
 import os
 import time
 import pandas as pd
@@ -6,12 +7,21 @@ try:
     import yfinance as yf
 except ImportError:
     yf = None
+try:
+    import zstandard  # noqa: F401  (pandas uses it for .zst sources)
+    _HAS_ZSTD = True
+except ImportError:
+    _HAS_ZSTD = False
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Generator
+from typing import List, Dict, Optional, Sequence
 from datetime import datetime
 from .schema import Bar
 from .monitor import PipelineMonitor
+from .bar_cache import BarCache
+from .bar_pyramid import PYRAMID_LEVELS, build_pyramid, interval_minutes, resample_bars
+from .replay import ALIGN_ARRIVAL, BarMerger, BarReplay
+from .bar_history import BarHistory, DEFAULT_HISTORY
 
 class DataHandler(ABC):
     @abstractmethod
@@ -19,24 +29,39 @@ class DataHandler(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_latest_bars(self, symbol: str, N: int = 1) -> List[Bar]:
+    def get_latest_bars(self, symbol: str, N: int = 1) -> Sequence[Bar]:
         raise NotImplementedError
 
     @abstractmethod
     def update_bars(self) -> bool:
         raise NotImplementedError
 
+    def reserve_history(self, n: int):
+        """Hint that callers will request up to n bars from get_latest_bars."""
+        pass
+
 class SmartDataHandler(DataHandler):
     """
     Smart Data Handler:
     1. Looks for CSV in local directories.
     2. If not found, downloads from Yahoo Finance.
-    3. Caches downloads? (Maybe V2).
+    3. Caches normalized local files as binary columns (see bar_cache.py),
+       so reloads skip CSV parsing and timestamp normalization. Compressed
+       .csv.zip/.gz/.zst sources are decompressed only on the first load.
+    4. Resampling builds the whole 5m..1h bar pyramid once (see
+       bar_pyramid.py); other intervals of the same file then load directly.
+    5. With start/end dates, only bars inside the range (plus a one-day
+       margin for resampling) are materialized, from the cache or by
+       streaming the CSV in chunks.
+    6. Multiple symbols replay in timestamp order; ``align`` selects
+       'arrival' or forward-filled 'synchronized' steps (see replay.py).
     """
 
     def __init__(self, symbol_list: List[str], search_dirs: List[str] = None, 
                  start_date: datetime = None, end_date: datetime = None, 
-                 interval: str = '1d'):
+                 interval: str = '1d', use_cache: bool = True, cache_dir: str = None,
+                 chunk_rows: int = 500_000, history: int = DEFAULT_HISTORY,
+                 align: str = ALIGN_ARRIVAL):
         self.symbol_list = symbol_list
         self.start_date = pd.to_datetime(start_date) if start_date else None
         self.end_date = pd.to_datetime(end_date) if end_date else None
@@ -51,85 +76,58 @@ class SmartDataHandler(DataHandler):
         # Add current directory and examples
         self.search_dirs.append(os.path.join(os.getcwd(), 'examples'))
         self.search_dirs.append(os.getcwd())
+        # Compressed data archives (utils/compress_data.py)
+        self.search_dirs.append(os.path.join(os.getcwd(), 'data'))
         
+        # Columnar cache of normalized local files (skips CSV parsing on reload)
+        self.bar_cache = BarCache(cache_dir) if use_cache else None
+        self._source_path: Optional[str] = None
+        # Local CSVs are parsed in chunks of this many rows (bounds peak memory)
+        self.chunk_rows = chunk_rows
+
         # Internal data structures
         self.symbol_data: Dict[str, pd.DataFrame] = {}
-        self.latest_symbol_data: Dict[str, List[Bar]] = {}
+        # Bars kept per symbol for get_latest_bars (ring buffer, see reserve_history)
+        self.history = history
+        self.latest_symbol_data: Dict[str, BarHistory] = {}
         self.continue_backtest = True
-        self._bar_generators: Dict[str, Generator] = {}
+        self._replays: Dict[str, BarReplay] = {}
+        # symbol -> (local source path, size, mtime) at load time
+        self._sources: Dict[str, tuple] = {}
         
         self._load_data()
 
+        # Multi-symbol replay in timestamp order
+        self._merger = BarMerger(self._replays, self.symbol_list, align)
+        self.updated_symbols: List[str] = []
+        self.current_time = None
+
     def _load_data(self):
         for symbol in self.symbol_list:
-            df = self._fetch_data(symbol)
-            
-            if df is None or df.empty:
-                raise ValueError(f"Could not find or download data for {symbol}")
+            self._source_path = None
+            # Precomputed pyramid level for this interval (skips the base load)
+            df = self._load_cached_level(symbol)
 
-            # Standardize Columns
-            df.columns = [c.capitalize() for c in df.columns]
-            
-            # Ensure Date Index
-            # CRITICAL: Preserve ET wall clock times (9:30 AM ET stays 9:30)
-            # which the ORB strategy and all session-time logic depends on.
-            # Our CSV timestamps like "2010-06-02 18:05:00 -04:00" already
-            # represent ET local time with a UTC offset suffix. We strip the
-            # offset and parse the first 19 chars directly (fast path).
-            # Fallback to the slower utc→tz_convert path for other formats.
-            date_col = next((c for c in df.columns if c in ['Date', 'Datetime', 'Time']), None)
-            if date_col:
-                sample = str(df[date_col].iloc[0])
-                # Fast path: timestamps with UTC offset suffix like "2010-06-02 18:05:00 -04:00"
-                # The local time portion (first 19 chars) is already ET wall clock time
-                if len(sample) > 19 and ('+' in sample[19:] or '-' in sample[19:]):
-                    df[date_col] = pd.to_datetime(df[date_col].astype(str).str[:19], format='%Y-%m-%d %H:%M:%S')
-                else:
-                    # Fallback: parse with timezone, convert to ET
-                    raw_dt = pd.to_datetime(df[date_col], utc=True)
-                    df[date_col] = raw_dt.dt.tz_convert('America/New_York').dt.tz_localize(None)
-                df.set_index(date_col, inplace=True)
+            if df is None:
+                df = self._load_normalized(symbol, *self._read_window())
             
-            # Ensure Volume column exists (some CSVs lack it)
-            if 'Volume' not in df.columns:
-                df['Volume'] = 0.0
+                windowed = self.start_date is not None or self.end_date is not None
+                if df is None or (df.empty and not windowed):
+                    raise ValueError(f"Could not find or download data for {symbol}")
 
-            # Ensure sorting
-            df.sort_index(inplace=True)
-            
-            # Remove timezone if exists (safety net)
-            # Always convert to ET first to preserve wall clock times
-            if hasattr(df.index, 'tz_localize'):
-                if df.index.tz is not None:
-                    df.index = df.index.tz_convert('America/New_York').tz_localize(None)
-                # else: already naive (ET wall clock), leave as-is
-
-            # --- Resampling Logic ---
-            # If current data frequency doesn't match requested interval
-            # Note: We assume input data freq can be inferred or specified
-            if self.interval and self.interval != '1d':
-                # Map interval like '15m' to pandas freq '15min'
-                # Use regex to only replace trailing 'm' (not 'min', 'max', etc.)
-                import re
-                freq = re.sub(r'(\d+)m$', r'\1min', self.interval).replace('h', 'H')
-                
-                # Check current frequency (crude check)
-                if len(df) > 1:
-                    actual_diff = (df.index[1] - df.index[0]).total_seconds() / 60
-                    target_diff = pd.to_timedelta(freq).total_seconds() / 60
+                # --- Resampling Logic ---
+                # If current data frequency doesn't match requested interval
+                # Note: We assume input data freq can be inferred or specified
+                if self.interval and self.interval != '1d':
+                    target_diff = interval_minutes(self.interval)
                     
-                    if actual_diff < target_diff:
-                        print(f"Resampling data for {symbol} from {actual_diff}m to {self.interval}...")
-                        logic = {
-                            'Open' : 'first',
-                            'High' : 'max',
-                            'Low'  : 'min',
-                            'Close': 'last',
-                            'Volume': 'sum'
-                        }
-                        # Filter existing columns to avoid errors
-                        existing_logic = {k: v for k, v in logic.items() if k in df.columns}
-                        df = df.resample(freq).apply(existing_logic).dropna()
+                    # Check current frequency (crude check)
+                    if len(df) > 1 and target_diff:
+                        actual_diff = (df.index[1] - df.index[0]).total_seconds() / 60
+                        
+                        if actual_diff < target_diff:
+                            print(f"Resampling data for {symbol} from {actual_diff}m to {self.interval}...")
+                            df = self._resample(df)
 
             # Filtering Date Range
             if self.start_date:
@@ -141,16 +139,224 @@ class SmartDataHandler(DataHandler):
                  print(f"Warning: Data for {symbol} is empty after filtering {self.start_date} -> {self.end_date}")
 
             self.symbol_data[symbol] = df
-            self.latest_symbol_data[symbol] = []
-            self._bar_generators[symbol] = df.iterrows()
+            self._remember_source(symbol)
+            self.latest_symbol_data[symbol] = BarHistory(self.history)
+            self._replays[symbol] = BarReplay(symbol, df)
+
+    def _remember_source(self, symbol: str):
+        if self._source_path is None or not os.path.exists(self._source_path):
+            return
+        st = os.stat(self._source_path)
+        self._sources[symbol] = (self._source_path, st.st_size, st.st_mtime)
+
+    def is_stale(self) -> bool:
+        """True if a local source file changed (e.g. grew) since it was loaded."""
+        for path, size, mtime in self._sources.values():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return True
+            if st.st_size != size or st.st_mtime != mtime:
+                return True
+        return False
+
+    def _read_window(self):
+        """
+        Raw-bar range to materialize: the requested dates padded by one day
+        plus one interval, so resampled bins at the edges see all their bars.
+        """
+        pad = pd.Timedelta(days=1) + pd.Timedelta(minutes=interval_minutes(self.interval) or 0)
+        start = self.start_date - pad if self.start_date is not None else None
+        end = self.end_date + pad if self.end_date is not None else None
+        return start, end
+
+    def _load_cached_level(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Returns the cached pyramid level for self.interval, if any."""
+        if self.bar_cache is None or self.interval not in PYRAMID_LEVELS or self.interval == '1d':
+            return None
+        source = next((p for p in self._candidate_paths(symbol) if os.path.exists(p)), None)
+        if source is None:
+            return None
+        df = self.bar_cache.load_level(source, self.interval)
+        if df is not None:
+            self._source_path = source
+            PipelineMonitor().log_data_loading(symbol, f"BAR_CACHE[{self.interval}]", True)
+        return df
+
+    def _resample(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resamples to self.interval. For cached local files the whole pyramid
+        is built once and stored, so later intervals load instantly.
+        """
+        windowed = self.start_date is not None or self.end_date is not None
+        if (self.bar_cache is None or self._source_path is None or windowed
+                or self.interval not in PYRAMID_LEVELS):
+            return resample_bars(df, self.interval)
+        pyramid = build_pyramid(df)
+        self.bar_cache.store_levels(self._source_path, pyramid)
+        return pyramid[self.interval] if self.interval in pyramid else resample_bars(df, self.interval)
+
+    def _load_normalized(self, symbol: str, start=None, end=None) -> Optional[pd.DataFrame]:
+        """
+        Returns the normalized frame for a symbol, served from the bar cache
+        when the local source file is unchanged since it was cached. With
+        start/end, only rows inside that range are returned.
+        """
+        source = next((p for p in self._candidate_paths(symbol) if os.path.exists(p)), None)
+        if source is not None:
+            if self.bar_cache is not None:
+                cached = self.bar_cache.load(source, start, end)
+                if cached is None:
+                    cached = self._append_tail(symbol, source, start, end)
+                if cached is not None:
+                    self._source_path = source
+                    PipelineMonitor().log_data_loading(symbol, "BAR_CACHE", True)
+                    return cached
+
+            df = self._stream_local(symbol, source, start, end)
+            if df is not None:
+                return df
+
+        # Fallback: other candidates, yfinance cache, download
+        df = self._fetch_data(symbol)
+        if df is None or df.empty:
+            return df
+
+        df = self._normalize_frame(df)
+
+        if self.bar_cache is not None and self._source_path is not None:
+            self.bar_cache.store(self._source_path, df)
+        return df
+
+    def _append_tail(self, symbol: str, path: str, start=None, end=None) -> Optional[pd.DataFrame]:
+        """
+        When a cached plain CSV has only grown, parses just the appended rows
+        and appends them to the cached columns. Returns the (windowed) frame,
+        or None if the entry has to be rebuilt from scratch.
+        """
+        offset = self.bar_cache.appended_offset(path)
+        if offset is None:
+            return None
 
-    def _fetch_data(self, symbol: str) -> Optional[pd.DataFrame]:
-        # 1. Search Local Files (Unless Forced Download)
-        # TODO: Add 'force_download' param to init if needed
-        
         monitor = PipelineMonitor()
+        writer = self.bar_cache.open_writer(path, resume=True)
+        cached_rows = writer.rows
+        try:
+            with open(path, 'rb') as f:
+                header = f.readline()
+                f.seek(offset)
+                tail = f.read()
+            for chunk in pd.read_csv(io.BytesIO(header + tail), chunksize=self.chunk_rows):
+                if not writer.append(self._normalize_frame(chunk)):
+                    return None
+        except Exception as e:
+            writer.abort()
+            monitor.log_event("DataHandler", "READ_ERROR", f"Failed to append tail of {path}: {e}", "ERROR")
+            return None
+        if not writer.commit():
+            return None
+
+        monitor.log_event("DataHandler", "TAIL_APPEND",
+                          f"Appended {writer.rows - cached_rows} new bars for {symbol} from {path}")
+        return self.bar_cache.load(path, start, end)
+
+    def _stream_local(self, symbol: str, path: str, start=None, end=None) -> Optional[pd.DataFrame]:
+        """
+        Parses a local CSV in chunks of ``chunk_rows``, normalizing each chunk,
+        appending it to the bar cache and keeping only rows in [start, end].
+        Peak memory is one chunk plus the kept rows.
+
+        Source files are expected in ascending time order (A2API exports
+        are). When nothing is being cached, reading stops at the first chunk
+        past ``end``. Returns None if the file cannot be streamed, so the
+        caller falls back to a full read.
+        """
+        monitor = PipelineMonitor()
+        writer = self.bar_cache.open_writer(path) if self.bar_cache is not None else None
+        pieces = []
+        empty = None
+        last = None
+        try:
+            for chunk in pd.read_csv(path, chunksize=self.chunk_rows):
+                chunk = self._normalize_frame(chunk)
+                if chunk.empty:
+                    continue
+                if last is not None and chunk.index[0] < last:
+                    raise ValueError("rows are not in time order")
+                last = chunk.index[-1]
+                if empty is None:
+                    empty = chunk.iloc[:0]
+
+                if writer is not None and not writer.failed:
+                    writer.append(chunk)
+
+                if start is not None:
+                    chunk = chunk[chunk.index >= start]
+                if end is not None:
+                    chunk = chunk[chunk.index <= end]
+                if not chunk.empty:
+                    pieces.append(chunk)
+
+                if end is not None and last > end and (writer is None or writer.failed):
+                    break
+        except Exception as e:
+            if writer is not None:
+                writer.abort()
+            monitor.log_event("DataHandler", "READ_ERROR", f"Failed to stream {path}: {e}", "ERROR")
+            return None
+
+        if writer is not None:
+            writer.commit()
+        if empty is None:
+            return None
+
+        monitor.log_data_loading(symbol, "LOCAL_FILE", True)
+        self._source_path = path
+        return pd.concat(pieces) if pieces else empty
+
+    @staticmethod
+    def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Capitalizes columns and builds a sorted, naive ET wall-clock index."""
+        # Standardize Columns
+        df.columns = [c.capitalize() for c in df.columns]
         
-        # Priority Search
+        # Ensure Date Index
+        # CRITICAL: Preserve ET wall clock times (9:30 AM ET stays 9:30)
+        # which the ORB strategy and all session-time logic depends on.
+        # Our CSV timestamps like "2010-06-02 18:05:00 -04:00" already
+        # represent ET local time with a UTC offset suffix. We strip the
+        # offset and parse the first 19 chars directly (fast path).
+        # Fallback to the slower utc→tz_convert path for other formats.
+        date_col = next((c for c in df.columns if c in ['Date', 'Datetime', 'Time']), None)
+        if date_col:
+            sample = str(df[date_col].iloc[0])
+            # Fast path: timestamps with UTC offset suffix like "2010-06-02 18:05:00 -04:00"
+            # The local time portion (first 19 chars) is already ET wall clock time
+            if len(sample) > 19 and ('+' in sample[19:] or '-' in sample[19:]):
+                df[date_col] = pd.to_datetime(df[date_col].astype(str).str[:19], format='%Y-%m-%d %H:%M:%S')
+            else:
+                # Fallback: parse with timezone, convert to ET
+                raw_dt = pd.to_datetime(df[date_col], utc=True)
+                df[date_col] = raw_dt.dt.tz_convert('America/New_York').dt.tz_localize(None)
+            df.set_index(date_col, inplace=True)
+        
+        # Ensure Volume column exists (some CSVs lack it)
+        if 'Volume' not in df.columns:
+            df['Volume'] = 0.0
+
+        # Ensure sorting
+        df.sort_index(inplace=True)
+        
+        # Remove timezone if exists (safety net)
+        # Always convert to ET first to preserve wall clock times
+        if hasattr(df.index, 'tz_localize'):
+            if df.index.tz is not None:
+                df.index = df.index.tz_convert('America/New_York').tz_localize(None)
+            # else: already naive (ET wall clock), leave as-is
+        return df
+
+    def _candidate_paths(self, symbol: str) -> List[str]:
+        """Local file locations for a symbol, in priority order."""
         paths_to_check = []
         for d in self.search_dirs:
             if not os.path.exists(d): continue
@@ -169,12 +375,33 @@ class SmartDataHandler(DataHandler):
                 os.path.join(d, f"{symbol.lower()}.csv"),
                 os.path.join(d, f"{symbol.upper()}.csv")
             ])
-            
-        for p in paths_to_check:
+
+        # Compressed archives (utils/compress_data.py ships *.csv.zip) are
+        # parsed directly; a plain CSV at the same location wins
+        with_archives = []
+        for p in dict.fromkeys(paths_to_check):
+            with_archives.append(p)
+            with_archives.extend(p + ext for ext in self._archive_exts())
+        return with_archives
+
+    @staticmethod
+    def _archive_exts() -> List[str]:
+        return ['.zip', '.gz', '.zst'] if _HAS_ZSTD else ['.zip', '.gz']
+
+    def _fetch_data(self, symbol: str) -> Optional[pd.DataFrame]:
+        # 1. Search Local Files (Unless Forced Download)
+        # TODO: Add 'force_download' param to init if needed
+        
+        monitor = PipelineMonitor()
+        self._source_path = None
+        
+        # Priority Search
+        for p in self._candidate_paths(symbol):
             if os.path.exists(p):
                 try:
                     df = pd.read_csv(p)
                     monitor.log_data_loading(symbol, "LOCAL_FILE", True)
+                    self._source_path = p
                     return df
                 except Exception as e:
                     monitor.log_event("DataHandler", "READ_ERROR", f"Failed to read {p}: {e}", "ERROR")
@@ -231,41 +458,37 @@ class SmartDataHandler(DataHandler):
         
         return None
 
-    def _get_new_bar(self, symbol: str) -> Optional[Bar]:
-        try:
-            index, row = next(self._bar_generators[symbol])
-            return Bar(
-                symbol=symbol,
-                timestamp=index,
-                open=row['Open'],
-                high=row['High'],
-                low=row['Low'],
-                close=row['Close'],
-                volume=row.get('Volume', 0.0) if hasattr(row, 'get') else (row['Volume'] if 'Volume' in row.index else 0.0)
-            )
-        except StopIteration:
-            return None
-
     def update_bars(self) -> bool:
-        any_updates = False
-        for symbol in self.symbol_list:
-            bar = self._get_new_bar(symbol)
-            if bar is not None:
-                self.latest_symbol_data[symbol].append(bar)
-                any_updates = True
-        
-        if not any_updates:
+        """Advances to the next timestamp across all symbols (see BarMerger)."""
+        bars = self._merger.step()
+        self.updated_symbols = [bar.symbol for bar in bars]
+        for bar in bars:
+            self.latest_symbol_data[bar.symbol].append(bar)
+        self.current_time = self._merger.current_time
+
+        if not bars:
             self.continue_backtest = False
-            
-        return any_updates
+            return False
+        return True
 
     def get_latest_bar(self, symbol: str) -> Optional[Bar]:
-        bars_list = self.latest_symbol_data.get(symbol)
-        return bars_list[-1] if bars_list else None
+        history = self.latest_symbol_data.get(symbol)
+        return history.latest() if history is not None else None
 
-    def get_latest_bars(self, symbol: str, N: int = 1) -> List[Bar]:
-        bars_list = self.latest_symbol_data.get(symbol)
-        return bars_list[-N:] if bars_list else []
+    def get_latest_bars(self, symbol: str, N: int = 1) -> Sequence[Bar]:
+        history = self.latest_symbol_data.get(symbol)
+        if not history:
+            return []
+        if N > len(history) and history.dropped:
+            raise ValueError(
+                f"get_latest_bars({symbol!r}, N={N}) needs more than the {len(history)} bars retained; "
+                f"declare the lookback with Strategy.history_bars or reserve_history() before replay")
+        return history.window(N)
+
+    def reserve_history(self, n: int):
+        self.history = max(self.history, int(n))
+        for history in self.latest_symbol_data.values():
+            history.reserve(self.history)
 
 
 class MemoryDataHandler(DataHandler):
@@ -273,45 +496,46 @@ class MemoryDataHandler(DataHandler):
     In-Memory Data Handler for Optimization.
     Receives pre-loaded DataFrames directly.
     """
-    def __init__(self, symbol_data: Dict[str, pd.DataFrame]):
+    def __init__(self, symbol_data: Dict[str, pd.DataFrame], history: int = DEFAULT_HISTORY,
+                 align: str = ALIGN_ARRIVAL):
         self.symbol_data = symbol_data
         self.symbol_list = list(symbol_data.keys())  # FIX: was missing, breaks Strategy/Portfolio/Engine
-        self.latest_symbol_data: Dict[str, List[Bar]] = {s: [] for s in symbol_data.keys()}
+        self.history = history
+        self.latest_symbol_data: Dict[str, BarHistory] = {s: BarHistory(history) for s in symbol_data.keys()}
         self.continue_backtest = True
-        self._bar_generators: Dict[str, Generator] = {s: df.iterrows() for s, df in symbol_data.items()}
-
-    def _get_new_bar(self, symbol: str) -> Optional[Bar]:
-        try:
-            index, row = next(self._bar_generators[symbol])
-            return Bar(
-                symbol=symbol,
-                timestamp=index,
-                open=row['Open'],
-                high=row['High'],
-                low=row['Low'],
-                close=row['Close'],
-                volume=row.get('Volume', 0.0) if hasattr(row, 'get') else (row['Volume'] if 'Volume' in row.index else 0.0)
-            )
-        except StopIteration:
-            return None
+        self._replays: Dict[str, BarReplay] = {s: BarReplay(s, df) for s, df in symbol_data.items()}
+        self._merger = BarMerger(self._replays, self.symbol_list, align)
+        self.updated_symbols: List[str] = []
+        self.current_time = None
 
     def update_bars(self) -> bool:
-        any_updates = False
-        for symbol in self.symbol_list:
-            bar = self._get_new_bar(symbol)
-            if bar is not None:
-                self.latest_symbol_data[symbol].append(bar)
-                any_updates = True
-        
-        if not any_updates:
+        """Advances to the next timestamp across all symbols (see BarMerger)."""
+        bars = self._merger.step()
+        self.updated_symbols = [bar.symbol for bar in bars]
+        for bar in bars:
+            self.latest_symbol_data[bar.symbol].append(bar)
+        self.current_time = self._merger.current_time
+
+        if not bars:
             self.continue_backtest = False
-            
-        return any_updates
+            return False
+        return True
 
     def get_latest_bar(self, symbol: str) -> Optional[Bar]:
-        bars_list = self.latest_symbol_data.get(symbol)
-        return bars_list[-1] if bars_list else None
+        history = self.latest_symbol_data.get(symbol)
+        return history.latest() if history is not None else None
+
+    def get_latest_bars(self, symbol: str, N: int = 1) -> Sequence[Bar]:
+        history = self.latest_symbol_data.get(symbol)
+        if not history:
+            return []
+        if N > len(history) and history.dropped:
+            raise ValueError(
+                f"get_latest_bars({symbol!r}, N={N}) needs more than the {len(history)} bars retained; "
+                f"declare the lookback with Strategy.history_bars or reserve_history() before replay")
+        return history.window(N)
 
-    def get_latest_bars(self, symbol: str, N: int = 1) -> List[Bar]:
-        bars_list = self.latest_symbol_data.get(symbol)
-        return bars_list[-N:] if bars_list else []
+    def reserve_history(self, n: int):
+        self.history = max(self.history, int(n))
+        for history in self.latest_symbol_data.values():
+            history.reserve(self.history)
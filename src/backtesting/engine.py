@@ -23,6 +23,11 @@ class BacktestEngine:
         self.execution_handler = execution_handler
         self.events = portfolio.events # Use the same queue shared by components
 
+        # Size the handler's bar history to the strategy's declared lookback
+        history_bars = getattr(strategy, 'history_bars', None)
+        if history_bars and hasattr(data_handler, 'reserve_history'):
+            data_handler.reserve_history(history_bars)
+
     def run(self):
         """
         Executes the backtest simulation.
@@ -32,8 +37,11 @@ class BacktestEngine:
         while True:
             # 1. Update Data (Outer Loop = Time Step)
             if self.data_handler.update_bars():
-                # Push Market Events (Bars) to Queue
-                for symbol in self.data_handler.symbol_list:
+                # Push Market Events (Bars) to Queue, only for symbols that
+                # produced a bar this step (handlers without a merge fall
+                # back to every symbol)
+                updated = getattr(self.data_handler, 'updated_symbols', None)
+                for symbol in (updated if isinstance(updated, list) else self.data_handler.symbol_list):
                     bar = self.data_handler.get_latest_bar(symbol)
                     if bar:
                         self.events.put(bar)
@@ -27,7 +27,14 @@ class StrategyFactory:
     Generates random Strategy Genomes.
     Acts as the 'Creator' for the Genetic Algorithm.
     """
-    
+    # Keys of every genome's genes (the VectorizedGenome parameters);
+    # anything else in a result dict is a metric or report column
+    GENE_KEYS = (
+        'entry_logic', 'filter_logic', 'exit_logic',
+        'ema_period', 'rsi_period', 'atr_period', 'sl_mult', 'tp_mult',
+        'use_ema_filter', 'use_rvol_filter', 'use_adx_filter', 'use_trailing_stop',
+    )
+
     def __init__(self):
         self.registry = {
             'entry_type': ['ORB', 'RSI_Cross', 'MA_Cross', 'Bollinger_Breakout'],
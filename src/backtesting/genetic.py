@@ -1,4 +1,5 @@
 
+import numpy as np
 import pandas as pd
 import random
 from typing import List, Type, Dict
@@ -7,15 +8,18 @@ import multiprocessing
 
 from .factory import StrategyFactory, StrategyGenome
 from .data import DataHandler, MemoryDataHandler
-from .vector_engine import VectorEngine, VectorizedNQORB # We'll need a Generic Vector Strategy later
-
-# For now, we assume VectorizedNQORB can accept ANY params from the Genome.
-# Realistically, we need a 'UniversalVectorStrategy' that switches logic based on params.
-# I will alias it to NqOrb for the prototype, utilizing its flags.
+from .shared_data import SharedDataset, init_worker
+from .vector_engine import VectorEngine
+from .vector_genome import VectorizedGenome
 
 class EvolutionaryOptimizer:
     """
     Genetic Algorithm for Strategy Discovery.
+
+    ``dtype=np.float32`` evaluates each generation in float32 (see
+    ``VectorEngine``) and re-runs its ``verify_top_k`` best genomes in
+    float64 (``optimizer.verify_top_results``) before selection, so the
+    elites are ranked on float64 returns.
     """
     def __init__(self,
                  data_handler_cls: Type[DataHandler],
@@ -24,7 +28,10 @@ class EvolutionaryOptimizer:
                  generations: int = 10,
                  mutation_rate: float = 0.2,
                  initial_capital: float = 100000.0,
-                 n_jobs: int = -1):
+                 n_jobs: int = -1,
+                 dtype=np.float64,
+                 verify_top_k: int = 10,
+                 verify_tol: float = 1e-3):
         
         self.data_handler_cls = data_handler_cls
         self.data_handler_args = data_handler_args
@@ -32,6 +39,9 @@ class EvolutionaryOptimizer:
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.initial_capital = initial_capital
+        self.dtype = np.dtype(dtype)
+        self.verify_top_k = verify_top_k
+        self.verify_tol = verify_tol
         
         self.n_jobs = n_jobs if n_jobs != -1 else multiprocessing.cpu_count()
         
@@ -55,36 +65,40 @@ class EvolutionaryOptimizer:
         df = loader.symbol_data[symbol]
         
         results = []
-        
-        # 2. Parallel Execution
-        # We use a helper function similar to GridSearch
-        from .optimizer import _run_single_vector_backtest
-        # We need to map factory genes -> Numba friendly params
-        # Note: VectorizedNQORB expects specific args. 
-        # Our Factory generates a dict. We pass that dict as **kwargs.
-        # VectorizedNQORB.__init__ handles kwargs but only sets what it knows.
-        # We need to ensure Genome keys match VectorStrategy args.
-        
-        args_list = []
-        for genome in self.population:
-            params = genome.to_params()
-            # Map Genome Keys to VectorizedNQORB Keys if needed
-            # For now, Factory keys (sl_mult, etc.) match closely.
-            # Entry logic (ORB vs RSI) needs to be handled by the Strategy Class.
-            # If logic is 'RSI', we need to tell VectorStrategy to use RSI.
-            # Currently VectorizedNQORB is mostly ORB. 
-            # We might need to refactor VectorizedNQORB to accept 'entry_mode' string?
-            # Or map 'entry_logic'='RSI' -> use_rvol=False, use_rsi=True?
-            
-            args = (VectorEngine, VectorizedNQORB, params, self.initial_capital, df)
-            args_list.append(args)
 
-        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
-            futures = {executor.submit(_run_single_vector_backtest, arg): arg[2] for arg in args_list}
-            for future in as_completed(futures):
-                res = future.result()
-                results.append(res)
-                
+        # 2. Batched Execution
+        # Every genome runs as designed (entry/filter/exit blocks, see
+        # vector_genome.py) through VectorizedGenome's batch kernel: the
+        # population is split into one parameter-matrix chunk per worker,
+        # each scored with a single VectorEngine.run_batch call.
+        from .optimizer import _run_vector_batch, verify_top_results
+
+        param_list = [genome.to_params() for genome in self.population]
+        n_chunks = max(1, min(self.n_jobs, len(param_list)))
+        size = -(-len(param_list) // n_chunks)
+        chunks = [param_list[i:i + size] for i in range(0, len(param_list), size)]
+
+        if len(chunks) > 1:
+            # Publish the frame once; tasks carry only the shared-memory handle
+            with SharedDataset(df) as shared:
+                with ProcessPoolExecutor(max_workers=len(chunks), initializer=init_worker,
+                                         initargs=(shared.handle,)) as executor:
+                    futures = [
+                        executor.submit(_run_vector_batch, (VectorEngine, VectorizedGenome, chunk,
+                                                            self.initial_capital, shared.handle, self.dtype))
+                        for chunk in chunks
+                    ]
+                    for future in as_completed(futures):
+                        results.extend(future.result())
+        elif chunks:
+            results.extend(_run_vector_batch(
+                (VectorEngine, VectorizedGenome, chunks[0], self.initial_capital, df, self.dtype)))
+
+        if self.dtype != np.float64 and self.verify_top_k > 0:
+            results = verify_top_results(
+                results, self.factory.GENE_KEYS, VectorEngine, VectorizedGenome,
+                self.initial_capital, df, top_k=self.verify_top_k, tol=self.verify_tol)
+
         return results
 
     def select_survivors(self, results: List[Dict]) -> List[StrategyGenome]:
@@ -106,9 +120,9 @@ class EvolutionaryOptimizer:
         
         survivors = []
         for res in top_results:
-            # Reconstruct genome from successful params
-            # Note: evaluate_fitness modified params? No.
-            survivors.append(StrategyGenome(res)) # Create new Genome object from dict
+            # Reconstruct genome from its genes; metrics and verification
+            # columns in the result are not genes
+            survivors.append(StrategyGenome({key: res[key] for key in self.factory.GENE_KEYS}))
             
         return survivors
 
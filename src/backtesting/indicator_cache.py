@@ -0,0 +1,249 @@
+"""
+Indicator Cache
+===============
+Memoizes indicator arrays by (indicator name, params, input fingerprints).
+
+Sweeps and the research engine stages backtest the same archetype on the
+same data over and over while varying only a few lengths or multipliers,
+yet ``generate_signals`` used to recompute EMA/ATR/ADX, the daily HTF MA
+and the RVOL/efficiency-ratio proxies on every call. Strategies now ask
+``cached_indicator`` instead; a hit costs one hash of each input column.
+
+Inputs are fingerprinted by their values *and* index, so renamed copies and
+shared-memory views of the same dataset hit the same entry, while any
+modified or re-windowed frame gets a new one. Hashing a column costs about
+as much as an EMA, so callers that feed one column to several indicators
+pass its ``fingerprint`` once instead of the Series.
+
+Entries live in an in-process LRU bounded by bytes. With a ``spill_dir``,
+evicted entries are written there as ``.npy`` files (also bounded by
+bytes) and reloaded on a later miss, so pool workers and daemon restarts
+can reuse each other's work.
+
+Usage:
+    close_key = fingerprint(close)
+    ema = cached_indicator('ema', (length,), (close_key,),
+                           lambda: ta.ema(close, length).fillna(0).to_numpy(np.float64))
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sessions import index_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_SPILL_BYTES = 4 * 1024 * 1024 * 1024
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _index_key(index: pd.Index) -> tuple:
+    if isinstance(index, pd.DatetimeIndex):
+        return index_fingerprint(index)
+    if isinstance(index, pd.RangeIndex):
+        return ('range', index.start, index.stop, index.step)
+    hashed = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    return (len(index), str(index.dtype), _digest(hashed.tobytes()))
+
+
+def fingerprint(data) -> tuple:
+    """
+    Fingerprint of an indicator input: the values (and index, for a Series)
+    of a Series or ndarray.
+    """
+    if isinstance(data, pd.Series):
+        values = data.to_numpy()
+        index_key = _index_key(data.index)
+    else:
+        values = np.asarray(data)
+        index_key = None
+    if values.dtype == object:
+        raise TypeError("indicator inputs must be numeric")
+    values = np.ascontiguousarray(values)
+    return (len(values), values.dtype.str, _digest(values.view(np.uint8)), index_key)
+
+
+class IndicatorCache:
+    """
+    Byte-bounded LRU of read-only indicator arrays, optionally spilling
+    evicted entries to disk.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, spill_dir: str = None,
+                 max_spill_bytes: int = DEFAULT_MAX_SPILL_BYTES):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    @staticmethod
+    def make_key(name: str, params: Sequence, inputs: Sequence) -> tuple:
+        """Inputs may be Series/arrays or their precomputed ``fingerprint``."""
+        return (name, tuple(params),
+                tuple(x if isinstance(x, tuple) else fingerprint(x) for x in inputs))
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        """Cached array for a key (memory first, then disk), or None."""
+        arr = self._entries.get(key)
+        if arr is not None:
+            self._entries.move_to_end(key)
+            return arr
+        arr = self._load_spilled(key)
+        if arr is not None:
+            self._insert(key, arr)
+        return arr
+
+    def put(self, key: tuple, arr) -> np.ndarray:
+        """Store an array (a read-only copy is kept) and return it."""
+        arr = np.array(arr, copy=True)
+        arr.flags.writeable = False
+        self._insert(key, arr)
+        return arr
+
+    def get_or_compute(self, name: str, params: Sequence, inputs: Sequence,
+                       compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Returns the cached indicator for (name, params, inputs), computing
+        and storing it on a miss. The result is read-only.
+        """
+        key = self.make_key(name, params, inputs)
+        arr = self.get(key)
+        if arr is not None:
+            self.hits += 1
+            return arr
+        self.misses += 1
+        return self.put(key, compute())
+
+    def clear(self):
+        """Drop the in-memory entries (spilled files are kept)."""
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _insert(self, key: tuple, arr: np.ndarray):
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).nbytes
+        if arr.nbytes > self.max_bytes:
+            self._spill(key, arr)
+            return
+        self._entries[key] = arr
+        self._bytes += arr.nbytes
+        while self._bytes > self.max_bytes:
+            old_key, old = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+            self._spill(old_key, old)
+
+    def _spill_path(self, key: tuple) -> str:
+        return os.path.join(self.spill_dir, _digest(repr(key).encode()) + ".npy")
+
+    def _spill(self, key: tuple, arr: np.ndarray):
+        if self.spill_dir is None:
+            return
+        path = self._spill_path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, arr, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Indicator cache spill failed: {e}")
+            return
+        self._trim_spill()
+
+    def _load_spilled(self, key: tuple) -> Optional[np.ndarray]:
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            arr = np.load(path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Indicator cache read failed for {path}: {e}")
+            return None
+        arr.flags.writeable = False
+        return arr
+
+    def _trim_spill(self):
+        """Deletes the oldest spilled files beyond ``max_spill_bytes``."""
+        try:
+            files = []
+            for name in os.listdir(self.spill_dir):
+                if name.endswith(".npy"):
+                    path = os.path.join(self.spill_dir, name)
+                    st = os.stat(path)
+                    files.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_spill_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+_cache = IndicatorCache()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    return _cache
+
+
+def configure_indicator_cache(max_bytes: int = DEFAULT_MAX_BYTES, spill_dir: str = None,
+                              max_spill_bytes: int = DEFAULT_MAX_SPILL_BYTES) -> IndicatorCache:
+    """Replaces the process-wide cache (entries of the old one are dropped)."""
+    global _cache
+    _cache = IndicatorCache(max_bytes, spill_dir, max_spill_bytes)
+    return _cache
+
+
+def cached_indicator(name: str, params: Sequence, inputs: Sequence,
+                     compute: Callable[[], np.ndarray]) -> np.ndarray:
+    """``get_or_compute`` on the process-wide cache."""
+    return _cache.get_or_compute(name, params, inputs, compute)
+
+
+def clear_indicator_cache():
+    _cache.clear()
@@ -0,0 +1,171 @@
+"""
+JIT Warmup
+==========
+Compiles (or loads from the on-disk cache) every numba kernel before real
+work arrives.
+
+All kernels in ``vector_engine``, ``vector_genome``, ``ta_numba`` and
+``metrics_numba`` are compiled with ``cache=True``, so only the first
+process on a machine pays for compilation; later processes load the
+machine code from ``__pycache__``.
+Loading still happens lazily on the first call, though, so without a
+warmup the first task of every pool worker (grid search, GA, permutation
+tests) would absorb it. ``warmup_kernels`` runs each kernel twice on a
+small synthetic frame, with the same argument types as production calls,
+and reports compile/load time (first call minus second) against
+execution time (second call).
+
+Called by the daemon at startup and by ``shared_data.init_worker``.
+"""
+
+import logging
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_warmed = False
+
+
+def _warmup_frame(days: int = 3) -> pd.DataFrame:
+    """24h of 5-minute bars per day, enough for every session window."""
+    idx = pd.date_range('2024-01-02', periods=days * 288, freq='5min')
+    rng = np.random.default_rng(0)
+    close = 15000 + np.cumsum(rng.normal(0, 5, len(idx)))
+    spread = rng.uniform(1, 8, len(idx))
+    return pd.DataFrame({
+        'Open': close, 'High': close + spread, 'Low': close - spread,
+        'Close': close, 'Volume': rng.integers(100, 5000, len(idx)).astype(float),
+    }, index=idx)
+
+
+def _kernel_calls():
+    """
+    Yields (name, zero-arg callable) per kernel, with production argument
+    types. Strategy inputs are built after the indicator kernels have been
+    timed, since building them calls those kernels.
+    """
+    from . import metrics_numba, ta_numba
+    from . import vector_engine as ve
+    from . import vector_genome as vg
+    from .bar_frame import BarFrame
+    from .sessions import session_index
+
+    df = _warmup_frame()
+    h, l, c = (df[col].to_numpy(np.float64) for col in ('High', 'Low', 'Close'))
+    v = df['Volume'].to_numpy(np.float64)
+    day_ids = session_index(df.index).day_ids
+
+    yield 'ta.ema', lambda: ta_numba.ema(c, 10)
+    yield 'ta.sma', lambda: ta_numba.sma(c, 10)
+    yield 'ta.rolling_max', lambda: ta_numba.rolling_max(h, 10)
+    yield 'ta.bollinger', lambda: ta_numba.bollinger(c, 10)
+    yield 'ta.atr', lambda: ta_numba.atr(h, l, c, 14)
+    yield 'ta.ema_resume', lambda: ta_numba.ema_resume(c, 10)
+    yield 'ta.atr_resume', lambda: ta_numba.atr_resume(h, l, c, 14)
+    yield 'ta.rsi', lambda: ta_numba.rsi(c, 14)
+    yield 'ta.adx', lambda: ta_numba.adx(h, l, c, 14)
+    yield 'ta.chop_index', lambda: ta_numba.chop_index(h, l, c, 14)
+    yield 'ta.efficiency_ratio', lambda: ta_numba.efficiency_ratio(c, 10)
+    yield 'ta.vwap', lambda: ta_numba.vwap(h, l, c, v, day_ids)
+
+    orb = ve.VectorizedNQORB(use_htf=True, htf_ma=1, use_rvol=True, use_hurst=True, use_adx=True)
+    bars = BarFrame.from_frame(df)
+    orb_in = orb._kernel_inputs(bars)
+    rows = np.ones(2)
+    orb_args = orb._kernel_args(orb_in)
+    # _numba_orb_logic predates the open prices and the tie-break flag
+    yield 'orb_logic', lambda: ve._numba_orb_logic(*orb_args[:5], *orb_args[6:-1])
+    yield 'orb_batch', lambda: ve._numba_orb_batch(
+        *orb_in['arrays'], *orb_in['window'],
+        rows, rows, rows,
+        orb.use_htf, orb_in['daily_ma'],
+        orb.use_rvol, orb_in['rvol'], rows,
+        orb.use_hurst, orb_in['hurst'], rows,
+        orb.use_adx, orb_in['adx'], rows,
+        np.zeros(2, dtype=np.bool_), rows, False)
+
+    night = ve.VectorizedOvernight()
+    night_in = night._kernel_inputs(bars)
+    night_arrays = night_in['arrays'][:5] + night_in['arrays'][6:]
+    yield 'overnight_logic', lambda: ve._numba_overnight_logic(
+        *night_arrays, *night_in['window'], night.sl_atr_mult, night.tp_atr_mult)
+    yield 'overnight_batch', lambda: ve._numba_overnight_batch(
+        *night_in['arrays'], *night_in['window'], rows, rows, False)
+
+    signals = np.zeros((2, len(df)), dtype=np.int8)
+    returns = df['Close'].pct_change().fillna(0).to_numpy(np.float64)
+    closes, highs, lows = ve._price_arrays(bars)
+    yield 'batch_stats', lambda: ve._numba_batch_stats(
+        signals, returns, returns, closes, *ve._no_fills(len(signals)))
+
+    positions = signals[0].astype(np.float64)
+    no_fills = np.full(len(df), np.nan)
+    yield 'fused_run', lambda: ve._numba_fused_run(
+        closes, highs, lows, positions, no_fills, 2.0, 0.01, 20.0, 1e5)
+    net, turnover, equity_out = (np.empty(len(df)) for _ in range(3))
+    yield 'fused_fill', lambda: ve._fused_fill(
+        net, turnover, equity_out, closes, highs, lows, positions, no_fills, 0, ve._fused_state(),
+        2.0, 0.01, 20.0, 1e5)
+
+    yield 'prune_fill', lambda: ve._prune_fill(equity_out, positions, 0, len(df), ve._prune_state())
+
+    yield 'orb_trades', lambda: ve._numba_orb_trades(*orb_args)
+    day_arrays = (np.zeros(len(df), dtype=np.int32), np.zeros(len(df), dtype=np.int8),
+                  np.full(len(df), np.nan))
+    yield 'orb_days', lambda: orb._run_days(*day_arrays, 0, len(df), orb_in)
+    if ve.parallel_threads() > 1:
+        # Skipped where it never runs (single-threaded pool workers), which
+        # also keeps numba's thread pool out of forked processes
+        yield 'orb_trades_parallel', lambda: ve._numba_orb_trades_parallel(
+            bars.sessions.day_starts, *orb_args)
+    yield 'overnight_trades', lambda: ve._numba_overnight_trades(
+        *night_in['arrays'], *night_in['window'], night.sl_atr_mult, night.tp_atr_mult, False)
+    orb_signals, orb_exits, orb_fills = ve._numba_orb_trades(*orb_args)
+    yield 'trade_ledger', lambda: ve._numba_trade_ledger(
+        orb_signals, orb_exits, orb_fills, closes, highs, lows)
+    yield 'trade_ledger_generic', lambda: ve._numba_trade_ledger(
+        positions, orb_exits, orb_fills, closes, highs, lows)
+
+    genomes = vg.encode_genomes([{'entry_logic': entry, 'filter_logic': filter_type}
+                                 for entry, filter_type in zip(vg.ENTRY_TYPES, vg.FILTER_TYPES)])
+    genome_arrays = vg._genome_arrays(bars)
+    yield 'genome_batch', lambda: vg._numba_genome_batch(*genome_arrays, genomes)
+    yield 'genome_trades', lambda: vg._numba_genome_trades(*genome_arrays, genomes[0])
+
+    equity = np.cumprod(1 + returns)
+    yield 'metrics', lambda: metrics_numba.compute_metrics(equity, returns, signals=positions, day_ids=day_ids)
+    yield 'running_metrics', lambda: metrics_numba.running_metrics(equity, returns)
+
+
+def warmup_kernels(force: bool = False) -> Dict:
+    """
+    Compiles or cache-loads every numba kernel. Returns a report:
+    {'kernels': {name: {'compile_s', 'exec_s'}}, 'compile_s', 'exec_s'}
+    (``compile_s`` includes loading from the disk cache). Subsequent calls
+    in the same process return an empty report unless ``force``.
+    """
+    global _warmed
+    report = {'kernels': {}, 'compile_s': 0.0, 'exec_s': 0.0}
+    if _warmed and not force:
+        return report
+
+    for name, call in _kernel_calls():
+        t0 = time.perf_counter()
+        call()
+        t1 = time.perf_counter()
+        call()
+        t2 = time.perf_counter()
+        exec_s = t2 - t1
+        compile_s = max(t1 - t0 - exec_s, 0.0)
+        report['kernels'][name] = {'compile_s': compile_s, 'exec_s': exec_s}
+        report['compile_s'] += compile_s
+        report['exec_s'] += exec_s
+
+    _warmed = True
+    logger.info("JIT warmup: %d kernels, %.2fs compile/load, %.4fs execution",
+                len(report['kernels']), report['compile_s'], report['exec_s'])
+    return report
@@ -29,6 +29,7 @@ class MarcusConfig:
     logs_dir: str = os.path.join(_MARCUS_DIR, "logs")
     state_file: str = os.path.join(_MARCUS_DIR, "marcus_daemon_state.json")
     pine_dir: str = os.path.join(_MARCUS_DIR, "strategies")
+    indicator_cache_dir: str = os.path.join(_MARCUS_DIR, "cache", "indicators")
 
     # === Schedule ===
     cycle_interval_minutes: int = 1          # Continuous research cycles (start next ~30s after previous ends)
@@ -43,6 +44,7 @@ class MarcusConfig:
     max_active_strategies: int = 20         # Cap on STAGE5_PASS + DEPLOYED
     variants_per_baseline: int = 4          # Sensitivity variants per passing baseline
     initial_capital: float = 100000.0
+    indicator_cache_mb: int = 512           # In-memory indicator LRU (spills to indicator_cache_dir)
 
     # === Quality Gates ===
     # Stage 1: Basic profitability (standard costs)
@@ -166,6 +166,7 @@ class MarcusDaemon:
 
         # Startup checks
         self._check_gpu()
+        self._warmup_jit()
         self._validate_data()
         self._check_llm_health()
 
@@ -446,6 +447,20 @@ class MarcusDaemon:
             self.logger.warning("accelerate module not available. CPU only.")
             self.monitor.log_gpu_status(False, "accelerate module import failed")
 
+    def _warmup_jit(self):
+        """Compile or cache-load the numba kernels before the first cycle."""
+        try:
+            from backtesting.jit_warmup import warmup_kernels
+            report = warmup_kernels()
+        except Exception as e:
+            self.logger.warning(f"JIT warmup failed: {e}")
+            return
+        self.logger.info(f"JIT warmup: {len(report['kernels'])} kernels, "
+                         f"{report['compile_s']:.2f}s compile/load, {report['exec_s']:.4f}s execution")
+        self.monitor.log_event("Daemon", "JIT_WARMUP",
+                               f"{len(report['kernels'])} kernels ready",
+                               "INFO", metadata=report)
+
     def _validate_data(self):
         """Check that required data files exist."""
         data_dir = self.config.data_dir
@@ -586,6 +601,7 @@ class MarcusDaemon:
         self.logger.info("=" * 60)
 
         self._check_gpu()
+        self._warmup_jit()
         self._validate_data()
 
         result = self.engine.run_cycle()
@@ -0,0 +1,282 @@
+"""
+Compiled Backtest Metrics
+=========================
+Scalar performance metrics of a ``VectorEngine`` result in one pass.
+
+``RigorousBacktester._extract_metrics`` used to build them from pandas
+on the full bar series: ``dropna``/``std`` for Sharpe, ``cummax`` plus
+two temporaries for drawdown, a double ``groupby`` for per-trade PnL and
+``pct_change`` for the Stage 5 equity returns, each a full-length
+allocation. ``compute_metrics`` hands the returns, equity and signal
+arrays to a single numba kernel that accumulates all of them (and the
+compounded daily returns) while walking the bars once; only the per-trade
+statistics touch another array, and that one has one entry per trade.
+
+Semantics follow the pandas code it replaces: NaN returns and equity
+values are skipped, Sharpe uses the sample (ddof=1) standard deviation,
+drawdown is relative to the running peak (0 where the peak is 0), and
+without a trade ledger a trade is a run of constant non-zero position
+(the previous bar's signal, NaN -> flat).
+
+``running_metrics`` keeps the Sharpe and drawdown accumulators between
+calls instead, for backtests extended bar by bar (streaming.py); fed the
+same bars in pieces (and the ledger's trade returns) it gives the same
+scalar metrics as ``compute_metrics``.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import jit
+except ImportError:
+    def jit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+from .sessions import _EPOCH_ORDINAL
+
+# Bars per year by bar interval (regular session: ~78 five-minute bars a day)
+_BARS_PER_YEAR = {
+    '5m': 252 * 78,
+    '15m': 252 * 26,
+    '15min': 252 * 26,
+    '1h': 252 * 6.5,
+    '60m': 252 * 6.5,
+}
+
+
+def bars_per_year(interval: Optional[str]) -> float:
+    """Sharpe annualization for an interval string; daily (252) if unknown."""
+    return float(_BARS_PER_YEAR.get(interval, 252))
+
+
+def _as_array(values, dtype=np.float64) -> np.ndarray:
+    """Contiguous read-only view (one compiled signature, see ta_numba); None -> empty."""
+    if values is None:
+        values = np.empty(0, dtype=dtype)
+    arr = np.ascontiguousarray(np.asarray(values, dtype=dtype)).view()
+    arr.flags.writeable = False
+    return arr
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _numba_metrics(equity, returns, signals, day_ids):
+    """
+    One pass over the bars. Returns (count, mean, m2, max_drawdown,
+    equity_returns, trade_pnls, daily_returns, days): Welford moments of
+    the non-NaN returns, the most negative drawdown, the non-NaN
+    ``equity.pct_change()`` values, the summed returns of each constant
+    non-zero position run (only if ``signals`` has one value per bar) and
+    the compounded returns of each ``day_ids`` day (only if it has one
+    value per bar).
+    """
+    n = len(equity)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    peak = np.nan
+    max_dd = 0.0
+    eq_returns = np.empty(max(n - 1, 0))
+    n_eq = 0
+
+    group = len(signals) == n
+    trade_pnls = np.empty(n if group else 0)
+    n_trades = 0
+    run_pos = 0.0
+    run_sum = 0.0
+
+    daily = len(day_ids) == n
+    daily_returns = np.empty(n if daily else 0)
+    days = np.empty(n if daily else 0, dtype=np.int64)
+    n_days = 0
+    day_growth = 1.0
+
+    for i in range(n):
+        r = returns[i] if i < len(returns) else np.nan
+        if r == r:
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+
+        e = equity[i]
+        if e == e:
+            if not peak >= e:
+                peak = e
+            if peak != 0:
+                dd = (e - peak) / peak
+                if dd < max_dd:
+                    max_dd = dd
+        if i > 0:
+            change = e / equity[i - 1] - 1.0
+            if change == change:
+                eq_returns[n_eq] = change
+                n_eq += 1
+
+        if group:
+            pos = signals[i - 1] if i > 0 else 0.0
+            if pos != pos:
+                pos = 0.0
+            if pos != run_pos:
+                if run_pos != 0:
+                    trade_pnls[n_trades] = run_sum
+                    n_trades += 1
+                run_pos = pos
+                run_sum = 0.0
+            if r == r:
+                run_sum += r
+
+        if daily:
+            if i > 0 and day_ids[i] != day_ids[i - 1]:
+                daily_returns[n_days] = day_growth - 1.0
+                days[n_days] = day_ids[i - 1]
+                n_days += 1
+                day_growth = 1.0
+            if r == r:
+                day_growth *= 1.0 + r
+
+    if group and run_pos != 0:
+        trade_pnls[n_trades] = run_sum
+        n_trades += 1
+    if daily and n > 0:
+        daily_returns[n_days] = day_growth - 1.0
+        days[n_days] = day_ids[n - 1]
+        n_days += 1
+
+    return (count, mean, m2, max_dd, eq_returns[:n_eq], trade_pnls[:n_trades],
+            daily_returns[:n_days], days[:n_days])
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _numba_running_metrics(equity, returns, state):
+    """
+    The return moments and drawdown of ``_numba_metrics`` over more bars,
+    continuing from and updating ``state`` (count, mean, m2, peak,
+    max_drawdown; see ``running_metrics``) in place.
+    """
+    count = state[0]
+    mean = state[1]
+    m2 = state[2]
+    peak = state[3]
+    max_dd = state[4]
+    for i in range(len(equity)):
+        r = returns[i]
+        if r == r:
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+
+        e = equity[i]
+        if e == e:
+            if not peak >= e:
+                peak = e
+            if peak != 0:
+                dd = (e - peak) / peak
+                if dd < max_dd:
+                    max_dd = dd
+    state[0] = count
+    state[1] = mean
+    state[2] = m2
+    state[3] = peak
+    state[4] = max_dd
+
+
+def _sharpe(count, mean, m2, bars_per_year) -> float:
+    """Annualized Sharpe ratio from Welford moments (sample std, 0 without dispersion)."""
+    std = np.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+    return float(np.sqrt(bars_per_year) * mean / std) if std > 0 else 0.0
+
+
+def _trade_stats(pnls: np.ndarray) -> Dict:
+    """Trade counts, win rate and profit factor of per-trade returns."""
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls < 0]
+    total_trades = len(pnls)
+    gross_profit = float(wins.sum())
+    gross_loss = float(-losses.sum())
+    return {
+        'total_trades': total_trades,
+        'win_trades': len(wins),
+        'loss_trades': len(losses),
+        'win_rate': len(wins) / total_trades * 100 if total_trades else 0.0,
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0.0,
+    }
+
+
+def _ledger_pnls(trade_returns) -> np.ndarray:
+    pnls = _as_array(trade_returns)
+    return pnls[~np.isnan(pnls)]
+
+
+def running_metrics(equity, returns, state=None, trade_returns=None,
+                    bars_per_year: float = 252):
+    """
+    Metrics of bars appended to a series whose previous
+    ``running_metrics`` call returned ``state`` (None starts a new
+    series); ``trade_returns`` are all trades so far. Returns (metrics,
+    state) with the scalar ``compute_metrics`` keys, equal to
+    ``compute_metrics`` over the whole series.
+    """
+    equity = _as_array(equity)
+    if state is None:
+        # count, mean, m2, peak, max_drawdown, first and last equity
+        state = np.array([0.0, 0.0, 0.0, np.nan, 0.0, np.nan, np.nan])
+    _numba_running_metrics(equity, _as_array(returns), state)
+    if len(equity):
+        if np.isnan(state[5]):
+            state[5] = equity[0]
+        state[6] = equity[-1]
+    count, mean, m2, _, max_dd, initial_equity, final_equity = state
+    return {
+        'total_return': final_equity / initial_equity - 1.0 if initial_equity > 0 else 0.0,
+        'final_equity': float(final_equity),
+        'sharpe_ratio': _sharpe(count, mean, m2, bars_per_year),
+        'max_drawdown': float(max_dd),
+        **_trade_stats(_ledger_pnls(trade_returns)),
+    }, state
+
+
+def compute_metrics(equity, returns=None, signals=None, trade_returns=None,
+                    day_ids=None, bars_per_year: float = 252) -> Dict:
+    """
+    Metrics of one backtest from its equity curve and net returns.
+
+    Per-trade returns come from ``trade_returns`` (e.g. a ledger's
+    ``net_return``) when given, else from ``signals`` grouped into
+    position runs. ``day_ids`` (``sessions.session_index(...).day_ids``)
+    enables ``daily_returns``, a Series of compounded returns indexed by
+    calendar day. Returns a dict of plain floats/ints plus the
+    ``equity_returns`` array and ``daily_returns``.
+    """
+    equity = _as_array(equity)
+    group = trade_returns is None and signals is not None
+    count, mean, m2, max_dd, eq_returns, pnls, daily, days = _numba_metrics(
+        equity, _as_array(returns), _as_array(signals if group else None),
+        _as_array(day_ids, np.int64))
+
+    sharpe = _sharpe(count, mean, m2, bars_per_year)
+
+    if not group:
+        pnls = _ledger_pnls(trade_returns)
+
+    final_equity = float(equity[-1]) if len(equity) else np.nan
+    initial_equity = float(equity[0]) if len(equity) else np.nan
+    total_return = final_equity / initial_equity - 1.0 if initial_equity > 0 else 0.0
+
+    daily_returns = pd.Series(
+        daily, index=pd.to_datetime(days - _EPOCH_ORDINAL, unit='D'), name='daily_return')
+
+    return {
+        'total_return': total_return,
+        'final_equity': final_equity,
+        'sharpe_ratio': sharpe,
+        'max_drawdown': float(max_dd),
+        **_trade_stats(pnls),
+        'equity_returns': eq_returns,
+        'daily_returns': daily_returns,
+    }
@@ -1,4 +1,6 @@
 import itertools
+import logging
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Type
 from queue import Queue
@@ -13,6 +15,8 @@ from .engine import BacktestEngine
 from .strategy import Strategy
 from .wfo_analytics import WFOAnalytics, analyze_wfo_results
 
+logger = logging.getLogger(__name__)
+
 # --- Worker function for parallel execution (must be at module level for pickling) ---
 from .data import MemoryDataHandler
 
@@ -195,88 +199,95 @@ class WalkForwardOptimizer:
         wfo_results = []
         stitched_equity = []
         
-        while True:
-            # Define Windows
-            train_end = current_train_start + pd.DateOffset(days=self.train_days)
-            test_end = train_end + pd.DateOffset(days=self.test_days)
+        # Published once: each training window is a row range of it and each
+        # test window a view of the loaded frames, so no window reloads or
+        # re-filters the data.
+        with SharedDataset(df) as shared:
+            while True:
+                # Define Windows
+                train_end = current_train_start + pd.DateOffset(days=self.train_days)
+                test_end = train_end + pd.DateOffset(days=self.test_days)
             
-            if train_end > end_date:
-                break
+                if train_end > end_date:
+                    break
                 
-            test_end = min(test_end, end_date)
+                test_end = min(test_end, end_date)
             
-            print(f"\n>>> Window: Train[{current_train_start.date()} : {train_end.date()}] -> Test[{train_end.date()} : {test_end.date()}]")
+                print(f"\n>>> Window: Train[{current_train_start.date()} : {train_end.date()}] -> Test[{train_end.date()} : {test_end.date()}]")
             
-            # A. OPTIMIZE (In-Sample)
-            print("    Optimizing (Vectorized)...")
-            optimizer = VectorizedGridSearch(
-                data_handler_cls=self.data_handler_cls,
-                data_handler_args=(self.symbol_list, self.search_dirs, current_train_start, train_end, self.interval),
-                strategy_cls=self.strategy_cls,
-                param_grid=self.param_grid,
-                initial_capital=self.initial_capital,
-                vector_engine_cls=self.vector_engine_cls,
-                vector_strategy_cls=self.vector_strategy_cls
-            )
-            df_results = optimizer.run()
+                # A. OPTIMIZE (In-Sample)
+                print("    Optimizing (Vectorized)...")
+                optimizer = VectorizedGridSearch(
+                    data_handler_cls=self.data_handler_cls,
+                    data_handler_args=(self.symbol_list, self.search_dirs, current_train_start, train_end, self.interval),
+                    data=shared.window(current_train_start, train_end),
+                    strategy_cls=self.strategy_cls,
+                    param_grid=self.param_grid,
+                    initial_capital=self.initial_capital,
+                    vector_engine_cls=self.vector_engine_cls,
+                    vector_strategy_cls=self.vector_strategy_cls
+                )
+                df_results = optimizer.run()
             
-            if df_results.empty:
-                print("    No trades in training window. Skipping.")
-                current_train_start = current_train_start + pd.DateOffset(days=self.step_days)
-                continue
-
-            best_params = df_results.iloc[0].to_dict()
-            clean_params = {}
-            for k, v in best_params.items():
-                if k in self.param_grid:
-                    if isinstance(v, float) and v.is_integer():
-                        clean_params[k] = int(v)
-                    else:
-                        clean_params[k] = v
-            print(f"    Best Params: {clean_params} (Ret: {best_params.get('Total Return',0):.2%})")
+                if df_results.empty:
+                    print("    No trades in training window. Skipping.")
+                    current_train_start = current_train_start + pd.DateOffset(days=self.step_days)
+                    continue
+
+                best_params = df_results.iloc[0].to_dict()
+                clean_params = {}
+                for k, v in best_params.items():
+                    if k in self.param_grid:
+                        if isinstance(v, float) and v.is_integer():
+                            clean_params[k] = int(v)
+                        else:
+                            clean_params[k] = v
+                print(f"    Best Params: {clean_params} (Ret: {best_params.get('Total Return',0):.2%})")
             
-            # B. TEST (Out-Of-Sample)
-            print("    Testing Out-of-Sample...")
-            # For Validation step, we use the Event Engine (standard BacktestEngine)
-            # Need to pass data correctly. 
-            # SmartDataHandler is fine here because WFO doesn't run in parallel (yet).
-            oos_data = self.data_handler_cls(self.symbol_list, self.search_dirs, train_end, test_end, interval=self.interval)
-            events = Queue()
-            portfolio = Portfolio(oos_data, events, initial_capital=100000.0) 
-            strategy = self.strategy_cls(oos_data, events, **clean_params)
-            execution = SimulatedExecutionHandler(events, oos_data, commission_model=FixedCommission(1.0))
-            engine = BacktestEngine(oos_data, strategy, portfolio, execution)
-            engine.run()
+                # B. TEST (Out-Of-Sample)
+                print("    Testing Out-of-Sample...")
+                # For Validation step, we use the Event Engine (standard BacktestEngine)
+                # on views of the already loaded frames.
+                oos_data = MemoryDataHandler({
+                    s: window_frame(frame, train_end, test_end)
+                    for s, frame in full_data.symbol_data.items()
+                })
+                events = Queue()
+                portfolio = Portfolio(oos_data, events, initial_capital=100000.0) 
+                strategy = self.strategy_cls(oos_data, events, **clean_params)
+                execution = SimulatedExecutionHandler(events, oos_data, commission_model=FixedCommission(1.0))
+                engine = BacktestEngine(oos_data, strategy, portfolio, execution)
+                engine.run()
             
-            segment_res = {
-                'train_start': current_train_start,
-                'train_end': train_end,
-                'test_end': test_end,
-                'params': clean_params,
-                'train_return': best_params.get('Total Return', 0),
-                'test_return': 0.0,
-                'train_trades': 0,
-                'test_trades': 0
-            }
+                segment_res = {
+                    'train_start': current_train_start,
+                    'train_end': train_end,
+                    'test_end': test_end,
+                    'params': clean_params,
+                    'train_return': best_params.get('Total Return', 0),
+                    'test_return': 0.0,
+                    'train_trades': 0,
+                    'test_trades': 0
+                }
             
-            eq_curve = pd.DataFrame(portfolio.equity_curve)
-            if not eq_curve.empty:
-                 start_eq = eq_curve['equity'].iloc[0]
-                 end_eq = eq_curve['equity'].iloc[-1]
-                 seg_ret = (end_eq / start_eq) - 1.0
-                 segment_res['test_return'] = seg_ret
-                 segment_res['test_trades'] = len(portfolio.trade_log)
-
-                 if 'returns' not in eq_curve:
-                      eq_curve['returns'] = eq_curve['equity'].pct_change().fillna(0)
-                 stitched_equity.append(eq_curve['returns'])
-
-            wfo_results.append(segment_res)
+                eq_curve = pd.DataFrame(portfolio.equity_curve)
+                if not eq_curve.empty:
+                     start_eq = eq_curve['equity'].iloc[0]
+                     end_eq = eq_curve['equity'].iloc[-1]
+                     seg_ret = (end_eq / start_eq) - 1.0
+                     segment_res['test_return'] = seg_ret
+                     segment_res['test_trades'] = len(portfolio.trade_log)
+
+                     if 'returns' not in eq_curve:
+                          eq_curve['returns'] = eq_curve['equity'].pct_change().fillna(0)
+                     stitched_equity.append(eq_curve['returns'])
+
+                wfo_results.append(segment_res)
             
-            # MOVE FORWARD (Rolling via Step)
-            current_train_start = current_train_start + pd.DateOffset(days=self.step_days)
-            if test_end >= end_date:
-                break
+                # MOVE FORWARD (Rolling via Step)
+                current_train_start = current_train_start + pd.DateOffset(days=self.step_days)
+                if test_end >= end_date:
+                    break
                 
         wfo_df = pd.DataFrame(wfo_results)
 
@@ -313,25 +324,52 @@ class WalkForwardOptimizer:
 # --- Helper for Parallel Vectorized Backtest ---
 import multiprocessing
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from .shared_data import SharedDataset, SharedDatasetHandle, init_worker, resolve_bars, resolve_frame
+from .bar_frame import window_frame
+from .metrics_numba import compute_metrics
+
+# Metrics compared between a float32 sweep result and its float64 re-run
+VERIFIED_METRICS = ('Total Return', 'Sharpe Ratio', 'Max Drawdown')
+
+
+def _make_engine(vector_engine_cls, strategy, initial_capital, dtype=None):
+    """``vector_engine_cls(strategy, initial_capital)``, in ``dtype`` if one is given."""
+    if dtype is None or np.dtype(dtype) == np.float64:
+        return vector_engine_cls(strategy, initial_capital)
+    return vector_engine_cls(strategy, initial_capital, dtype=dtype)
+
 
 def _run_single_vector_backtest(args):
     """
     Runs a single vectorized backtest.
-    args: (vector_engine_cls, v_strat_cls, params, initial_capital, df)
+    args: (vector_engine_cls, v_strat_cls, params, initial_capital, df[, dtype])
+    df may be a DataFrame or a SharedDatasetHandle (attached zero-copy).
+    ``VectorEngine`` subclasses get the worker's cached read-only BarFrame;
+    ``dtype`` (default float64) is passed on to the engine.
     """
-    vector_engine_cls, v_strat_cls, params, initial_capital, df = args
+    vector_engine_cls, v_strat_cls, params, initial_capital, df = args[:5]
+    dtype = args[5] if len(args) > 5 else None
     try:
+        from .vector_engine import VectorEngine
+        if isinstance(vector_engine_cls, type) and issubclass(vector_engine_cls, VectorEngine):
+            df = resolve_bars(df)
+        else:
+            df = resolve_frame(df)
         v_strat = v_strat_cls(**params)
-        engine = vector_engine_cls(v_strat, initial_capital)
+        engine = _make_engine(vector_engine_cls, v_strat, initial_capital, dtype)
         res = engine.run(df)
         
         final_eq = res['equity_curve'].iloc[-1]
         total_return = (final_eq / initial_capital) - 1.0
+        metrics = compute_metrics(res['equity_curve'], res.get('returns'))
         
         return {
             **params,
             'Total Return': total_return,
-            'Final Equity': final_eq
+            'Final Equity': final_eq,
+            'Sharpe Ratio': metrics['sharpe_ratio'],
+            'Max Drawdown': metrics['max_drawdown'],
         }
     except Exception as e:
         return {
@@ -341,11 +379,119 @@ def _run_single_vector_backtest(args):
             'Error': str(e)
         }
 
+def _run_vector_batch(args):
+    """
+    Runs a chunk of parameter sets through ``VectorEngine.run_batch``.
+    args: (vector_engine_cls, v_strat_cls, param_list, initial_capital, df[, dtype])
+    Falls back to one backtest per set if the batch fails, so per-set
+    errors are still reported; the batch failure itself is logged.
+    """
+    vector_engine_cls, v_strat_cls, param_list, initial_capital, df = args[:5]
+    dtype = args[5] if len(args) > 5 else None
+    try:
+        bars = resolve_bars(df)
+        engine = _make_engine(vector_engine_cls, v_strat_cls(**param_list[0]), initial_capital, dtype)
+        res = engine.run_batch(bars, param_list)
+        return [
+            {**params, 'Total Return': float(ret), 'Final Equity': float(eq),
+             'Sharpe Ratio': float(sharpe), 'Max Drawdown': float(dd)}
+            for params, ret, eq, sharpe, dd in zip(param_list, res['total_return'], res['final_equity'],
+                                                   res['sharpe_ratio'], res['max_drawdown'])
+        ]
+    except Exception:
+        logger.exception("Batched backtest of %d parameter sets failed; "
+                         "falling back to one backtest per set", len(param_list))
+        return [
+            _run_single_vector_backtest((vector_engine_cls, v_strat_cls, params, initial_capital, df, dtype))
+            for params in param_list
+        ]
+
+
+def verify_top_results(results: List[Dict], param_keys, vector_engine_cls, v_strat_cls,
+                       initial_capital: float, df, top_k: int = 10, tol: float = 1e-3,
+                       batched: bool = True) -> List[Dict]:
+    """
+    Re-runs the ``top_k`` results of a float32 sweep (by 'Total Return')
+    in float64 and returns the results with the float64 metrics in place.
+
+    Each verified result keeps its float32 metrics as '<metric> (float32)'
+    and its float32 rank as 'Rank (float32)', and gets 'Verified' True and
+    'Precision Mismatch' True when any of ``VERIFIED_METRICS`` differs by
+    more than ``tol`` (absolute and relative, see ``np.isclose``).
+    Unverified results get 'Verified' False, 'Precision Mismatch' False
+    and NaN for the float32 columns, so every returned result has the same
+    keys. Ranking on the returned 'Total Return' therefore orders the top
+    candidates by float64 values.
+    """
+    ranked = sorted((r for r in results if 'Error' not in r),
+                    key=lambda r: r.get('Total Return', -np.inf), reverse=True)
+    top = ranked[:top_k]
+    if not top:
+        return results
+    param_list = [{key: r[key] for key in param_keys} for r in top]
+    if batched:
+        checks = _run_vector_batch((vector_engine_cls, v_strat_cls, param_list, initial_capital, df))
+    else:
+        checks = [_run_single_vector_backtest((vector_engine_cls, v_strat_cls, params, initial_capital, df))
+                  for params in param_list]
+
+    verified = {}
+    for rank, (result, check) in enumerate(zip(top, checks), start=1):
+        row = {**result, 'Verified': 'Error' not in check, 'Rank (float32)': rank,
+               **{f'{metric} (float32)': result.get(metric, np.nan) for metric in VERIFIED_METRICS}}
+        if 'Error' in check:
+            row['Precision Mismatch'] = True
+            row['Error'] = check['Error']
+        else:
+            row['Precision Mismatch'] = False
+            for metric in VERIFIED_METRICS:
+                low, high = result.get(metric, np.nan), check.get(metric, np.nan)
+                row[metric] = high
+                if not np.isclose(low, high, rtol=tol, atol=tol, equal_nan=True):
+                    row['Precision Mismatch'] = True
+            row['Final Equity'] = check['Final Equity']
+        verified[id(result)] = row
+
+    mismatched = sum(row['Precision Mismatch'] for row in verified.values())
+    if mismatched:
+        logger.warning("%d of %d float32 sweep results differ from their float64 re-run "
+                       "by more than %g", mismatched, len(verified), tol)
+    unverified = {'Verified': False, 'Rank (float32)': np.nan, 'Precision Mismatch': False,
+                  **{f'{metric} (float32)': np.nan for metric in VERIFIED_METRICS}}
+    return [verified.get(id(r), {**r, **unverified}) for r in results]
+
+
+@contextmanager
+def _published(data):
+    """Shared-memory handle of ``data``; an already published handle is used as is."""
+    if isinstance(data, SharedDatasetHandle):
+        yield data
+    else:
+        with SharedDataset(data) as shared:
+            yield shared.handle
+
+
 class VectorizedGridSearch:
     """
     Ultra-High-Performance Parameter Optimizer.
     Uses VectorEngine to run backtests in bulk.
     Supports parallel CPU execution.
+
+    With ``batched=True`` (default) and a ``VectorEngine``/``VectorStrategy``
+    pair, the grid is split into one chunk per worker and each chunk runs
+    as a parameter matrix through ``VectorEngine.run_batch`` instead of one
+    backtest per combination.
+
+    ``data`` (a DataFrame, or a ``SharedDatasetHandle`` such as a
+    walk-forward window of an already published dataset) replaces loading
+    through ``data_handler_cls``.
+
+    ``dtype=np.float32`` runs the sweep on float32 bars and indicators
+    (about half the memory traffic, see ``VectorEngine``) and then re-runs
+    the ``verify_top_k`` best results in float64 with
+    ``verify_top_results``: the report's metrics for those rows are the
+    float64 ones, and 'Precision Mismatch' flags rows whose float32
+    metrics were off by more than ``verify_tol``.
     """
     def __init__(self, 
                  data_handler_cls: Type[DataHandler],
@@ -355,12 +501,22 @@ class VectorizedGridSearch:
                  initial_capital: float = 100000.0,
                  n_jobs: int = -1,
                  vector_strategy_cls=None,
-                 vector_engine_cls=None):
+                 vector_engine_cls=None,
+                 batched: bool = True,
+                 data=None,
+                 dtype=np.float64,
+                 verify_top_k: int = 10,
+                 verify_tol: float = 1e-3):
         self.data_handler_cls = data_handler_cls
         self.data_handler_args = data_handler_args
+        self.data = data
+        self.dtype = np.dtype(dtype)
+        self.verify_top_k = verify_top_k
+        self.verify_tol = verify_tol
         self.strategy_cls = strategy_cls
         self.param_grid = param_grid
         self.initial_capital = initial_capital
+        self.batched = batched
         self.results = []
         
         if n_jobs == -1:
@@ -379,6 +535,12 @@ class VectorizedGridSearch:
             'NqOrb15m': VectorizedNQORB
         }
 
+    def _can_batch(self, v_strat_cls) -> bool:
+        from .vector_engine import VectorEngine, VectorStrategy
+        return (self.batched
+                and isinstance(self.vector_engine_cls, type) and issubclass(self.vector_engine_cls, VectorEngine)
+                and isinstance(v_strat_cls, type) and issubclass(v_strat_cls, VectorStrategy))
+
     def _generate_param_combinations(self):
         keys = self.param_grid.keys()
         values = self.param_grid.values()
@@ -389,11 +551,14 @@ class VectorizedGridSearch:
         combinations = self._generate_param_combinations()
         print(f"Starting VECTORIZED Grid Search with {len(combinations)} combinations using {self.n_jobs} workers...")
         
-        data_handler = self.data_handler_cls(*self.data_handler_args)
-        symbol = self.data_handler_args[0][0]
-        df = data_handler.symbol_data.get(symbol)
+        if self.data is not None:
+            df = self.data
+        else:
+            data_handler = self.data_handler_cls(*self.data_handler_args)
+            symbol = self.data_handler_args[0][0]
+            df = data_handler.symbol_data.get(symbol)
         
-        if df is None:
+        if df is None or len(df) == 0:
             return pd.DataFrame()
 
         strat_name = self.strategy_cls.__name__
@@ -409,28 +574,56 @@ class VectorizedGridSearch:
             return pd.DataFrame()
 
         # Prepare arguments for parallel execution
-        # Note: passing large DF to workers via pickle can be slow. 
-        # But for 15m data over 15 years (~300k rows), it's manageable (few MBs).
+        # The frame is published once to shared memory (unless it already
+        # is); tasks carry only a small handle, so IPC cost no longer
+        # scales with the grid size.
         
-        if self.n_jobs > 1 and len(combinations) > 1:
-            args_list = [
-                (self.vector_engine_cls, v_strat_cls, params, self.initial_capital, df)
-                for params in combinations
-            ]
-            
-            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
-                futures = {executor.submit(_run_single_vector_backtest, args): args[2] for args in args_list}
+        if self._can_batch(v_strat_cls):
+            # One parameter-matrix chunk per worker
+            n_chunks = max(1, min(self.n_jobs, len(combinations)))
+            size = -(-len(combinations) // n_chunks)
+            chunks = [combinations[i:i + size] for i in range(0, len(combinations), size)]
+            if len(chunks) > 1:
+                with _published(df) as handle:
+                    with ProcessPoolExecutor(max_workers=len(chunks), initializer=init_worker,
+                                             initargs=(handle,)) as executor:
+                        futures = [
+                            executor.submit(_run_vector_batch, (self.vector_engine_cls, v_strat_cls, chunk,
+                                                                self.initial_capital, handle, self.dtype))
+                            for chunk in chunks
+                        ]
+                        for future in as_completed(futures):
+                            self.results.extend(future.result())
+            elif chunks:
+                self.results.extend(_run_vector_batch(
+                    (self.vector_engine_cls, v_strat_cls, chunks[0], self.initial_capital, df, self.dtype)))
+        elif self.n_jobs > 1 and len(combinations) > 1:
+            with _published(df) as handle:
+                args_list = [
+                    (self.vector_engine_cls, v_strat_cls, params, self.initial_capital, handle, self.dtype)
+                    for params in combinations
+                ]
                 
-                for future in as_completed(futures):
-                    res = future.result()
-                    self.results.append(res)
+                with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=init_worker,
+                                         initargs=(handle,)) as executor:
+                    futures = {executor.submit(_run_single_vector_backtest, args): args[2] for args in args_list}
+                    
+                    for future in as_completed(futures):
+                        res = future.result()
+                        self.results.append(res)
         else:
             # Sequential Fallback
             for params in combinations:
-                args = (self.vector_engine_cls, v_strat_cls, params, self.initial_capital, df)
+                args = (self.vector_engine_cls, v_strat_cls, params, self.initial_capital, df, self.dtype)
                 res = _run_single_vector_backtest(args)
                 self.results.append(res)
 
+        if self.dtype != np.float64 and self.verify_top_k > 0:
+            self.results = verify_top_results(
+                self.results, self.param_grid.keys(), self.vector_engine_cls, v_strat_cls,
+                self.initial_capital, df, top_k=self.verify_top_k, tol=self.verify_tol,
+                batched=self._can_batch(v_strat_cls))
+
         return pd.DataFrame(self.results).sort_values(by='Total Return', ascending=False)
 
 class BayesianOptimizer:
@@ -194,8 +194,12 @@ class Portfolio:
         # But here we just take the last update? 
         # Ideally passing 'timestamp' to this function is better.
         timestamp = datetime.now() # Placeholder, ideally pass current backtest time
+        # Handlers that merge feeds report the current step's timestamp
+        current_time = getattr(self.bars, 'current_time', None)
+        if isinstance(current_time, (datetime, pd.Timestamp)):
+            timestamp = current_time
         # Try to guess from data
-        if self.bars.symbol_list:
+        elif self.bars.symbol_list:
              # Just use the first symbol's latest bar time
              bar = self.bars.get_latest_bar(self.bars.symbol_list[0])
              if bar:
@@ -7,6 +7,8 @@ except ImportError:
     ta = None
 from enum import Enum
 
+from .indicator_cache import cached_indicator, fingerprint
+
 class Regime(Enum):
     BULL_TREND = "BULL_TREND"
     BEAR_TREND = "BEAR_TREND"
@@ -14,67 +16,73 @@ class Regime(Enum):
     CHOPPY_QUIET = "CHOPPY_QUIET"
     UNKNOWN = "UNKNOWN"
 
+def _sma(close: pd.Series, period: int) -> np.ndarray:
+    if ta is None:
+        sma = close.rolling(window=period).mean()
+    else:
+        sma = ta.sma(close, length=period)
+    if sma is None:
+        raise ValueError("not enough data for the SMA")
+    # Reindex to match df exactly to avoid alignment issues
+    return sma.reindex(close.index).to_numpy(np.float64)
+
+
+def _adx(high: pd.Series, low: pd.Series, close: pd.Series) -> np.ndarray:
+    if ta is None:
+        # Manual
+        prev_close = close.shift(1)
+
+        tr1 = high - low
+        tr2 = (high - prev_close).abs()
+        tr3 = (low - prev_close).abs()
+        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+        up_move = high - high.shift(1)
+        down_move = low.shift(1) - low
+
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+        alpha = 1.0 / 14.0
+        atr = tr.ewm(alpha=alpha, adjust=False).mean()
+        plus_di = 100 * (pd.Series(plus_dm, index=close.index).ewm(alpha=alpha, adjust=False).mean() / atr)
+        minus_di = 100 * (pd.Series(minus_dm, index=close.index).ewm(alpha=alpha, adjust=False).mean() / atr)
+
+        dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+        adx = dx.ewm(alpha=alpha, adjust=False).mean()
+    else:
+        adx_df = ta.adx(high, low, close, length=14)
+        adx = adx_df['ADX_14'] if adx_df is not None else pd.Series(0, index=close.index)
+    return adx.reindex(close.index).to_numpy(np.float64)
+
+
 class RegimeFilter:
     def __init__(self, adx_thresh=20, sma_period=50):
         self.adx_thresh = adx_thresh
         self.sma_period = sma_period
 
     def label_regime(self, df: pd.DataFrame) -> pd.Series:
-        df = df.copy()
-        if 'Close' in df.columns: df.rename(columns={'Close': 'close'}, inplace=True)
-        if 'High' in df.columns: df.rename(columns={'High': 'high'}, inplace=True)
-        if 'Low' in df.columns: df.rename(columns={'Low': 'low'}, inplace=True)
+        df = df.rename(columns={'Close': 'close', 'High': 'high', 'Low': 'low'})
         if 'close' not in df.columns: return pd.Series(Regime.UNKNOWN, index=df.index)
 
         try:
             if len(df) < self.sma_period:
                 return pd.Series(Regime.UNKNOWN, index=df.index)
 
-            if ta is None:
-                # Manual
-                price = df['close']
-                sma = price.rolling(window=self.sma_period).mean()
-                
-                high = df['high']
-                low = df['low']
-                close = df['close']
-                prev_close = close.shift(1)
-                
-                tr1 = high - low
-                tr2 = (high - prev_close).abs()
-                tr3 = (low - prev_close).abs()
-                tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-                
-                up_move = high - high.shift(1)
-                down_move = low.shift(1) - low
-                
-                plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
-                minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
-                
-                alpha = 1.0 / 14.0
-                atr = tr.ewm(alpha=alpha, adjust=False).mean()
-                plus_di = 100 * (pd.Series(plus_dm, index=df.index).ewm(alpha=alpha, adjust=False).mean() / atr)
-                minus_di = 100 * (pd.Series(minus_dm, index=df.index).ewm(alpha=alpha, adjust=False).mean() / atr)
-                
-                dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
-                adx = dx.ewm(alpha=alpha, adjust=False).mean()
-                
-            else:
-                sma = ta.sma(df['close'], length=self.sma_period)
-                adx_df = ta.adx(df['high'], df['low'], df['close'], length=14)
-                adx = adx_df['ADX_14'] if adx_df is not None else pd.Series(0, index=df.index)
-            
-            if adx is None or sma is None:
-                 return pd.Series(Regime.UNKNOWN, index=df.index)
-            
-            # Reindex to match df exactly to avoid alignment issues
-            sma = sma.reindex(df.index)
-            adx = adx.reindex(df.index)
-            
+            # Memoized per dataset (see indicator_cache.py): research stages
+            # label the same data with the same settings over and over
+            close, high, low = df['close'], df['high'], df['low']
+            source = 'manual' if ta is None else 'pandas_ta'
+            keys = (fingerprint(close), fingerprint(high), fingerprint(low))
+            sma = cached_indicator('regime_sma', (self.sma_period, source), keys[:1],
+                                   lambda: _sma(close, self.sma_period))
+            adx = cached_indicator('regime_adx', (14, source), keys,
+                                   lambda: _adx(high, low, close))
+
             # Use values for comparison to bypass index type mismatch
             # (e.g. if one has RangeIndex and other has DateTimeIndex)
-            adx_val = adx.values
-            sma_val = sma.values
+            adx_val = adx
+            sma_val = sma
             close_val = df['close'].values
             
             # Create updated checks handling NaNs safely
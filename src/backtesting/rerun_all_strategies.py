@@ -31,6 +31,7 @@ from backtesting.marcus_config import MarcusConfig
 from backtesting.registry import StrategyRegistry
 from backtesting.lifecycle import StrategyLifecycleManager
 from backtesting.vector_engine import VectorEngine, VectorizedNQORB, VectorizedMA
+from backtesting.bar_frame import BarFrame
 from backtesting.stage2_rigorous_backtest import RigorousBacktester, StrategyMapper
 from backtesting.research_engine import AutonomousResearchEngine
 from backtesting.monitor import PipelineMonitor
@@ -196,6 +197,8 @@ def run_backtests(config: MarcusConfig, ideas: list, data: pd.DataFrame) -> list
 
     # Pre-compute data range once
     data_range = (str(data.index[0].date()), str(data.index[-1].date()))
+    # Read-only bars shared by every backtest (strategies never touch `data`)
+    bars = BarFrame.from_frame(data)
 
     for i, idea in enumerate(ideas):
         try:
@@ -214,7 +217,7 @@ def run_backtests(config: MarcusConfig, ideas: list, data: pd.DataFrame) -> list
                 slippage=5.0,
                 point_value=20.0,
             )
-            result = engine.run(data)
+            result = engine.run(bars)
 
             # Extract metrics
             metrics = backtester._extract_metrics(result, strategy_name)
@@ -35,6 +35,7 @@ from .lifecycle import StrategyLifecycleManager
 from .monitor import PipelineMonitor
 from .accelerate import get_gpu_info, gpu_monte_carlo, GPU_AVAILABLE
 from .statistics import StatisticalSignificance
+from .indicator_cache import configure_indicator_cache, get_indicator_cache
 
 logger = logging.getLogger(__name__)
 
@@ -159,6 +160,10 @@ class AutonomousResearchEngine:
         self._backtester = None
         self._improver = None
         self._shared_data_handler = None  # Cached data handler (loaded once, ~8s save per backtest)
+        # Indicator memo shared by every stage's backtests: stages 1-4 rerun
+        # the same archetype on the same data (see indicator_cache.py)
+        configure_indicator_cache(max_bytes=config.indicator_cache_mb * 1024 * 1024,
+                                  spill_dir=config.indicator_cache_dir)
 
         # P1-2: LLM auto-disable after consecutive failures
         self._llm_consecutive_failures = 0
@@ -252,15 +257,22 @@ class AutonomousResearchEngine:
 
         This avoids the ~8s CSV reload for every strategy backtest.
         The cached data handler is shared across stages within and across cycles.
+        When the source file has grown since, the handler is rebuilt; the bar
+        cache then parses only the appended rows. If that refresh fails, the
+        previous (slightly stale) handler stays in use.
         """
-        if self._shared_data_handler is not None:
-            return self._shared_data_handler
+        previous = self._shared_data_handler
+        if previous is not None:
+            is_stale = getattr(previous, 'is_stale', None)
+            if not (callable(is_stale) and is_stale()):
+                return previous
+            logger.info("Shared data source changed, refreshing to the newest bars...")
 
         try:
             from .data import SmartDataHandler
             logger.info(f"Loading shared data for {self.config.symbol} ({self.config.interval})...")
             t0 = time.time()
-            self._shared_data_handler = SmartDataHandler(
+            handler = SmartDataHandler(
                 symbol_list=[self.config.symbol],
                 search_dirs=[self.config.data_dir],
                 start_date=pd.to_datetime(self.config.backtest_start),
@@ -269,12 +281,15 @@ class AutonomousResearchEngine:
             )
             elapsed = time.time() - t0
             # Verify data loaded
-            for sym, df in self._shared_data_handler.symbol_data.items():
+            for sym, df in handler.symbol_data.items():
                 logger.info(f"Shared data loaded: {len(df)} bars for {sym} in {elapsed:.1f}s (cached for all backtests)")
                 break
+            self._shared_data_handler = handler
         except Exception as e:
-            logger.error(f"Failed to load shared data: {e}")
-            self._shared_data_handler = None
+            if previous is not None:
+                logger.error(f"Failed to refresh shared data, keeping previous bars: {e}")
+            else:
+                logger.error(f"Failed to load shared data: {e}")
 
         return self._shared_data_handler
 
@@ -924,12 +939,30 @@ class AutonomousResearchEngine:
     # Stage 1: Basic Backtest
     # =========================================================================
 
+    def _stage1_prune_bounds(self):
+        """
+        Where a Stage 1 backtest may stop early (see ``VectorEngine.run``):
+        once ``s1_min_trades`` is out of reach, which fails Stage 1 anyway.
+        Stage 1 has no drawdown gate, so it never prunes on drawdown.
+        """
+        from .vector_engine import PruneBounds
+
+        return PruneBounds(min_trades=self.config.s1_min_trades)
+
+    def _stage2_prune_bounds(self):
+        """Stage 2's drawdown limit and the fewest trades either of its paths accepts."""
+        from .vector_engine import PruneBounds
+
+        return PruneBounds(max_drawdown=self.config.s2_max_drawdown_pct,
+                           min_trades=min(self.config.s2_min_trades, 50))
+
     def _stage1_basic_backtest(self, idea: Dict) -> Tuple[bool, Dict]:
         """
         Standard backtest with normal commission/slippage.
         Pass: net profit > 0, trades > min_trades
         Returns: (passed, metrics_dict) where metrics_dict includes 'equity_returns'
                  numpy array for Stage 5 complementarity check.
+        A run pruned by ``_stage1_prune_bounds`` fails with its partial metrics.
         """
         bt = self._get_backtester()
         if bt is None:
@@ -937,7 +970,8 @@ class AutonomousResearchEngine:
 
         try:
             # P1-1: Run with timeout to prevent hang
-            ok, result = self._run_with_timeout(bt.backtest_strategy, idea)
+            ok, result = self._run_with_timeout(bt.backtest_strategy, idea,
+                                                prune=self._stage1_prune_bounds())
             if not ok:
                 return False, result  # result is the error dict
             if result is None:
@@ -947,10 +981,12 @@ class AutonomousResearchEngine:
             net_profit = float(metrics.get('net_profit', 0))
             total_trades = int(metrics.get('total_trades', 0))
             sharpe = float(metrics.get('sharpe_ratio', 0))
+            pruned = metrics.get('status') == 'pruned'
 
             passed = (
                 net_profit > self.config.s1_min_profit and
-                total_trades >= self.config.s1_min_trades
+                total_trades >= self.config.s1_min_trades and
+                not pruned
             )
 
             metrics_out = {
@@ -979,6 +1015,8 @@ class AutonomousResearchEngine:
                     reasons.append(f"Net profit ${net_profit:.0f} <= ${self.config.s1_min_profit:.0f}")
                 if total_trades < self.config.s1_min_trades:
                     reasons.append(f"Trades {total_trades} < {self.config.s1_min_trades}")
+                if pruned:
+                    reasons.append(f"Pruned at {metrics.get('pruned_at')} ({metrics.get('prune_reason')})")
                 metrics_out['failure_reason'] = "; ".join(reasons)
 
             return passed, metrics_out
@@ -1005,7 +1043,8 @@ class AutonomousResearchEngine:
 
         try:
             # P1-1: Run with timeout to prevent hang
-            ok, result = self._run_with_timeout(bt.backtest_strategy, idea)
+            ok, result = self._run_with_timeout(bt.backtest_strategy, idea,
+                                                prune=self._stage2_prune_bounds())
             if not ok:
                 return False, result  # result is the error dict
             if result is None:
@@ -1060,6 +1099,8 @@ class AutonomousResearchEngine:
                     reasons.append(f"DD {max_dd:.1%} > {self.config.s2_max_drawdown_pct:.0%}")
                 if pf < self.config.s2_min_profit_factor:
                     reasons.append(f"PF {pf:.2f} < {self.config.s2_min_profit_factor}")
+                if metrics.get('status') == 'pruned':
+                    reasons.append(f"Pruned at {metrics.get('pruned_at')} ({metrics.get('prune_reason')})")
                 metrics_out['failure_reason'] = "; ".join(reasons)
                 return False, metrics_out
 
@@ -1152,17 +1193,15 @@ class AutonomousResearchEngine:
         period_results = {}
         all_profitable = True
 
+        # One backtester for all periods; each period is a searchsorted
+        # window of the shared bars (see BarFrame.window)
+        bt = self._get_backtester()
+        if bt is None:
+            return False, {'error': 'Backtester not available'}
+
         for i, (start, end) in enumerate(periods):
             try:
-                bt = self._get_backtester()
-                if bt is None:
-                    return False, {'error': 'Backtester not available'}
-
-                # Override date range for this period
-                bt.start_date = start
-                bt.end_date = end
-
-                result = bt.backtest_strategy(idea)
+                result = bt.backtest_strategy(idea, start_date=start, end_date=end)
                 if result is None:
                     all_profitable = False
                     period_results[f"period_{i}"] = {
@@ -1594,6 +1633,10 @@ class AutonomousResearchEngine:
             disposal = self.lifecycle.run_disposal_sweep()
             result.disposed = sum(disposal.values())
 
+            stats = get_indicator_cache().stats()
+            logger.info(f"Indicator cache: {stats['hits']} hits / {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%}), {stats['bytes'] / 1e6:.0f} MB in memory")
+
         except Exception as e:
             result.errors += 1
             result.error_details.append(f"Cycle-level error: {str(e)}")
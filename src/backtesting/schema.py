@@ -34,7 +34,7 @@ class Instrument:
     tick_size: float = 0.01
     margin_req: float = 0.0
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bar:
     """Represents a single OHLCV bar for a symbol."""
     symbol: str
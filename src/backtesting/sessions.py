@@ -0,0 +1,136 @@
+"""
+Session Calendar Index
+======================
+Per-dataset trading-calendar arrays shared by the vectorized strategies.
+
+``VectorizedNQORB`` and ``VectorizedOvernight`` used to rebuild trading-day
+ids with ``[d.toordinal() for d in df.index.date]`` (a Python ``date`` per
+bar) and recompute minute-of-day on every ``generate_signals`` call, i.e.
+once per sweep combo. ``session_index(df.index)`` computes everything once
+with integer arithmetic on the index ticks and caches it per dataset, so
+later calls are a dictionary lookup.
+
+All times are wall-clock times of the index (naive ET for our data; a
+tz-aware index is read in its own timezone, like ``index.date`` would be).
+"""
+
+import hashlib
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MINUTES_PER_DAY = 1440
+_CACHE_SIZE = 16
+
+_cache: "OrderedDict[tuple, SessionIndex]" = OrderedDict()
+# id(index) -> (weakref to index, fingerprint): skips re-hashing an index
+# object that has been seen before
+_known_indexes: dict = {}
+
+
+@dataclass(frozen=True)
+class SessionIndex:
+    """Calendar arrays aligned with a DatetimeIndex (all read-only)."""
+    # Calendar date of each bar as a proleptic ordinal (== date.toordinal())
+    day_ids: np.ndarray
+    # Minutes since midnight (hour * 60 + minute)
+    minute_of_day: np.ndarray
+    # Offset of the first bar of each day, then len(index): day k spans
+    # bars day_starts[k]:day_starts[k + 1]
+    day_starts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.day_ids)
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+def _wall_clock_ticks(index: pd.DatetimeIndex):
+    """int64 wall-clock ticks and ticks-per-minute of a DatetimeIndex."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    unit = np.datetime_data(index.dtype)[0]
+    per_minute = int(np.timedelta64(1, 'm') / np.timedelta64(1, unit))
+    return index.asi8, per_minute
+
+
+def _fingerprint(index: pd.DatetimeIndex) -> tuple:
+    ticks = index.asi8
+    digest = hashlib.blake2b(np.ascontiguousarray(ticks).view(np.uint8), digest_size=16).hexdigest()
+    return (len(ticks), str(index.dtype), digest)
+
+
+def build_session_index(index: pd.DatetimeIndex) -> SessionIndex:
+    """Computes the session arrays for an index (no caching)."""
+    ticks, per_minute = _wall_clock_ticks(pd.DatetimeIndex(index))
+    minutes = np.floor_divide(ticks, per_minute)
+    days = np.floor_divide(minutes, _MINUTES_PER_DAY)
+    minute_of_day = minutes - days * _MINUTES_PER_DAY
+    day_ids = days + _EPOCH_ORDINAL
+    day_starts = np.concatenate((
+        [0], np.flatnonzero(np.diff(day_ids)) + 1, [len(day_ids)])) if len(day_ids) else np.zeros(1)
+
+    return SessionIndex(
+        day_ids=_read_only(day_ids.astype(np.int64)),
+        minute_of_day=_read_only(minute_of_day.astype(np.int64)),
+        day_starts=_read_only(day_starts.astype(np.int64)),
+    )
+
+
+def session_index(data) -> SessionIndex:
+    """
+    Cached ``SessionIndex`` for a DataFrame or DatetimeIndex.
+
+    Entries are keyed by a fingerprint of the index values, so renamed or
+    shared-memory copies of the same dataset hit the same entry.
+    """
+    index = data.index if isinstance(data, pd.DataFrame) else data
+    if not isinstance(index, pd.DatetimeIndex):
+        raise TypeError("session_index requires a DatetimeIndex")
+
+    key = index_fingerprint(index)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    sessions = build_session_index(index)
+    _cache[key] = sessions
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return sessions
+
+
+def index_fingerprint(index: pd.DatetimeIndex) -> tuple:
+    """
+    (length, dtype, digest) of an index's values. Memoized per index object
+    (indexes are immutable), so repeated calls only hash new objects.
+    """
+    known = _known_indexes.get(id(index))
+    if known is not None and known[0]() is index:
+        return known[1]
+    key = _fingerprint(index)
+    _remember(index, key)
+    return key
+
+
+def _remember(index: pd.DatetimeIndex, key: tuple):
+    index_id = id(index)
+    try:
+        ref = weakref.ref(index, lambda _: _known_indexes.pop(index_id, None))
+    except TypeError:
+        return
+    _known_indexes[index_id] = (ref, key)
+
+
+def clear_session_cache():
+    _cache.clear()
+    _known_indexes.clear()
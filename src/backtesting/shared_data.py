@@ -0,0 +1,231 @@
+"""
+Shared-Memory Datasets
+======================
+Publishes an OHLCV DataFrame once into ``multiprocessing.shared_memory`` so
+ProcessPoolExecutor workers can attach zero-copy, read-only numpy views.
+
+Without this, every sweep task carries the full DataFrame in its argument
+tuple and a 1000-combo grid pickles the 15-year 5m NQ frame 1000 times.
+With it, tasks carry a tiny picklable ``SharedDatasetHandle`` and the
+worker initializer attaches the segment once per process.
+
+Usage (owner side):
+    with SharedDataset(df) as shared:
+        with ProcessPoolExecutor(initializer=init_worker,
+                                 initargs=(shared.handle,)) as ex:
+            ex.submit(task, shared.handle, params)
+
+Worker side:
+    df = resolve_frame(handle_or_df)   # DataFrame passes through untouched
+    bars = resolve_bars(handle_or_df)  # read-only BarFrame, cached per segment
+
+Date windows of a published dataset (walk-forward train/test splits) are
+handles too: ``shared.window(start, end)`` finds the rows by binary search
+and workers attach them as views, so no window is ever copied.
+"""
+
+import logging
+import sys
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_frame import BarFrame, as_bar_frame, window_bounds
+
+logger = logging.getLogger(__name__)
+
+_ALIGN = 64  # byte alignment of each column inside the segment
+
+
+@dataclass(frozen=True)
+class SharedDatasetHandle:
+    """Picklable description of a published dataset (a few hundred bytes)."""
+    shm_name: str
+    rows: int
+    index_unit: str
+    index_name: Optional[str]
+    # (column name, numpy dtype str, byte offset) for each column
+    columns: Tuple[Tuple[str, str, int], ...]
+    index_offset: int = 0
+    # Rows [row_start, row_stop) of the segment (see SharedDataset.window)
+    row_start: int = 0
+    row_stop: Optional[int] = None
+
+    def __len__(self) -> int:
+        stop = self.rows if self.row_stop is None else self.row_stop
+        return stop - self.row_start
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class SharedDataset:
+    """
+    Owns a shared-memory copy of a DataFrame's DatetimeIndex and numeric
+    columns. The segment lives until ``close()`` (or context exit).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError("SharedDataset requires a DatetimeIndex")
+
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        ticks = np.ascontiguousarray(index.asi8)
+
+        arrays = []
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                arrays.append((str(col), np.ascontiguousarray(series.to_numpy())))
+
+        # Lay out index then columns at aligned offsets
+        offset = _aligned(ticks.nbytes)
+        layout = []
+        for name, arr in arrays:
+            layout.append((name, arr.dtype.str, offset))
+            offset = _aligned(offset + arr.nbytes)
+
+        self._index = index
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        buf = self._shm.buf
+        np.ndarray(ticks.shape, dtype=ticks.dtype, buffer=buf, offset=0)[:] = ticks
+        for (name, dtype, col_offset), (_, arr) in zip(layout, arrays):
+            np.ndarray(arr.shape, dtype=dtype, buffer=buf, offset=col_offset)[:] = arr
+
+        self.handle = SharedDatasetHandle(
+            shm_name=self._shm.name,
+            rows=len(df),
+            index_unit=np.datetime_data(index.dtype)[0],
+            index_name=index.name,
+            columns=tuple(layout),
+        )
+
+    def window(self, start=None, end=None) -> SharedDatasetHandle:
+        """Handle to the rows from ``start`` to ``end`` (inclusive), found by searchsorted."""
+        rows = window_bounds(self._index, start, end)
+        if not isinstance(rows, slice):
+            raise ValueError("SharedDataset windows require a sorted index")
+        return replace(self.handle, row_start=rows.start, row_stop=rows.stop)
+
+    def close(self):
+        """Release and unlink the segment. Attached workers must be done."""
+        if self._shm is None:
+            return
+        _ATTACHED.pop(self._shm.name, None)
+        for key in [key for key in _BARS if key[0] == self._shm.name]:
+            del _BARS[key]
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views attached in this process are still alive; the mapping is
+            # released when they are garbage collected.
+            pass
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# --- Worker side ---
+
+# shm_name -> (SharedMemory, index, {column: read-only view})
+_ATTACHED: Dict[str, tuple] = {}
+# (shm_name, row_start, row_stop) -> BarFrame over the attached views (they
+# are read-only, so one instance, with its fingerprints and sessions,
+# serves every task on that window)
+_BARS: Dict[tuple, BarFrame] = {}
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    # Pool workers share the owner's resource tracker, so attaching never
+    # causes the segment to be unlinked when a worker exits; only the
+    # owner's close() unlinks it.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _attach_arrays(handle: SharedDatasetHandle):
+    cached = _ATTACHED.get(handle.shm_name)
+    if cached is not None:
+        return cached
+
+    shm = _open_segment(handle.shm_name)
+    buf = shm.buf
+    ticks = np.ndarray((handle.rows,), dtype=np.int64, buffer=buf, offset=handle.index_offset)
+    ticks.flags.writeable = False
+    index = pd.DatetimeIndex(ticks.view(f"M8[{handle.index_unit}]"), name=handle.index_name)
+
+    columns = {}
+    for name, dtype, offset in handle.columns:
+        view = np.ndarray((handle.rows,), dtype=dtype, buffer=buf, offset=offset)
+        view.flags.writeable = False
+        columns[name] = view
+
+    cached = (shm, index, columns)
+    _ATTACHED[handle.shm_name] = cached
+    return cached
+
+
+def attach_frame(handle: SharedDatasetHandle) -> pd.DataFrame:
+    """
+    Returns a new DataFrame backed by read-only views of the shared segment
+    (of the handle's row window). Each call returns a fresh frame object, so
+    column renames/assignments by one task never leak into the next; the
+    underlying buffers are shared.
+    """
+    _, index, columns = _attach_arrays(handle)
+    rows = slice(handle.row_start, handle.row_stop)
+    return pd.DataFrame({name: view[rows] for name, view in columns.items()},
+                        index=index[rows], copy=False)
+
+
+def attach_bars(handle: SharedDatasetHandle) -> BarFrame:
+    """The dataset as a ``BarFrame`` over the shared views (zero-copy, cached)."""
+    key = (handle.shm_name, handle.row_start, handle.row_stop)
+    bars = _BARS.get(key)
+    if bars is None:
+        bars = _BARS[key] = BarFrame.from_frame(attach_frame(handle))
+    return bars
+
+
+def init_worker(handle: SharedDatasetHandle, warmup: bool = True):
+    """
+    ProcessPoolExecutor initializer: attach the dataset once per worker and
+    load the compiled kernels, so the first task runs at full speed. Pools
+    already run one worker per core, so numba kernels stay single-threaded.
+    """
+    _attach_arrays(handle)
+    from .vector_engine import limit_parallel_threads
+    limit_parallel_threads(1)
+    if warmup:
+        from .jit_warmup import warmup_kernels
+        try:
+            warmup_kernels()
+        except Exception as e:
+            logger.warning(f"JIT warmup failed in worker: {e}")
+
+
+def resolve_frame(data) -> pd.DataFrame:
+    """Accepts either a DataFrame or a SharedDatasetHandle."""
+    if isinstance(data, SharedDatasetHandle):
+        return attach_frame(data)
+    return data
+
+
+def resolve_bars(data) -> BarFrame:
+    """Like ``resolve_frame``, but returns a read-only ``BarFrame``."""
+    if isinstance(data, SharedDatasetHandle):
+        return attach_bars(data)
+    return as_bar_frame(data)
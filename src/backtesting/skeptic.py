@@ -9,6 +9,7 @@ import sys
 
 from .vector_engine import VectorEngine
 from .strategy import Strategy
+from .shared_data import SharedDataset, init_worker, resolve_frame
 
 class StrategySkeptic:
     """
@@ -43,20 +44,23 @@ class StrategySkeptic:
         
         results = []
         
-        # Prepare args
-        args_list = []
-        for i in range(n_sims):
-            args_list.append((self.vector_engine_cls, self.vector_strategy_cls, self.params, self.initial_capital, df.copy(), i))
-        
-        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
-            futures = {executor.submit(_worker_permutation, arg): arg[5] for arg in args_list}
-            for future in as_completed(futures):
-                try:
-                    res = future.result()
-                    results.append(res)
-                except Exception as e:
-                    # Log but continue if individual worker fails
-                    pass
+        # Publish the frame once; each worker rebuilds its shuffled prices
+        # on a private frame wrapped around the shared read-only columns.
+        with SharedDataset(df) as shared:
+            args_list = []
+            for i in range(n_sims):
+                args_list.append((self.vector_engine_cls, self.vector_strategy_cls, self.params, self.initial_capital, shared.handle, i))
+            
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=init_worker,
+                                     initargs=(shared.handle,)) as executor:
+                futures = {executor.submit(_worker_permutation, arg): arg[5] for arg in args_list}
+                for future in as_completed(futures):
+                    try:
+                        res = future.result()
+                        results.append(res)
+                    except Exception as e:
+                        # Log but continue if individual worker fails
+                        pass
         
         # 3. Analyze
         if not results:
@@ -130,6 +134,9 @@ def _worker_permutation(args):
     Shuffles returns and rebuilds price.
     """
     engine_cls, strat_cls, params, init_cap, df, seed = args
+    # Fresh frame object per task: column assignments below replace columns
+    # on this frame only and never write into the shared buffers.
+    df = resolve_frame(df)
     
     np.random.seed(seed) 
     
@@ -141,7 +148,7 @@ def _worker_permutation(args):
         return -1.0 # Fail safe
 
     # Shuffle Returns
-    returns = df[close_col].pct_change().fillna(0).values
+    returns = df[close_col].pct_change().fillna(0).to_numpy(copy=True)
     np.random.shuffle(returns)
     
     # Rebuild Close
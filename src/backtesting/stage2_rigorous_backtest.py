@@ -20,13 +20,19 @@ import logging
 import os
 import sys
 import traceback
+import weakref
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from .vector_engine import VectorEngine, VectorizedNQORB, VectorizedMA, VectorizedOvernight, VectorStrategy
+from .vector_engine import (
+    PruneBounds, VectorEngine, VectorizedNQORB, VectorizedMA, VectorizedOvernight, VectorStrategy,
+)
+from .bar_frame import BarFrame
+from .metrics_numba import bars_per_year, compute_metrics
+from .sessions import session_index
 from .data import SmartDataHandler
 from .registry import StrategyRegistry
 from .stage1_strategy_research import STRATEGY_ARCHETYPES
@@ -101,6 +107,15 @@ class QualityChecker:
 
         return passed, issues
 
+    def prune_bounds(self) -> PruneBounds:
+        """
+        The drawdown limit and the smallest trade count that both paths
+        of ``check`` require: a backtest that fails them part way through
+        cannot pass, so it can stop there.
+        """
+        return PruneBounds(max_drawdown=-self.max_drawdown,
+                           min_trades=min(self.min_trades, max(50, self.min_trades // 2)))
+
     @staticmethod
     def _safe_float(val) -> float:
         """Safely convert to float, handling None/NaN (Issue #7)."""
@@ -315,6 +330,11 @@ class RigorousBacktester:
     # P2-2: Suppress redundant "Data loaded" log after first load
     _data_load_logged = False
 
+    # (weakref to DataFrame, BarFrame) of the last dataset: backtesters
+    # built on the same shared frame (e.g. one per Stage 3 period) reuse
+    # its bars, fingerprints and session index
+    _shared_bars = None
+
     def __init__(
         self,
         data_handler: SmartDataHandler = None,
@@ -339,10 +359,14 @@ class RigorousBacktester:
         # Lazy-load data
         self._data_handler = data_handler
         self._dataframe = None
+        # Read-only bars of _dataframe shared by every backtest (no per-run copy)
+        self._bars = None
 
     def _ensure_data(self):
         """Load data if not already loaded."""
         if self._dataframe is not None:
+            if self._bars is None:
+                self._bars = self._bar_frame(self._dataframe)
             return
 
         if self._data_handler is None:
@@ -370,6 +394,7 @@ class RigorousBacktester:
 
         # Fix Issue #9: Ensure datetime index is properly parsed
         self._fix_datetime_index()
+        self._bars = self._bar_frame(self._dataframe)
 
         # P2-2: Only log data load info once (data is cached via shared handler)
         if not RigorousBacktester._data_load_logged:
@@ -379,6 +404,16 @@ class RigorousBacktester:
             )
             RigorousBacktester._data_load_logged = True
 
+    @classmethod
+    def _bar_frame(cls, df: pd.DataFrame) -> BarFrame:
+        """Read-only bars of ``df``, shared with other backtesters on the same frame."""
+        cached = cls._shared_bars
+        if cached is not None and cached[0]() is df and cached[1].index is df.index:
+            return cached[1]
+        bars = BarFrame.from_frame(df)
+        cls._shared_bars = (weakref.ref(df), bars)
+        return bars
+
     def _fix_datetime_index(self):
         """
         Fix Issue #9: Date parsing error that caused '1970-01-01' dates.
@@ -409,13 +444,22 @@ class RigorousBacktester:
 
         self._dataframe = df
 
-    def backtest_strategy(self, strategy_idea: Dict[str, Any]) -> Dict[str, Any]:
+    def backtest_strategy(self, strategy_idea: Dict[str, Any], start_date=None,
+                          end_date=None, prune: PruneBounds = None) -> Dict[str, Any]:
         """
         Run a REAL backtest on a strategy idea.
 
         THIS IS THE FIX FOR CRITICAL BUG #1.
         Instead of returning dummy results, this actually executes the strategy
         using VectorEngine and returns real trade metrics.
+
+        ``start_date``/``end_date`` override the backtester's date range for
+        this run only (e.g. Stage 3 periods on one shared backtester).
+
+        ``prune`` stops the run once it has failed one of the bounds (see
+        ``VectorEngine.run``): the metrics then cover the bars up to
+        ``pruned_at``, with status "pruned" and the failed bound in
+        ``prune_reason``.
         """
         strategy_name = strategy_idea.get("strategy_name", "Unknown")
 
@@ -437,22 +481,24 @@ class RigorousBacktester:
                 point_value=self.config.get('point_value', 20.0),
             )
 
-            # Apply date range filtering if start_date/end_date are set
-            df = self._dataframe.copy()
-            if self.start_date is not None:
-                start_ts = pd.to_datetime(self.start_date)
-                df = df[df.index >= start_ts]
-            if self.end_date is not None:
-                end_ts = pd.to_datetime(self.end_date)
-                df = df[df.index <= end_ts]
+            # Apply date range filtering if start_date/end_date are set:
+            # a searchsorted view of the shared read-only bars, no copy
+            bars = self._bars.window(
+                start_date if start_date is not None else self.start_date,
+                end_date if end_date is not None else self.end_date,
+            )
 
-            if len(df) == 0:
+            if len(bars) == 0:
                 return self._error_result(strategy_name, "No data in date range")
 
-            result = engine.run(df)
+            result = engine.run(bars, prune=prune)
 
             # Extract metrics from real results
             metrics = self._extract_metrics(result, strategy_name)
+            if result.get("pruned") and metrics["status"] == "completed":
+                metrics["status"] = "pruned"
+                metrics["prune_reason"] = result["pruned"]
+                metrics["pruned_at"] = str(result["equity_curve"].index[-1])
 
             return metrics
 
@@ -470,91 +516,30 @@ class RigorousBacktester:
         if equity_curve is None or len(equity_curve) == 0:
             return self._error_result(strategy_name, "Empty equity curve")
 
-        # Safe metric extraction (Issue #7)
-        try:
-            final_equity = float(equity_curve.iloc[-1])
-            initial_equity = float(equity_curve.iloc[0])
-            total_return = (final_equity / initial_equity) - 1.0 if initial_equity > 0 else 0.0
-        except (IndexError, TypeError, ZeroDivisionError):
+        # All bar-level metrics in one compiled pass (see metrics_numba).
+        # Per-trade net returns come from the trade ledger the strategy
+        # kernels write (see vector_engine.TRADE_DTYPE), else from runs of
+        # constant position.
+        trades = result.get("trades")
+        index = getattr(equity_curve, "index", None)
+        m = compute_metrics(
+            equity_curve,
+            returns,
+            signals=signals,
+            trade_returns=trades["net_return"] if trades is not None else None,
+            day_ids=session_index(index).day_ids if isinstance(index, pd.DatetimeIndex) else None,
+            bars_per_year=bars_per_year(getattr(self, "interval", None)),
+        )
+        final_equity = m["final_equity"]
+        total_return = m["total_return"]
+        if not np.isfinite(final_equity):
+            # Safe metric extraction (Issue #7)
             total_return = 0.0
             final_equity = self.initial_capital
 
         # Net profit
         net_profit = final_equity - self.initial_capital
 
-        # Returns-based metrics
-        clean_returns = returns.dropna() if returns is not None else pd.Series([0.0])
-
-        # Sharpe ratio (annualized for intraday bars)
-        # For 5-min bars: ~78 bars/day x 252 trading days = 19,656 bars/year
-        # Annualization factor = sqrt(bars_per_year)
-        if len(clean_returns) > 1 and clean_returns.std() > 0:
-            # Estimate bars per year from data frequency
-            if hasattr(self, 'interval') and self.interval == '5m':
-                bars_per_year = 252 * 78  # 5-min bars: ~78 per day
-            elif hasattr(self, 'interval') and self.interval in ('15m', '15min'):
-                bars_per_year = 252 * 26  # 15-min bars: ~26 per day
-            elif hasattr(self, 'interval') and self.interval in ('1h', '60m'):
-                bars_per_year = 252 * 6.5  # hourly bars: ~6.5 per day
-            else:
-                bars_per_year = 252  # default: daily
-            sharpe = float(np.sqrt(bars_per_year) * clean_returns.mean() / clean_returns.std())
-        else:
-            sharpe = 0.0
-
-        # Max drawdown
-        if equity_curve is not None and len(equity_curve) > 0:
-            peak = equity_curve.cummax()
-            safe_peak = peak.replace(0, np.nan)
-            drawdown = ((equity_curve - peak) / safe_peak).fillna(0)
-            max_drawdown = float(drawdown.min())
-        else:
-            max_drawdown = 0.0
-
-        # Trade counting from signal changes
-        if signals is not None:
-            signal_changes = signals.diff().fillna(0)
-            entries = (signal_changes != 0).sum()
-            total_trades = max(0, int(entries) // 2)  # Entry + exit = 1 round trip
-        else:
-            total_trades = 0
-
-        # Win rate estimation from returns segmented by trade
-        win_trades = 0
-        loss_trades = 0
-        if signals is not None and returns is not None:
-            # Segment returns by position
-            pos = signals.shift(1).fillna(0)
-            trade_returns = returns * pos
-
-            # Group returns by trade (signal change boundaries)
-            trade_boundaries = pos.diff().fillna(0) != 0
-            trade_ids = trade_boundaries.cumsum()
-            trade_pnls = trade_returns.groupby(trade_ids).sum()
-            trade_pnls = trade_pnls[trade_pnls != 0]  # Remove flat periods
-
-            total_trades = len(trade_pnls)
-            win_trades = int((trade_pnls > 0).sum())
-            loss_trades = int((trade_pnls < 0).sum())
-
-        win_rate = (win_trades / total_trades * 100) if total_trades > 0 else 0.0
-
-        # Profit factor (based on per-trade PnL, not bar-level returns)
-        # Uses trade_pnls computed above for accurate win/loss grouping
-        if total_trades > 0 and win_trades + loss_trades > 0:
-            # Recompute trade-level profit factor from grouped trade PnLs
-            pos = signals.shift(1).fillna(0)
-            trade_returns = returns * pos
-            trade_boundaries = pos.diff().fillna(0) != 0
-            trade_ids = trade_boundaries.cumsum()
-            trade_pnls_pf = trade_returns.groupby(trade_ids).sum()
-            trade_pnls_pf = trade_pnls_pf[trade_pnls_pf != 0]
-            gross_profit = float(trade_pnls_pf[trade_pnls_pf > 0].sum())
-            gross_loss = float(abs(trade_pnls_pf[trade_pnls_pf < 0].sum()))
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0.0
-        else:
-            profit_factor = 0.0
-
         # Date range (Fix Issue #9)
         try:
             date_start = str(self._dataframe.index[0])
@@ -563,28 +548,25 @@ class RigorousBacktester:
             date_start = str(self.start_date)
             date_end = str(self.end_date)
 
-        # Equity returns for Stage 5 complementarity check
-        # These are the pct_change() of the equity curve, used for correlation analysis
-        if equity_curve is not None and len(equity_curve) > 1:
-            equity_returns_arr = equity_curve.pct_change().dropna().values
-        else:
-            equity_returns_arr = np.array([])
-
         return {
             "strategy_name": strategy_name,
             "total_return": total_return,
             "net_profit": net_profit,
             "final_equity": final_equity,
-            "sharpe_ratio": sharpe,
-            "max_drawdown": max_drawdown,
-            "total_trades": total_trades,
-            "win_rate": win_rate,
-            "win_trades": win_trades,
-            "loss_trades": loss_trades,
-            "profit_factor": profit_factor,
+            "sharpe_ratio": m["sharpe_ratio"],
+            "max_drawdown": m["max_drawdown"],
+            "total_trades": m["total_trades"],
+            "win_rate": m["win_rate"],
+            "win_trades": m["win_trades"],
+            "loss_trades": m["loss_trades"],
+            "profit_factor": m["profit_factor"],
             "date_range_start": date_start,
             "date_range_end": date_end,
-            "equity_returns": equity_returns_arr,
+            # pct_change() of the equity curve, for the Stage 5
+            # complementarity (correlation) check
+            "equity_returns": m["equity_returns"],
+            # Compounded returns per calendar day (empty without a DatetimeIndex)
+            "daily_returns": m["daily_returns"],
             # P0-5: Preserve raw equity curve Series for winner persistence
             "equity_curve_raw": equity_curve,
             "status": "completed",
@@ -622,10 +604,13 @@ class RigorousBacktester:
             name = idea.get("strategy_name", f"Strategy_{i}")
             logger.info(f"[{i+1}/{len(ideas)}] Backtesting: {name}")
 
-            metrics = self.backtest_strategy(idea)
+            # Ideas that fail the quality gates part way through stop there
+            metrics = self.backtest_strategy(idea, prune=self.quality_checker.prune_bounds())
 
             # Quality check with OR-logic (Issue #12)
             passed, issues = self.quality_checker.check(metrics)
+            if metrics["status"] == "pruned":
+                issues.append(f"Pruned at {metrics['pruned_at']} ({metrics['prune_reason']})")
             metrics["quality_passed"] = passed
             metrics["quality_issues"] = issues
 
@@ -1,4 +1,5 @@
 
+from dataclasses import asdict
 from datetime import datetime
 import pandas as pd
 from .strategy import Strategy
@@ -91,7 +92,7 @@ class NqOrb15m(Strategy):
                 # Retrieve Indicators
                 # Note: In a real system, we'd use an incremental indicator calculator for speed.
                 # Here we re-calc using pandas for simplicity/parity.
-                df = pd.DataFrame([vars(b) for b in history])
+                df = pd.DataFrame([asdict(b) for b in history])
                 closes = df['close']
                 highs = df['high']
                 lows = df['low']
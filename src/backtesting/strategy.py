@@ -17,6 +17,10 @@ class Strategy(ABC):
     Abstract Base Class for Strategies.
     Strategies accept updates (Bars) and generate SignalEvents.
     """
+
+    # Largest N passed to bars.get_latest_bars(); the engine reserves this
+    # much per-symbol history up front. None keeps the handler default.
+    history_bars: Optional[int] = None
     
     def __init__(self, bars: DataHandler, events: Queue):
         self.bars = bars       # Access to historical data
@@ -0,0 +1,277 @@
+"""
+Streaming Backtests
+===================
+``VectorEngine`` results extended with new bars instead of recomputed.
+
+The daemon, ``rerun_all_strategies.py`` and the dashboard rerun every
+active strategy over the whole dataset whenever new bars arrive, so a day
+of 5-minute bars costs a full 15-year backtest per strategy. A
+``StreamingBacktest`` keeps the state each stage ends in and continues
+from it:
+
+- indicators: the EMA/ATR recursions (``ta_numba.ema_resume`` /
+  ``atr_resume``);
+- strategy kernel: re-run from the bar before its last state reset
+  (``_state_resets``, e.g. the first bar of the ORB day), so only the open
+  day is replayed;
+- engine: compounding, the held position and the last valid price of
+  ``_fused_fill``;
+- ledger: trades closed before the new bars are kept, only the open one
+  is rebuilt;
+- metrics: the Sharpe/drawdown accumulators of ``running_metrics``.
+
+Appending N bars therefore costs O(N + one session), and every array,
+trade and metric equals a ``VectorEngine.run`` over all the bars
+(``tests/test_backtesting/test_streaming.py`` checks this across chunk
+boundaries). Strategies whose indicators cannot resume (ORB's HTF, RVOL,
+Hurst and ADX filters, which use rolling pandas windows and daily
+resampling; strategies without ``_streamable``) fall back to a full
+``engine.run`` per extension, with the same results.
+
+Usage:
+    stream = StreamingBacktest(VectorEngine(VectorizedNQORB()), bars_per_year=252 * 78)
+    stream.extend(history)             # -> running metrics
+    stream.extend(new_bars)            # bars after the last timestamp
+    result = stream.result()           # same dict as engine.run(all bars)
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from . import ta_numba as fast_ta
+from .bar_frame import BarFrame, as_bar_frame
+from .metrics_numba import running_metrics
+from .sessions import build_session_index
+from .type_utils import normalize_returns
+from .vector_engine import (
+    EXIT_DATA_END, TRADE_DTYPE, _fillna, _fused_fill, _fused_state, _ledger_records,
+    _numba_trade_ledger, _trade_returns,
+)
+
+_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class _Buffer:
+    """Append-only array that doubles its capacity as it grows."""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._array = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def resize(self, size: int):
+        """Sets the length; new elements are uninitialized."""
+        if size > len(self._array):
+            grown = np.empty(max(size, 2 * len(self._array)), dtype=self._array.dtype)
+            grown[:self.size] = self._array[:self.size]
+            self._array = grown
+        self.size = size
+
+    def extend(self, values):
+        start = self.size
+        self.resize(start + len(values))
+        self._array[start:self.size] = values
+
+    @property
+    def data(self) -> np.ndarray:
+        """Writable view of the elements."""
+        return self._array[:self.size]
+
+    def view(self, start: int = 0) -> np.ndarray:
+        """Read-only view of the elements from ``start``."""
+        arr = self._array[start:self.size]
+        arr.flags.writeable = False
+        return arr
+
+
+class StreamingBacktest:
+    """
+    An ``engine`` backtest extended bar by bar (see module docstring).
+    ``bars_per_year`` annualizes the running Sharpe ratio.
+    """
+
+    def __init__(self, engine, bars_per_year: float = 252):
+        self.engine = engine
+        self.strategy = engine.strategy
+        self.bars_per_year = bars_per_year
+        streamable = getattr(self.strategy, '_streamable', None)
+        self.incremental = bool(streamable and streamable())
+        self.reset()
+
+    def reset(self):
+        """Forgets all bars."""
+        dtype = self.engine.dtype
+        self._bars = {name: _Buffer(dtype) for name in _COLUMNS}
+        self._ticks = _Buffer(np.int64)
+        self._time_dtype = None
+        self._tz = None
+        self._ema, self._atr = _Buffer(dtype), _Buffer(dtype)
+        self._ema_state = (np.nan, 1.0)
+        self._atr_state = (np.nan, 1.0, np.nan)
+        self._signals = _Buffer(np.int32)
+        self._positions = _Buffer(np.float64)
+        self._exits = _Buffer(np.int8)
+        self._fills = _Buffer(np.float64)
+        self._net = _Buffer(np.float64)
+        self._turnover = _Buffer(np.float64)
+        self._equity = _Buffer(np.float64)
+        self._trades = _Buffer(TRADE_DTYPE, capacity=64)
+        self._engine_state = _fused_state()
+        self._metrics_state = None
+        self._full = None  # last engine.run result of the fallback path
+        # Bar the strategy kernel is re-run from: flat, and followed by a
+        # bar that resets every kernel variable
+        self._resume = 0
+        self.metrics: Dict = {}
+
+    def __len__(self) -> int:
+        return self._ticks.size
+
+    def run(self, df) -> Dict:
+        """Backtests ``df`` from scratch; returns ``result()``."""
+        self.reset()
+        self.extend(df)
+        return self.result()
+
+    def extend(self, df) -> Dict:
+        """
+        Appends the bars of ``df`` (a BarFrame or DataFrame whose index
+        starts after the last bar so far) and returns the running metrics
+        (the scalar ``compute_metrics`` keys, trades from the ledger).
+        """
+        new = as_bar_frame(df).astype(self.engine.dtype)
+        if len(new) == 0:
+            return self.metrics
+        old = len(self)
+        self._append_bars(new)
+        if self.incremental:
+            self._extend_kernel(old)
+            self._extend_engine(old)
+            self._extend_ledger(old)
+        else:
+            self._full = self.engine.run(self._frame(0))
+            self._trades.resize(0)
+            self._trades.extend(self._full['trades'])
+            self._equity.resize(0)
+            self._equity.extend(self._full['equity_curve'].to_numpy())
+            self._net.resize(0)
+            self._net.extend(self._full['returns'].to_numpy())
+
+        self.metrics, self._metrics_state = running_metrics(
+            self._equity.view(old), self._net.view(old), self._metrics_state,
+            trade_returns=self._trades.data['net_return'], bars_per_year=self.bars_per_year)
+        return self.metrics
+
+    def result(self) -> Dict:
+        """The ``VectorEngine.run`` result of all bars so far."""
+        if not self.incremental:
+            return self._full
+        result = {
+            'equity_curve': self._equity.data.copy(),
+            'signals': self._signals.data.copy(),
+            'returns': self._net.data.copy(),
+            'turnover': self._turnover.data.copy(),
+        }
+        result = normalize_returns(result, index=self._index(0))
+        result['trades'] = self._trades.data.copy()
+        return result
+
+    def _append_bars(self, new: BarFrame):
+        index = new.index
+        if not isinstance(index, pd.DatetimeIndex):
+            raise TypeError("StreamingBacktest requires a DatetimeIndex")
+        if not index.is_monotonic_increasing:
+            raise ValueError("new bars must be sorted by time")
+        if self._time_dtype is None:
+            self._time_dtype = np.dtype(f'datetime64[{index.unit}]')
+            self._tz = index.tz
+        elif index.unit != self._time_dtype.name[11:-1]:
+            index = index.as_unit(self._time_dtype.name[11:-1])
+        ticks = index.asi8
+        if len(self) and ticks[0] <= self._ticks.data[-1]:
+            raise ValueError(f"new bars must start after {self._index(len(self) - 1)[0]}")
+        self._ticks.extend(ticks)
+        for name in _COLUMNS:
+            self._bars[name].extend(getattr(new, name))
+
+    def _index(self, start: int, stop: int = None) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self._ticks.data[start:stop].view(self._time_dtype))
+        if self._tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self._tz)
+        return index
+
+    def _frame(self, start: int) -> BarFrame:
+        """Bars from ``start`` as a BarFrame of read-only views."""
+        return BarFrame(index=self._index(start),
+                        **{name: self._bars[name].view(start) for name in _COLUMNS})
+
+    def _extend_kernel(self, old: int):
+        """Indicators for the new bars, then the kernel from ``_resume``."""
+        strategy = self.strategy
+        close, high, low = (self._bars[name].view(old) for name in ('close', 'high', 'low'))
+        ema, self._ema_state = fast_ta.ema_resume(close, strategy.ema_filter, self._ema_state)
+        atr, self._atr_state = fast_ta.atr_resume(
+            high, low, close, strategy.atr_filter, self._atr_state)
+        self._ema.extend(_fillna(ema))
+        self._atr.extend(_fillna(atr))
+
+        start = self._resume
+        tail = self._frame(start)
+        sessions = build_session_index(tail.index)
+        inputs = strategy._inputs(tail, sessions, self._ema.view(start), self._atr.view(start))
+        signals, exits, fills = strategy._run_kernel(tail, inputs)
+
+        # Bars before ``old`` replay to the values they already have
+        new = slice(old - start, None)
+        self._signals.extend(signals[new])
+        self._positions.extend(signals[new])
+        self._exits.extend(exits[new])
+        self._fills.extend(fills[new])
+
+        resets = strategy._state_resets(sessions)
+        resets[1:] &= signals[:-1] == 0
+        last = np.flatnonzero(resets)
+        if len(last):
+            self._resume = start + int(last[-1]) - 1
+
+    def _extend_engine(self, old: int):
+        """Returns, costs and equity of the new bars, continuing the compounding."""
+        n = len(self)
+        for buffer in (self._net, self._turnover, self._equity):
+            buffer.resize(n)
+        engine = self.engine
+        if engine.intrabar_fills:
+            fills = self._fills.data
+        else:
+            fills = np.full(n, np.nan)
+        _fused_fill(
+            self._net.data, self._turnover.data, self._equity.data,
+            self._bars['close'].view(), self._bars['high'].view(), self._bars['low'].view(),
+            self._positions.data, fills, old, self._engine_state,
+            float(engine.commission_per_unit + engine.slippage_per_unit),
+            float(engine.volatility_factor), float(engine.point_value), float(engine.initial_capital))
+
+    def _extend_ledger(self, old: int):
+        """
+        Rebuilds the ledger from the open trade (or the new bars) on, and
+        the net returns of trades whose return window reached the new bars.
+        """
+        trades = self._trades
+        start = old
+        if trades.size and trades.data[-1]['exit_reason'] == EXIT_DATA_END:
+            start = int(trades.data[-1]['entry_bar'])
+            trades.resize(trades.size - 1)
+        rows = _numba_trade_ledger(
+            self._positions.view(start), self._exits.view(start), self._fills.view(start),
+            self._bars['close'].view(start), self._bars['high'].view(start),
+            self._bars['low'].view(start))
+        ledger = _ledger_records(rows)
+        ledger['entry_bar'] += start
+        ledger['exit_bar'] += start
+        trades.extend(ledger)
+
+        ledger = trades.data
+        recent = np.searchsorted(ledger['exit_bar'], old - 1)
+        ledger['net_return'][recent:] = _trade_returns(
+            ledger[recent:], self._positions.data, self._equity.data)
@@ -116,3 +116,37 @@ def chop_index(high: pd.Series, low: pd.Series, close: pd.Series, length: int =
     
     ci = 100 * log_x / log_len
     return ci
+
+def rolling_max(series: pd.Series, length: int) -> pd.Series:
+    """Highest value over the last `length` bars"""
+    return series.rolling(window=length).max()
+
+def rolling_min(series: pd.Series, length: int) -> pd.Series:
+    """Lowest value over the last `length` bars"""
+    return series.rolling(window=length).min()
+
+def bollinger(series: pd.Series, length: int = 20, mult: float = 2.0):
+    """
+    Bollinger Bands (population stdev, as TradingView's ta.stdev).
+    Returns: (basis, upper, lower)
+    """
+    basis = sma(series, length)
+    dev = mult * series.rolling(window=length).std(ddof=0)
+    return basis, basis + dev, basis - dev
+
+def efficiency_ratio(close: pd.Series, length: int = 10) -> pd.Series:
+    """Kaufman Efficiency Ratio: abs(Change) / Sum of abs(Diff) over `length` bars"""
+    change = close.diff(length).abs()
+    volatility = close.diff().abs().rolling(window=length).sum()
+    return change / volatility
+
+def vwap(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
+    """
+    Session VWAP of the typical price, anchored at each calendar day.
+    Falls back to the close while the session has no volume.
+    """
+    day = high.index.date
+    typical = (high + low + close) / 3.0
+    num = (typical * volume).groupby(day).cumsum()
+    den = volume.groupby(day).cumsum()
+    return (num / den).where(den > 0, close)
@@ -0,0 +1,385 @@
+"""
+Compiled Technical Analysis Library
+===================================
+Numba versions of the ``ta`` indicators (plus rolling max/min, session
+VWAP, Bollinger Bands and the efficiency ratio) on raw float64 arrays.
+
+``ta`` builds each indicator from pandas ``ewm``/``rolling`` calls and a
+``pd.concat(...).max(axis=1)`` true range, allocating several full-length
+temporaries per call. These kernels do one pass per indicator and are
+compiled with ``cache=True`` so worker processes load them from disk.
+
+``ta`` stays the reference implementation: every function here returns
+the same values as its pandas counterpart (NaN where pandas gives NaN),
+which ``tests/test_backtesting/test_ta_numba.py`` checks on ES bars.
+Recursive indicators (EMA/RMA/ATR/RSI/ADX) replicate pandas' ``ewm``
+update exactly; rolling windows may differ in the last few ulps because
+pandas uses compensated online sums.
+
+Inputs may be Series or arrays; outputs are float64 ndarrays.
+"""
+
+import numpy as np
+
+try:
+    from numba import jit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    def jit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+def _as_float(values, dtype=np.float64) -> np.ndarray:
+    """
+    Contiguous read-only view of the input. Series already come out
+    read-only under copy-on-write; marking every input the same way keeps
+    the kernels at one compiled (and disk-cached) signature.
+    """
+    arr = np.ascontiguousarray(np.asarray(values, dtype=dtype)).view()
+    arr.flags.writeable = False
+    return arr
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _ewm_mean(values, alpha):
+    """pandas ``ewm(alpha=alpha, adjust=False).mean()`` (ignore_na=False)."""
+    return _ewm_resume(values, alpha, np.nan, 1.0)[0]
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _ewm_resume(values, alpha, weighted, old_wt):
+    """
+    ``_ewm_mean`` continued from the (weighted, old_wt) state a previous
+    call ended in ((NaN, 1.0) starts fresh). Returns (out, weighted,
+    old_wt), so appended values extend the series exactly.
+    """
+    n = len(values)
+    out = np.empty(n)
+    old_wt_factor = 1.0 - alpha
+    for i in range(n):
+        cur = values[i]
+        is_obs = cur == cur
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted
+    return out, weighted, old_wt
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _rolling_sum(values, length):
+    """``rolling(length).sum()``: NaN until ``length`` non-NaN values are in the window."""
+    n = len(values)
+    out = np.empty(n)
+    total = 0.0
+    comp = 0.0
+    count = 0
+    for i in range(n):
+        v = values[i]
+        if v == v:
+            # Kahan-compensated add
+            y = v - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+            count += 1
+        if i >= length:
+            old = values[i - length]
+            if old == old:
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+                count -= 1
+        out[i] = total if count >= length else np.nan
+        if count == 0:
+            total = 0.0
+            comp = 0.0
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _rolling_extreme(values, length, is_max):
+    """``rolling(length).max()/min()`` with a monotonic deque of indices."""
+    n = len(values)
+    out = np.empty(n)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    count = 0
+    for i in range(n):
+        v = values[i]
+        if v == v:
+            count += 1
+            if is_max:
+                while tail > head and values[dq[tail - 1]] <= v:
+                    tail -= 1
+            else:
+                while tail > head and values[dq[tail - 1]] >= v:
+                    tail -= 1
+            dq[tail] = i
+            tail += 1
+        if i >= length:
+            old = values[i - length]
+            if old == old:
+                count -= 1
+        while tail > head and dq[head] <= i - length:
+            head += 1
+        out[i] = values[dq[head]] if count >= length and tail > head else np.nan
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _rolling_std(values, length):
+    """Population (ddof=0) rolling standard deviation, two-pass per window."""
+    n = len(values)
+    out = np.full(n, np.nan)
+    for i in range(length - 1, n):
+        total = 0.0
+        valid = True
+        for j in range(i - length + 1, i + 1):
+            v = values[j]
+            if v != v:
+                valid = False
+                break
+            total += v
+        if not valid:
+            continue
+        mean = total / length
+        ssq = 0.0
+        for j in range(i - length + 1, i + 1):
+            d = values[j] - mean
+            ssq += d * d
+        out[i] = np.sqrt(ssq / length)
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _true_range(high, low, close):
+    """max(h-l, |h-pc|, |l-pc|), skipping NaN terms like ``concat().max(axis=1)``."""
+    return _true_range_from(high, low, close, np.nan)
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _true_range_from(high, low, close, prev_close):
+    """``_true_range`` of bars following one that closed at ``prev_close`` (NaN: none)."""
+    n = len(high)
+    out = np.empty(n)
+    for i in range(n):
+        best = high[i] - low[i]
+        pc = close[i - 1] if i > 0 else prev_close
+        if pc == pc:
+            a = abs(high[i] - pc)
+            b = abs(low[i] - pc)
+            if best != best or a > best:
+                best = a
+            if best != best or b > best:
+                best = b
+        out[i] = best
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _rsi(close, length):
+    n = len(close)
+    gain = np.empty(n)
+    loss = np.empty(n)
+    if n > 0:
+        gain[0] = np.nan
+        loss[0] = np.nan
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta != delta:
+            gain[i] = np.nan
+            loss[i] = np.nan
+        elif delta > 0:
+            gain[i] = delta
+            loss[i] = 0.0
+        else:
+            gain[i] = 0.0
+            loss[i] = -delta
+    alpha = 1.0 / length
+    avg_gain = _ewm_mean(gain, alpha)
+    avg_loss = _ewm_mean(loss, alpha)
+    out = np.empty(n)
+    for i in range(n):
+        rs = avg_gain[i] / avg_loss[i]
+        out[i] = 100 - (100 / (1 + rs))
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _adx(high, low, close, length):
+    n = len(high)
+    pos_dm = np.zeros(n)
+    neg_dm = np.zeros(n)
+    for i in range(1, n):
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        if up > down and up > 0:
+            pos_dm[i] = up
+        if down > up and down > 0:
+            neg_dm[i] = down
+    alpha = 1.0 / length
+    atr_val = _ewm_mean(_true_range(high, low, close), alpha)
+    pos_dm_s = _ewm_mean(pos_dm, alpha)
+    neg_dm_s = _ewm_mean(neg_dm, alpha)
+    dx = np.empty(n)
+    for i in range(n):
+        pos_di = 100 * (pos_dm_s[i] / atr_val[i])
+        neg_di = 100 * (neg_dm_s[i] / atr_val[i])
+        dx[i] = 100 * (abs(pos_di - neg_di) / (pos_di + neg_di))
+    return _ewm_mean(dx, alpha)
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _chop_index(high, low, close, length):
+    n = len(high)
+    sum_tr = _rolling_sum(_true_range(high, low, close), length)
+    max_hi = _rolling_extreme(high, length, True)
+    min_lo = _rolling_extreme(low, length, False)
+    log_len = np.log10(length)
+    out = np.empty(n)
+    for i in range(n):
+        range_hl = max_hi[i] - min_lo[i]
+        if range_hl == 0:
+            out[i] = np.nan
+        else:
+            out[i] = 100 * np.log10(sum_tr[i] / range_hl) / log_len
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _efficiency_ratio(close, length):
+    n = len(close)
+    abs_diff = np.empty(n)
+    if n > 0:
+        abs_diff[0] = np.nan
+    for i in range(1, n):
+        abs_diff[i] = abs(close[i] - close[i - 1])
+    volatility = _rolling_sum(abs_diff, length)
+    out = np.empty(n)
+    for i in range(n):
+        if i < length:
+            out[i] = np.nan
+        else:
+            out[i] = abs(close[i] - close[i - length]) / volatility[i]
+    return out
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _vwap(high, low, close, volume, day_ids):
+    n = len(close)
+    out = np.empty(n)
+    num = 0.0
+    den = 0.0
+    for i in range(n):
+        if i == 0 or day_ids[i] != day_ids[i - 1]:
+            num = 0.0
+            den = 0.0
+        typical = (high[i] + low[i] + close[i]) / 3.0
+        num += typical * volume[i]
+        den += volume[i]
+        out[i] = num / den if den > 0 else close[i]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Public API (mirrors ta.py)
+# ---------------------------------------------------------------------------
+
+def sma(series, length: int) -> np.ndarray:
+    """Simple Moving Average"""
+    return _rolling_sum(_as_float(series), length) / length
+
+
+def ema(series, length: int) -> np.ndarray:
+    """Exponential Moving Average"""
+    return _ewm_mean(_as_float(series), 2.0 / (length + 1.0))
+
+
+def rma(series, length: int) -> np.ndarray:
+    """Running Moving Average (Wilder's Smoothing)"""
+    return _ewm_mean(_as_float(series), 1.0 / length)
+
+
+def tr(high, low, close) -> np.ndarray:
+    """True Range"""
+    return _true_range(_as_float(high), _as_float(low), _as_float(close))
+
+
+def atr(high, low, close, length: int = 14) -> np.ndarray:
+    """Average True Range (RMA smoothing)"""
+    return _ewm_mean(_as_float(tr(high, low, close)), 1.0 / length)
+
+
+def ema_resume(series, length: int, state=(np.nan, 1.0)):
+    """
+    ``ema`` of values appended to a series whose previous ``ema_resume``
+    call returned ``state`` (the default starts fresh): (ema, state).
+    """
+    out, weighted, old_wt = _ewm_resume(_as_float(series), 2.0 / (length + 1.0), *state)
+    return out, (weighted, old_wt)
+
+
+def atr_resume(high, low, close, length: int = 14, state=(np.nan, 1.0, np.nan)):
+    """``atr`` continued like ``ema_resume``; the state also holds the last close."""
+    weighted, old_wt, prev_close = state
+    close = _as_float(close)
+    true_range = _true_range_from(_as_float(high), _as_float(low), close, prev_close)
+    out, weighted, old_wt = _ewm_resume(true_range, 1.0 / length, weighted, old_wt)
+    return out, (weighted, old_wt, close[-1] if len(close) else prev_close)
+
+
+def rsi(close, length: int = 14) -> np.ndarray:
+    """Relative Strength Index (RMA smoothing)"""
+    return _rsi(_as_float(close), length)
+
+
+def adx(high, low, close, length: int = 14) -> np.ndarray:
+    """Average Directional Index (RMA smoothing)"""
+    return _adx(_as_float(high), _as_float(low), _as_float(close), length)
+
+
+def chop_index(high, low, close, length: int = 14) -> np.ndarray:
+    """Choppiness Index (0-100)"""
+    return _chop_index(_as_float(high), _as_float(low), _as_float(close), length)
+
+
+def rolling_max(series, length: int) -> np.ndarray:
+    return _rolling_extreme(_as_float(series), length, True)
+
+
+def rolling_min(series, length: int) -> np.ndarray:
+    return _rolling_extreme(_as_float(series), length, False)
+
+
+def bollinger(series, length: int = 20, mult: float = 2.0):
+    """Bollinger Bands (population stdev, as TradingView): (basis, upper, lower)."""
+    values = _as_float(series)
+    basis = _rolling_sum(values, length) / length
+    dev = mult * _rolling_std(values, length)
+    return basis, basis + dev, basis - dev
+
+
+def efficiency_ratio(close, length: int = 10) -> np.ndarray:
+    """Kaufman efficiency ratio |change(length)| / sum(|diff|, length)"""
+    return _efficiency_ratio(_as_float(close), length)
+
+
+def vwap(high, low, close, volume, day_ids) -> np.ndarray:
+    """Session VWAP of the typical price, reset when ``day_ids`` changes."""
+    return _vwap(_as_float(high), _as_float(low), _as_float(close),
+                 _as_float(volume), _as_float(day_ids, np.int64))
@@ -73,11 +73,33 @@ class PythonTradeExtractor:
     """
     Extract individual trades from VectorEngine signal array.
     Walks the signal array chronologically, identifies entry/exit transitions.
+    Prefer ``from_ledger`` when the run has a trade ledger: it knows SL
+    from TP exits.
     """
 
     def __init__(self, point_value=20.0):
         self.point_value = point_value
 
+    def from_ledger(self, df: pd.DataFrame, ledger: np.ndarray) -> List[Trade]:
+        """Trades from a ``vector_engine.TRADE_DTYPE`` ledger (``result['trades']``)."""
+        from backtesting.vector_engine import EXIT_REASONS
+
+        trades = []
+        for rec in ledger:
+            side = int(rec['side'])
+            pnl_points = side * (float(rec['exit_price']) - float(rec['entry_price']))
+            trades.append(Trade(
+                entry_time=df.index[rec['entry_bar']],
+                exit_time=df.index[rec['exit_bar']],
+                direction='LONG' if side == 1 else 'SHORT',
+                entry_price=float(rec['entry_price']),
+                exit_price=float(rec['exit_price']),
+                exit_reason=EXIT_REASONS[rec['exit_reason']],
+                pnl_points=pnl_points,
+                pnl_dollars=pnl_points * self.point_value,
+            ))
+        return trades
+
     def extract_trades(self, df: pd.DataFrame, signals: pd.Series) -> List[Trade]:
         """
         Walk the signal array, identify entries/exits, return trade list.
@@ -447,7 +469,8 @@ class SpotChecker:
             prev_sig = sig
 
         # Day summary
-        day_trades = PythonTradeExtractor().extract_trades(day_df, day_signals)
+        day_trades = [t for t in PythonTradeExtractor().from_ledger(df, result['trades'])
+                      if t.entry_time.date() == day_df.index[0].date()]
         print(f"\nTrades: {len(day_trades)}")
         for t in day_trades:
             print(f"  {t.direction} @ {t.entry_price:.2f} → {t.exit_price:.2f} ({t.exit_reason}) PnL={t.pnl_points:+.2f} pts")
@@ -488,9 +511,8 @@ def run_python_extract(data_path: str, output_path: str,
     engine = VectorEngine(strategy, initial_capital=100000, commission=2.06, slippage=5.0, point_value=20.0)
     result = engine.run(df)
 
-    signals = strategy.generate_signals(df)
     extractor = PythonTradeExtractor(point_value=20.0)
-    trades = extractor.extract_trades(df, signals)
+    trades = extractor.from_ledger(df, result['trades'])
 
     print(f"\nExtracted {len(trades)} trades")
     if trades:
@@ -1,15 +1,30 @@
+import os
+import threading
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import time
+from typing import Optional
 from .accelerate import get_dataframe_library, get_array_library
 from .monitor import PipelineMonitor
 from .type_utils import ensure_pandas_series, normalize_returns
+from .bar_frame import BarFrame, _read_only, as_bar_frame
+from .indicator_cache import cached_indicator
+from . import ta_numba as fast_ta
 
 monitor = PipelineMonitor()
 
 try:
-    from numba import jit
+    from numba import config as numba_config, jit, prange
+    # Numba's default threading layer prefers TBB, whose thread pool leaves
+    # the parent hung at exit once it has forked a process pool (grid
+    # search, GA, skeptic). The workqueue layer survives forks; it must not
+    # be entered from two threads at once, which _parallel_lock prevents.
+    # An explicit NUMBA_THREADING_LAYER is left alone.
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        numba_config.THREADING_LAYER = 'workqueue'
+    _parallel_threads = numba_config.NUMBA_NUM_THREADS
     monitor.log_gpu_status(True, "Numba JIT available. GPU/Fast CPU acceleration enabled.")
 except ImportError:
     monitor.log_gpu_status(False, "Numba not found. Vector Engine will run in strict CPU mode (Slow).")
@@ -17,31 +32,153 @@ except ImportError:
         def decorator(func):
             return func
         return decorator
+    prange = range
+    _parallel_threads = 1
+
+# Parameter sets per signal matrix in batched runs: bounds the
+# (rows x bars) int8 matrix to ~256MB on 15 years of 5m bars
+BATCH_ROWS = 256
+
+# Single ORB runs at least this long (~6 months of 24h 5m bars) split
+# their trading days across numba threads (see _numba_orb_trades_parallel)
+PARALLEL_MIN_BARS = 50_000
+
+# Pruned runs (VectorEngine.run(df, prune=...)) check their bounds after
+# each block of whole days of at least this many bars (~3 months of 24h
+# 5m bars, ~40 checks over 15 years)
+PRUNE_BLOCK_BARS = 25_000
+
+# Trade ledger: one record per round trip, written from the strategy
+# kernels' exit reasons (see trade_ledger). Bars are positional indices;
+# the entry fills at the entry bar's close, like VectorEngine's returns.
+EXIT_SIGNAL = 0     # position changed by the signal itself (no stop/target)
+EXIT_STOP = 1
+EXIT_TARGET = 2
+EXIT_TRAIL = 3
+EXIT_SESSION = 4    # session end / outside the trading window
+EXIT_DAY = 5        # calendar-day reset
+EXIT_DATA_END = 6   # still open on the last bar
+EXIT_TIME = 7       # held for the maximum number of bars (vector_genome.py)
+EXIT_REASONS = ('SIGNAL', 'SL', 'TP', 'TRAIL', 'EOD', 'DAY_RESET', 'DATA_END', 'TIME')
+
+# Which exit a bar that reaches both the stop and the target takes, named
+# after the SimulatedExecutionHandler modes they match (see _stop_first)
+TIE_PESSIMISTIC = 'PESSIMISTIC'                 # always the stop
+TIE_TV_BROKER_EMULATOR = 'TV_BROKER_EMULATOR'   # TradingView's intrabar path
+TIE_BREAKS = (TIE_PESSIMISTIC, TIE_TV_BROKER_EMULATOR)
+
+TRADE_DTYPE = np.dtype([
+    ('entry_bar', np.int64), ('exit_bar', np.int64), ('side', np.int8),
+    ('entry_price', np.float64), ('exit_price', np.float64), ('exit_reason', np.int8),
+    # Excursions in price points while held (both >= 0)
+    ('mae', np.float64), ('mfe', np.float64),
+    # Compounded net return of the trade, filled in by VectorEngine.run
+    ('net_return', np.float64),
+])
+
+
+@dataclass(frozen=True)
+class PruneBounds:
+    """
+    Gates a backtest can be known to fail before its last bar (see
+    ``VectorEngine.run``); None disables a bound.
+
+    ``max_drawdown`` (a fraction, 0.30 = 30%): the maximum drawdown only
+    deepens, so a run already deeper than this ends deeper. ``min_trades``:
+    out of reach once the trades so far plus the most the strategy can
+    still open (one per remaining bar, or ``MAX_TRADES_PER_DAY`` per
+    remaining day) fall short of it.
+    """
+    max_drawdown: Optional[float] = None
+    min_trades: Optional[int] = None
+
 
 class VectorStrategy(ABC):
     """
     Abstract Base Class for Vectorized Strategies.
-    Generates signals for an entire DataFrame at once.
+    Generates signals for an entire dataset at once.
+
+    ``VectorEngine`` passes a read-only ``BarFrame`` (see bar_frame.py);
+    strategies may also be called with a DataFrame and convert it with
+    ``as_bar_frame``. Either way they must not modify their input.
     """
+    # Most trades the strategy opens per calendar day (None = no limit),
+    # which bounds the trades a pruned run can still reach (PruneBounds)
+    MAX_TRADES_PER_DAY = None
+
     def __init__(self, **kwargs):
         self.params = kwargs
 
     @abstractmethod
     def generate_signals(self, df):
         """
-        Takes a DataFrame (cudf or pandas) and returns a Series of signals.
-        1 = LONG, -1 = SHORT, 0 = FLAT
+        Takes a BarFrame (or a cudf/pandas DataFrame) and returns a Series
+        of signals. 1 = LONG, -1 = SHORT, 0 = FLAT
         """
         raise NotImplementedError
 
+    @classmethod
+    def generate_signal_matrix(cls, df, param_sets):
+        """
+        Signals for many parameter sets at once: an int8 array of shape
+        (len(param_sets), len(df)) whose row k equals
+        ``cls(**param_sets[k]).generate_signals(df)``.
+
+        This default runs the strategies one by one; strategies with a
+        compiled kernel override it to share indicators and run the whole
+        matrix in one call.
+        """
+        matrix = np.zeros((len(param_sets), len(df)), dtype=np.int8)
+        for k, params in enumerate(param_sets):
+            signals = ensure_pandas_series(cls(**params).generate_signals(df))
+            matrix[k] = signals.fillna(0).to_numpy(dtype=np.int8)
+        return matrix
+
+    @classmethod
+    def generate_signal_matrix_and_fills(cls, df, param_sets):
+        """
+        (matrix, (fill_ptr, fill_bars, fill_prices)): the signal matrix
+        plus each row's intrabar exit fills, row k's at
+        ``fill_ptr[k]:fill_ptr[k + 1]`` (bar index, price). Strategies
+        whose positions only change on bar closes have none.
+        """
+        return cls.generate_signal_matrix(df, param_sets), _no_fills(len(param_sets))
+
+    def generate_signals_and_trades(self, df):
+        """
+        (signals, ledger): the signals plus their ``TRADE_DTYPE`` trade
+        ledger. This default derives the ledger from signal changes
+        (every exit is ``EXIT_SIGNAL`` at the close); strategies with a
+        compiled kernel override it to record why each position was closed
+        and at which price (e.g. intrabar at the stop).
+        """
+        signals = self.generate_signals(df)
+        return signals, trade_ledger(df, signals)
+
 class VectorEngine:
     """
     High-Performance Backtest Engine using Vectorized Operations.
     Ideal for GPU acceleration.
     Includes cost modeling (Slippage + Commissions).
+
+    Positions earn close-to-close returns, except that the bar a kernel
+    closes a position intrabar (stop, target) is booked at the ledger's
+    exit price, as the event engine's resting orders would fill.
+    ``intrabar_fills=False`` books every exit at the close, as before.
+
+    ``dtype=np.float32`` runs ``run``/``run_batch`` on float32 bars and
+    indicators (see ``BarFrame.astype``) for memory-bound sweeps; equity
+    still compounds in float64. Results can differ slightly from float64
+    where a level sits within float32 rounding of a price, so sweeps
+    re-verify their best candidates in float64 (``optimizer.verify_top_results``).
     """
-    def __init__(self, strategy: VectorStrategy, initial_capital=100000.0, commission=1.0, slippage=1.0, volatility_factor=0.01, point_value=20.0):
+    def __init__(self, strategy: VectorStrategy, initial_capital=100000.0, commission=1.0, slippage=1.0, volatility_factor=0.01, point_value=20.0,
+                 intrabar_fills=True, dtype=np.float64):
         self.strategy = strategy
+        self.intrabar_fills = bool(intrabar_fills)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float64, np.float32):
+            raise ValueError(f"dtype must be float64 or float32, got {self.dtype}")
         self.initial_capital = initial_capital
         self.commission_per_unit = commission
         self.slippage_per_unit = slippage
@@ -50,14 +187,248 @@ class VectorEngine:
         self.pd = get_dataframe_library()
         self.np = get_array_library()
 
-    def run(self, df):
+    def run(self, df, prune=None):
+        """
+        Runs the vectorized backtest on the provided BarFrame or DataFrame.
+
+        A DataFrame is wrapped in a ``BarFrame`` (no copy for float64
+        columns) and never modified; callers that run many backtests on one
+        dataset should build the ``BarFrame`` once and pass that.
+
+        Returns, costs, turnover and equity come from one compiled pass
+        (``_numba_fused_run``) over the price and signal arrays;
+        ``run_reference`` is the equivalent pandas implementation.
+        ``result['trades']`` is the strategy's ``TRADE_DTYPE`` ledger with
+        each trade's net return.
+
+        ``prune`` (``PruneBounds``) stops a run that has already failed a
+        bound, see ``_run_pruned``; the result then has a ``'pruned'`` key.
+        """
+        if not isinstance(df, (pd.DataFrame, BarFrame)):
+            # cuDF frames keep the dataframe-library path
+            return self._run_frame(df, self.strategy.generate_signals(df))
+        bars = as_bar_frame(df).astype(self.dtype)
+        if prune is not None:
+            return self._run_pruned(bars, prune)
+
+        # 1. Generate Signals (and their trade ledger)
+        signals, trades = self._signals_and_trades(bars)
+
+        # 2. Returns, costs and compounding in a single sweep
+        closes, highs, lows = bars.close, bars.high, bars.low
+        positions = ensure_pandas_series(signals).to_numpy(dtype=np.float64, na_value=np.nan)
+        net_returns, turnover, equity_curve = _numba_fused_run(
+            closes, highs, lows, positions, self._fill_prices(trades, len(bars)),
+            float(self.commission_per_unit + self.slippage_per_unit),
+            float(self.volatility_factor), float(self.point_value), float(self.initial_capital)
+        )
+
+        trades['net_return'] = _trade_returns(trades, positions, equity_curve)
+
+        result = {
+            'equity_curve': equity_curve,
+            'signals': signals,
+            'returns': net_returns,
+            'turnover': turnover
+        }
+        result = normalize_returns(result, index=bars.index)
+        # Structured array, kept as is (see TRADE_DTYPE)
+        result['trades'] = trades
+        return result
+
+    def _run_pruned(self, bars, prune):
+        """
+        ``run`` in blocks of whole days (``PRUNE_BLOCK_BARS``), stopping
+        after the first block at whose end a ``prune`` bound has failed.
+
+        Strategies with a ``_run_days`` kernel (ORB) generate each block's
+        signals as they go, so a pruned run also skips the rest of the
+        strategy kernel; the others generate all signals first and only
+        the equity pass and the ledger stop early. Drawdowns and trade
+        counts are computed as ``compute_metrics`` and the ledger do, so a
+        run is only pruned if the full run fails the same bound.
+
+        The result covers the bars run (an open trade ends there with
+        ``EXIT_DATA_END``) and ``result['pruned']`` names the failed bound
+        ('max_drawdown' or 'min_trades'), or is None when every bar ran;
+        the run then equals ``run`` without bounds.
+        """
+        strategy = self.strategy
+        n = len(bars)
+        run_days = getattr(strategy, '_run_days', None)
+        if run_days is not None:
+            inputs = strategy._kernel_inputs(bars)
+            kernel_signals = np.zeros(n, dtype=np.int32)
+            exits = np.zeros(n, dtype=np.int8)
+            fills = np.full(n, np.nan)
+            positions = np.zeros(n)
+        else:
+            signals, trades = self._signals_and_trades(bars)
+            positions = ensure_pandas_series(signals).to_numpy(dtype=np.float64, na_value=np.nan)
+            exits, fills = _ledger_exits(trades, n)
+        equity_fills = fills if self.intrabar_fills else np.full(n, np.nan)
+
+        if isinstance(bars.index, pd.DatetimeIndex):
+            day_starts = bars.sessions.day_starts
+            per_day = getattr(strategy, 'MAX_TRADES_PER_DAY', None)
+        else:
+            day_starts, per_day = np.arange(n + 1), None
+        ends = day_starts[np.searchsorted(day_starts, np.arange(PRUNE_BLOCK_BARS, n, PRUNE_BLOCK_BARS))]
+        ends = np.unique(np.r_[ends, n])
+
+        closes, highs, lows = bars.close, bars.high, bars.low
+        fixed_cost = float(self.commission_per_unit + self.slippage_per_unit)
+        net, turnover, equity = np.empty(n), np.empty(n), np.empty(n)
+        state = _fused_state()
+        bounds = _prune_state()
+        pruned = None
+        lo = 0
+        for hi in ends:
+            if run_days is not None:
+                run_days(kernel_signals, exits, fills, lo, hi, inputs)
+                positions[lo:hi] = kernel_signals[lo:hi]
+            _fused_fill(
+                net[:hi], turnover[:hi], equity[:hi], closes[:hi], highs[:hi], lows[:hi],
+                positions[:hi], equity_fills[:hi], lo, state, fixed_cost,
+                float(self.volatility_factor), float(self.point_value), float(self.initial_capital))
+            _prune_fill(equity, positions, lo, hi, bounds)
+            lo = hi
+            if hi == n:
+                break
+            if prune.max_drawdown is not None and -bounds[1] > prune.max_drawdown:
+                pruned = 'max_drawdown'
+            elif prune.min_trades is not None:
+                if per_day is None:
+                    capacity = n - hi
+                else:
+                    capacity = per_day * (len(day_starts) - 1 - np.searchsorted(day_starts, hi))
+                if bounds[2] + capacity < prune.min_trades:
+                    pruned = 'min_trades'
+            if pruned is not None:
+                break
+
+        stop = lo
+        if run_days is not None:
+            signals = pd.Series(kernel_signals, index=bars.index)
+        if run_days is not None or stop < n:
+            trades = _ledger_records(_numba_trade_ledger(
+                positions[:stop], exits[:stop], fills[:stop], closes[:stop], highs[:stop], lows[:stop]))
+        trades['net_return'] = _trade_returns(trades, positions[:stop], equity[:stop])
+
+        result = {
+            'equity_curve': equity[:stop],
+            'signals': ensure_pandas_series(signals).iloc[:stop],
+            'returns': net[:stop],
+            'turnover': turnover[:stop],
+        }
+        result = normalize_returns(result, index=bars.index[:stop])
+        result['trades'] = trades
+        result['pruned'] = pruned
+        return result
+
+    def _signals_and_trades(self, bars):
+        """The strategy's signals and ``TRADE_DTYPE`` ledger."""
+        if hasattr(self.strategy, 'generate_signals_and_trades'):
+            return self.strategy.generate_signals_and_trades(bars)
+        signals = self.strategy.generate_signals(bars)
+        return signals, trade_ledger(bars, signals)
+
+    def run_reference(self, df):
+        """
+        Pandas implementation of ``run`` (one full-length Series per step),
+        kept as the reference for parity tests.
+        """
+        bars = as_bar_frame(df)
+        if hasattr(self.strategy, 'generate_signals_and_trades'):
+            signals, trades = self.strategy.generate_signals_and_trades(bars)
+        else:
+            signals = self.strategy.generate_signals(bars)
+            trades = trade_ledger(bars, signals)
+        fills = pd.Series(self._fill_prices(trades, len(bars)), index=bars.index)
+        return self._run_frame(bars, signals, fills)
+
+    def _fill_prices(self, ledger, n):
+        """Per-bar exit prices of a ledger (NaN = close), all NaN without intrabar fills."""
+        fills = np.full(n, np.nan)
+        if self.intrabar_fills:
+            fills[ledger['exit_bar']] = ledger['exit_price']
+        return fills
+
+    def _run_frame(self, df, signals, fills=None):
+        # Calculate Returns and per-trade costs
+        df, returns, cost_pct = self._returns_and_costs(df)
+
+        if fills is not None:
+            # Exit bars realize the position at their fill price
+            exit_returns = (fills / df['Close'].shift(1) - 1).fillna(0)
+            returns = returns.where(fills.isna(), exit_returns)
+
+        # Position is held for the bar AFTER the signal
+        pos = signals.shift(1).fillna(0)
+
+        # Turnover (position changes)
+        turnover = pos.diff().abs().fillna(0)
+
+        # Transaction Costs
+        transaction_costs = turnover * cost_pct
+
+        # Strategy Returns (Gross)
+        strat_returns = pos * returns
+
+        # Net Returns
+        net_returns = strat_returns - transaction_costs
+
+        # cumulative equity
+        equity_curve = self.initial_capital * (1 + net_returns).cumprod()
+
+        # Normalize all return values to pandas Series to ensure consistent types
+        # This handles mixed pandas/cuDF/numpy environments
+        result = {
+            'equity_curve': equity_curve,
+            'signals': signals,
+            'returns': net_returns,
+            'turnover': turnover
+        }
+        return normalize_returns(result, index=df.index)
+
+    def run_batch(self, df, param_sets, batch_rows=BATCH_ROWS, bars_per_year=252):
         """
-        Runs the vectorized backtest on the provided DataFrame.
+        Backtests many parameter sets of the engine's strategy class at once.
+
+        Signals come from ``generate_signal_matrix`` (one compiled kernel
+        call per indicator group and ``batch_rows`` parameter sets), then one
+        batched pass applies returns, costs and compounding to every row.
+        Final equities, Sharpe ratios (annualized with ``bars_per_year``)
+        and maximum drawdowns match ``run()`` + ``compute_metrics`` for
+        each parameter set, intrabar exit fills included.
+
+        Returns {'final_equity', 'total_return', 'sharpe_ratio',
+        'max_drawdown'} ndarrays aligned with ``param_sets``.
         """
-        # 1. Generate Signals
-        signals = self.strategy.generate_signals(df)
+        strategy_cls = type(self.strategy)
+        bars = as_bar_frame(df).astype(self.dtype)
+        stats = np.empty((len(param_sets), 4), dtype=np.float64)
+        _, returns, cost_pct = self._returns_and_costs(bars)
+        returns = returns.to_numpy(dtype=self.dtype)
+        cost_pct = cost_pct.to_numpy(dtype=self.dtype)
+        for lo in range(0, len(param_sets), batch_rows):
+            chunk = param_sets[lo:lo + batch_rows]
+            signals, fills = strategy_cls.generate_signal_matrix_and_fills(bars, chunk)
+            if not self.intrabar_fills:
+                fills = _no_fills(len(chunk))
+            stats[lo:lo + len(chunk)] = _numba_batch_stats(signals, returns, cost_pct, bars.close, *fills)
+        final_equity = self.initial_capital * stats[:, 0]
+        mean, std = stats[:, 1], stats[:, 2]
+        safe_std = np.where(std > 0, std, 1.0)
+        return {
+            'final_equity': final_equity,
+            'total_return': final_equity / self.initial_capital - 1.0,
+            'sharpe_ratio': np.where(std > 0, np.sqrt(bars_per_year) * mean / safe_std, 0.0),
+            'max_drawdown': stats[:, 3],
+        }
 
-        # 2. Calculate Returns
+    def _returns_and_costs(self, df):
+        """Close-to-close returns and per-unit-turnover cost (% of notional)."""
         # We assume execution on NEXT OPEN (shift signals by 1)
         # Normalize column names to capitalized form
         col_map = {}
@@ -75,9 +446,6 @@ class VectorEngine:
         # Standard: Close to Close returns applied to position held at shift(1)
         returns = df['Close'].pct_change().fillna(0)
 
-        # Position is held for the bar AFTER the signal
-        pos = signals.shift(1).fillna(0)
-
         # --- COST MODELING (Futures-Aware) ---
         # For futures: costs are per-contract, not per-share.
         # Convert to % of notional: notional = price * point_value
@@ -98,31 +466,334 @@ class VectorEngine:
         safe_prices = prices.replace(0, np.nan).ffill().fillna(1.0)
         notional = safe_prices * self.point_value  # e.g. 20000 * 20 = $400K
         cost_pct = total_cost_dollars / notional
+        return df, returns, cost_pct
 
-        # Turnover (position changes)
-        turnover = pos.diff().abs().fillna(0)
 
-        # Transaction Costs
-        transaction_costs = turnover * cost_pct
+def _price_arrays(df):
+    """
+    Read-only float64 (close, high, low) arrays of a BarFrame or DataFrame;
+    high/low fall back to close like ``_returns_and_costs``.
+    """
+    bars = as_bar_frame(df)
+    return bars.close, bars.high, bars.low
 
-        # Strategy Returns (Gross)
-        strat_returns = pos * returns
 
-        # Net Returns
-        net_returns = strat_returns - transaction_costs
+@jit(nopython=True, cache=True, error_model='numpy')
+def _numba_fused_run(closes, highs, lows, signals, fills, fixed_cost, volatility_factor,
+                     point_value, initial_capital):
+    """
+    ``VectorEngine._run_frame`` in one pass: close-to-close returns (from
+    the previous close to ``fills[i]`` where that is not NaN), the
+    previous bar's signal as position (NaN -> flat), turnover, cost per
+    unit of turnover ((fixed + range * volatility_factor) / notional, with
+    zero/NaN prices forward-filled) and compounded equity (NaN net returns
+    are skipped like pandas' ``cumprod``). Returns (net, turnover, equity).
+    """
+    n = len(closes)
+    net = np.empty(n)
+    turnover = np.empty(n)
+    equity = np.empty(n)
+    _fused_fill(net, turnover, equity, closes, highs, lows, signals, fills, 0, _fused_state(),
+                fixed_cost, volatility_factor, point_value, initial_capital)
+    return net, turnover, equity
 
-        # cumulative equity
-        equity_curve = self.initial_capital * (1 + net_returns).cumprod()
 
-        # Normalize all return values to pandas Series to ensure consistent types
-        # This handles mixed pandas/cuDF/numpy environments
-        result = {
-            'equity_curve': equity_curve,
-            'signals': signals,
-            'returns': net_returns,
-            'turnover': turnover
-        }
-        return normalize_returns(result, index=df.index)
+@jit(nopython=True, cache=True)
+def _fused_state():
+    """Initial (growth, previous position, last safe price) of ``_fused_fill``."""
+    return np.array([1.0, 0.0, 1.0])
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _fused_fill(net, turnover, equity, closes, highs, lows, signals, fills, start, state,
+                fixed_cost, volatility_factor, point_value, initial_capital):
+    """
+    The ``_numba_fused_run`` pass over bars ``start:``, writing into the
+    output arrays and continuing from (and updating) ``state`` (see
+    ``_fused_state``), so a run extended with new bars (streaming.py)
+    matches one pass over all of them.
+    """
+    n = len(closes)
+    growth = state[0]
+    prev_pos = state[1]
+    safe_price = state[2]
+    for i in range(start, n):
+        price = closes[i]
+        if price == price and price != 0:
+            safe_price = price
+        if i == 0:
+            ret = 0.0
+            pos = 0.0
+        else:
+            exit_price = fills[i]
+            ret = (exit_price if exit_price == exit_price else price) / closes[i - 1] - 1
+            if ret != ret:
+                ret = 0.0
+            pos = signals[i - 1]
+            if pos != pos:
+                pos = 0.0
+        turn = abs(pos - prev_pos)
+        cost_pct = (fixed_cost + abs(highs[i] - lows[i]) * volatility_factor) / (safe_price * point_value)
+        r = pos * ret - turn * cost_pct
+        net[i] = r
+        turnover[i] = turn
+        if r == r:
+            growth *= 1 + r
+            equity[i] = initial_capital * growth
+        else:
+            equity[i] = np.nan
+        prev_pos = pos
+    state[0] = growth
+    state[1] = prev_pos
+    state[2] = safe_price
+
+
+@jit(nopython=True, cache=True)
+def _prune_state():
+    """Initial (peak equity, max drawdown, trades) of ``_prune_fill``."""
+    return np.array([np.nan, 0.0, 0.0])
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _prune_fill(equity, positions, lo, hi, state):
+    """
+    Continues ``state`` (see ``_prune_state``) over bars ``lo:hi``: the
+    running peak and maximum drawdown as ``metrics_numba`` computes them
+    (NaN equity skipped, 0 where the peak is 0) and the trades opened, as
+    the ledger counts them (non-zero signal changes, NaN -> flat).
+    """
+    peak = state[0]
+    max_dd = state[1]
+    trades = state[2]
+    prev = positions[lo - 1] if lo > 0 else 0.0
+    if prev != prev:
+        prev = 0.0
+    for i in range(lo, hi):
+        e = equity[i]
+        if e == e:
+            if not peak >= e:
+                peak = e
+            if peak != 0:
+                dd = (e - peak) / peak
+                if dd < max_dd:
+                    max_dd = dd
+        s = positions[i]
+        if s != s:
+            s = 0.0
+        if s != prev and s != 0:
+            trades += 1
+        prev = s
+    state[0] = peak
+    state[1] = max_dd
+    state[2] = trades
+
+
+def trade_ledger(df, signals, exits=None, fills=None):
+    """
+    ``TRADE_DTYPE`` ledger of a signal series: a trade opens on the bar
+    whose signal becomes non-zero and closes on the bar it changes again.
+    ``exits`` (int8 per bar) gives the ``EXIT_*`` reason at closing bars;
+    without it every exit is ``EXIT_SIGNAL``. ``fills`` (float per bar,
+    NaN = close) gives the exit prices.
+    """
+    closes, highs, lows = _price_arrays(df)
+    positions = ensure_pandas_series(signals).to_numpy(dtype=np.float64, na_value=np.nan)
+    if exits is None:
+        exits = np.zeros(len(positions), dtype=np.int8)
+    if fills is None:
+        fills = np.full(len(positions), np.nan)
+    return _ledger_records(_numba_trade_ledger(positions, exits, fills, closes, highs, lows))
+
+
+def _ledger_exits(ledger, n):
+    """Per-bar (exits, fills) arrays of a ledger's closed trades, as the strategy kernels write them."""
+    exits = np.zeros(n, dtype=np.int8)
+    fills = np.full(n, np.nan)
+    closed = ledger[ledger['exit_reason'] != EXIT_DATA_END]
+    exits[closed['exit_bar']] = closed['exit_reason']
+    fills[closed['exit_bar']] = closed['exit_price']
+    return exits, fills
+
+
+def _ledger_records(rows):
+    """Structured ``TRADE_DTYPE`` array from the ledger kernel's float rows."""
+    ledger = np.zeros(len(rows), dtype=TRADE_DTYPE)
+    for j, name in enumerate(('entry_bar', 'exit_bar', 'side', 'entry_price',
+                              'exit_price', 'exit_reason', 'mae', 'mfe')):
+        ledger[name] = rows[:, j]
+    ledger['net_return'] = np.nan
+    return ledger
+
+
+def _trade_returns(ledger, signals, equity):
+    """
+    Compounded net return of each trade from the equity curve: from the
+    entry bar through the bar after the exit, which carries the exit cost.
+    When another trade starts on the exit bar (a reversal) that bar's cost
+    is shared, so the trade ends at its exit bar instead.
+    """
+    if len(ledger) == 0:
+        return np.empty(0)
+    last = len(equity) - 1
+    end = np.minimum(ledger['exit_bar'] + 1, last)
+    reversal = np.nan_to_num(signals[ledger['exit_bar']]) != 0
+    end = np.where(reversal, ledger['exit_bar'], end)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return equity[end] / equity[ledger['entry_bar']] - 1.0
+
+
+@jit(nopython=True, cache=True)
+def _numba_trade_ledger(signals, exits, fills, closes, highs, lows):
+    """
+    One row per trade: (entry_bar, exit_bar, side, entry_price, exit_price,
+    exit_reason, mae, mfe). Entries fill at the entry bar's close, exits at
+    the exit bar's ``fills`` price or, where that is NaN, its close (where
+    VectorEngine realizes them); excursions use the highs/lows of the bars
+    the position is held, i.e. after entry up to and including the exit
+    bar.
+    """
+    n = len(signals)
+    count = 0
+    prev = 0.0
+    for i in range(n):
+        s = signals[i]
+        if s != s:
+            s = 0.0
+        if s != prev and s != 0:
+            count += 1
+        prev = s
+
+    rows = np.zeros((count, 8))
+    k = -1
+    prev = 0.0
+    for i in range(n):
+        s = signals[i]
+        if s != s:
+            s = 0.0
+        if prev != 0:
+            # Bar i is held by the open trade
+            entry = rows[k, 3]
+            if prev > 0:
+                adverse = entry - lows[i]
+                favorable = highs[i] - entry
+            else:
+                adverse = highs[i] - entry
+                favorable = entry - lows[i]
+            if adverse > rows[k, 6]:
+                rows[k, 6] = adverse
+            if favorable > rows[k, 7]:
+                rows[k, 7] = favorable
+        if s != prev:
+            if prev != 0:
+                rows[k, 1] = i
+                rows[k, 4] = fills[i] if fills[i] == fills[i] else closes[i]
+                rows[k, 5] = exits[i]
+            if s != 0:
+                k += 1
+                rows[k, 0] = i
+                rows[k, 2] = 1.0 if s > 0 else -1.0
+                rows[k, 3] = closes[i]
+        prev = s
+    if prev != 0:
+        rows[k, 1] = n - 1
+        rows[k, 4] = closes[n - 1]
+        rows[k, 5] = EXIT_DATA_END
+    return rows
+
+
+@jit(nopython=True, cache=True)
+def _numba_batch_stats(signals, returns, cost_pct, closes, fill_ptr, fill_bars, fill_prices):
+    """
+    Per signal row, in the same pass: the compounded growth factor (the
+    last value of ``(1 + net_returns).cumprod()`` in ``VectorEngine.run``),
+    the mean and sample std of the non-NaN net returns and the maximum
+    drawdown, i.e. what ``metrics_numba.compute_metrics`` reports for
+    ``run()``. Position is the previous bar's signal, turnover costs
+    ``cost_pct`` per unit, NaN net returns are skipped like pandas'
+    ``cumprod``, and row k's exit bars ``fill_bars[fill_ptr[k]:fill_ptr[k + 1]]``
+    return up to their ``fill_prices`` instead of the close. Returns an
+    (n_rows, 4) array of those columns.
+    """
+    n_rows, n = signals.shape
+    stats = np.zeros((n_rows, 4), dtype=np.float64)
+    for k in range(n_rows):
+        g = 1.0
+        peak = 1.0
+        max_dd = 0.0
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        prev = 0.0
+        j = fill_ptr[k]
+        for i in range(n):
+            pos = float(signals[k, i - 1]) if i > 0 else 0.0
+            ret = returns[i]
+            if j < fill_ptr[k + 1] and fill_bars[j] == i:
+                ret = fill_prices[j] / closes[i - 1] - 1.0
+                if ret != ret:
+                    ret = 0.0
+                j += 1
+            net = pos * ret - abs(pos - prev) * cost_pct[i]
+            if net == net:
+                g *= 1.0 + net
+                if g > peak:
+                    peak = g
+                elif peak != 0 and (g - peak) / peak < max_dd:
+                    max_dd = (g - peak) / peak
+                count += 1
+                delta = net - mean
+                mean += delta / count
+                m2 += delta * (net - mean)
+            prev = pos
+        stats[k, 0] = g
+        stats[k, 1] = mean
+        stats[k, 2] = np.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+        stats[k, 3] = max_dd
+    return stats
+
+
+def _no_fills(n_rows):
+    """Fill lists (see ``generate_signal_matrix_and_fills``) without any fills."""
+    return np.zeros(n_rows + 1, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+
+def _scatter_fills(fills, rows, fill_ptr, fill_bars, fill_prices):
+    """Stores a batch kernel's per-row (bars, prices) at ``fills[rows[j]]``."""
+    for j, k in enumerate(rows):
+        lo, hi = fill_ptr[j], fill_ptr[j + 1]
+        fills[k] = (fill_bars[lo:hi], fill_prices[lo:hi])
+
+
+def _join_fills(fills):
+    """(fill_ptr, fill_bars, fill_prices) of a list of per-row (bars, prices)."""
+    if not fills:
+        return _no_fills(0)
+    ptr = np.zeros(len(fills) + 1, dtype=np.int64)
+    ptr[1:] = np.cumsum([len(row_bars) for row_bars, _ in fills])
+    return (ptr,
+            np.concatenate([row_bars for row_bars, _ in fills]).astype(np.int64),
+            np.concatenate([prices for _, prices in fills]).astype(np.float64))
+
+
+def _check_tie_break(tie_break):
+    """Validated same-bar stop/target tie-break name."""
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"tie_break must be one of {TIE_BREAKS}, got {tie_break!r}")
+    return tie_break
+
+
+def _group_rows(strategies, kernel_params):
+    """
+    Row indices of ``strategies`` grouped by every attribute that is not a
+    kernel scalar, i.e. by the indicator arrays they need.
+    """
+    groups = {}
+    for k, strategy in enumerate(strategies):
+        key = tuple(sorted((name, value) for name, value in vars(strategy).items()
+                           if name != 'params' and name not in kernel_params))
+        groups.setdefault(key, []).append(k)
+    return groups
+
 
 class VectorizedMA(VectorStrategy):
     """
@@ -157,8 +828,9 @@ class VectorizedNQORB(VectorStrategy):
                  use_hurst=False, hurst_thresh=0.5,
                  use_adx=False, adx_thresh=20,
                  use_trailing_stop=False, ts_atr_mult=3.0,
+                 tie_break=TIE_PESSIMISTIC,
                  **kwargs):
-        super().__init__(orb_start=orb_start, orb_end=orb_end, ema_filter=ema_filter, atr_filter=atr_filter, sl_atr_mult=sl_atr_mult, tp_atr_mult=tp_atr_mult, atr_max_mult=atr_max_mult, **kwargs)
+        super().__init__(orb_start=orb_start, orb_end=orb_end, ema_filter=ema_filter, atr_filter=atr_filter, sl_atr_mult=sl_atr_mult, tp_atr_mult=tp_atr_mult, atr_max_mult=atr_max_mult, tie_break=tie_break, **kwargs)
         self.orb_start = orb_start
         self.orb_end = orb_end
         self.ema_filter = int(ema_filter)
@@ -168,62 +840,144 @@ class VectorizedNQORB(VectorStrategy):
         self.atr_max_mult = float(atr_max_mult)
 
         # Phase 2 Features
-        self.use_htf = use_htf
+        self.use_htf = bool(use_htf)
         self.htf_ma = int(htf_ma)
-        self.use_rvol = use_rvol
+        self.use_rvol = bool(use_rvol)
         self.rvol_thresh = float(rvol_thresh)
-        self.use_hurst = use_hurst
+        self.use_hurst = bool(use_hurst)
         self.hurst_thresh = float(hurst_thresh)
-        self.use_adx = use_adx
+        self.use_adx = bool(use_adx)
         self.adx_thresh = float(adx_thresh)
-        self.use_trailing_stop = use_trailing_stop
+        self.use_trailing_stop = bool(use_trailing_stop)
         self.ts_atr_mult = float(ts_atr_mult)
+        self.tie_break = _check_tie_break(tie_break)
+
+    # Parameters that only enter the kernel as scalars; the others shape
+    # the indicator arrays, which batched runs share across a group.
+    KERNEL_PARAMS = ('atr_max_mult', 'sl_atr_mult', 'tp_atr_mult', 'rvol_thresh',
+                     'hurst_thresh', 'adx_thresh', 'use_trailing_stop', 'ts_atr_mult')
+
+    # One entry per day (``traded_today``)
+    MAX_TRADES_PER_DAY = 1
 
     def generate_signals(self, df):
-        from . import ta
+        bars = as_bar_frame(df)
+        inputs = self._kernel_inputs(bars)
 
-        pd_lib = get_dataframe_library()
+        # Run Numba Core
+        signals = self._run_kernel(bars, inputs)[0]
 
-        # Prepare Data
-        # We need numpy arrays for Numba
-        # Ensure we have all necessary columns
-        if 'close' not in df.columns: df.rename(columns={'Close': 'close'}, inplace=True)
-        if 'high' not in df.columns: df.rename(columns={'High': 'high'}, inplace=True)
-        if 'low' not in df.columns: df.rename(columns={'Low': 'low'}, inplace=True)
+        return pd.Series(signals, index=bars.index)
+
+    def generate_signals_and_trades(self, df):
+        bars = as_bar_frame(df)
+        inputs = self._kernel_inputs(bars)
+        signals, exits, fills = self._run_kernel(bars, inputs)
+        return pd.Series(signals, index=bars.index), _ledger_records(
+            _numba_trade_ledger(signals, exits, fills, bars.close, bars.high, bars.low))
+
+    def _run_kernel(self, bars, inputs):
+        """(signals, exits, fills); long runs split their days across threads."""
+        if _use_parallel(bars):
+            return _run_parallel(bars, self._kernel_args(inputs))
+        return _numba_orb_trades(*self._kernel_args(inputs))
+
+    def _run_days(self, signals, exits, fills, lo, hi, inputs):
+        """
+        The kernel over bars ``lo:hi`` (whole days) of the output arrays,
+        for pruned runs; a position still open before ``lo`` closes there
+        (``EXIT_DAY``) as in ``_numba_orb_trades_parallel``.
+        """
+        _orb_fill(signals, exits, fills, lo, hi, *self._kernel_args(inputs))
+        if lo > 0 and signals[lo - 1] != 0:
+            exits[lo] = EXIT_DAY
+            fills[lo] = inputs['arrays'][2][lo]
+
+    def _kernel_args(self, inputs):
+        return (
+            *inputs['arrays'], *inputs['window'],
+            self.atr_max_mult, self.sl_atr_mult, self.tp_atr_mult,
+            self.use_htf, inputs['daily_ma'],
+            self.use_rvol, inputs['rvol'], self.rvol_thresh,
+            self.use_hurst, inputs['hurst'], self.hurst_thresh,
+            self.use_adx, inputs['adx'], self.adx_thresh,
+            self.use_trailing_stop, self.ts_atr_mult,
+            self.tie_break == TIE_TV_BROKER_EMULATOR
+        )
 
-        # Calculate Indicators (Pandas/TA-Lib is fast enough for vector calc)
-        if 'volume' not in df.columns and 'Volume' in df.columns: df.rename(columns={'Volume': 'volume'}, inplace=True)
-        if 'volume' not in df.columns: df['volume'] = 1.0 # fallback
+    @classmethod
+    def generate_signal_matrix(cls, df, param_sets):
+        return cls.generate_signal_matrix_and_fills(df, param_sets)[0]
+
+    @classmethod
+    def generate_signal_matrix_and_fills(cls, df, param_sets):
+        """
+        Batched ``generate_signals``: parameter sets that share indicator
+        settings (everything but ``KERNEL_PARAMS``) are computed once and
+        run through ``_numba_orb_batch`` together.
+        """
+        bars = as_bar_frame(df)
+        strategies = [cls(**params) for params in param_sets]
+        matrix = np.zeros((len(strategies), len(bars)), dtype=np.int8)
+        fills = [None] * len(strategies)
+        for rows in _group_rows(strategies, cls.KERNEL_PARAMS).values():
+            lead = strategies[rows[0]]
+            group = [strategies[k] for k in rows]
+            inputs = lead._kernel_inputs(bars)
+
+            def column(attr, dtype=np.float64):
+                return np.array([getattr(s, attr) for s in group], dtype=dtype)
+
+            signals, fill_ptr, fill_bars, fill_prices = _numba_orb_batch(
+                *inputs['arrays'], *inputs['window'],
+                column('atr_max_mult'), column('sl_atr_mult'), column('tp_atr_mult'),
+                lead.use_htf, inputs['daily_ma'],
+                lead.use_rvol, inputs['rvol'], column('rvol_thresh'),
+                lead.use_hurst, inputs['hurst'], column('hurst_thresh'),
+                lead.use_adx, inputs['adx'], column('adx_thresh'),
+                column('use_trailing_stop', np.bool_), column('ts_atr_mult'),
+                lead.tie_break == TIE_TV_BROKER_EMULATOR
+            )
+            matrix[rows] = signals
+            _scatter_fills(fills, rows, fill_ptr, fill_bars, fill_prices)
+        return matrix, _join_fills(fills)
+
+    def _kernel_inputs(self, bars):
+        """Indicator and session arrays fed to the ORB kernels (``bars`` is a BarFrame)."""
+        from . import ta
+
+        # Prepare Data
+        # The kernels read the BarFrame's read-only arrays; indicators
+        # take read-only Series views of them (missing volume is 1.0)
+        close, high, low, volume = bars['close'], bars['high'], bars['low'], bars['volume']
+        keys = _price_keys(bars)
 
         # Calculate Base Indicators
-        # Using custom ta which returns Series
-        ema = ta.ema(df['close'], length=self.ema_filter).fillna(0).values.astype(np.float64)
-        atr = ta.atr(df['high'], df['low'], df['close'], length=self.atr_filter).fillna(0).values.astype(np.float64)
+        # Compiled indicators (ta_numba, parity-tested against ta); every
+        # indicator is memoized per dataset (see indicator_cache.py), so
+        # sweeps compute each (indicator, length) once
+        ema = _indicator(bars, 'ema', (self.ema_filter,), keys[:1],
+                         lambda: _fillna(fast_ta.ema(close, self.ema_filter)))
+        atr = _indicator(bars, 'atr', (self.atr_filter,), keys,
+                         lambda: _fillna(fast_ta.atr(high, low, close, self.atr_filter)))
 
         # --- Phase 2: Advanced Indicators ---
         # 1. HTF Trend (Daily MA)
         # Resample to Daily -> Calc MA -> Reindex to Intraday
         if self.use_htf:
-            daily_close = df['close'].resample('D').last().dropna()
-            daily_ma = ta.sma(daily_close, length=self.htf_ma)
-
-            if daily_ma is None or daily_ma.empty:
-                # Not enough data for MA
-                daily_ma = pd.Series(0, index=daily_close.index)
-
-            # Reindex and ffill (careful: avoid lookahead bias, shift 1 day)
-            # Daily MA for today should be based on YESTERDAY's close
-            daily_ma = daily_ma.shift(1).reindex(df.index).ffill().fillna(0).values
+            daily_ma = _indicator(bars, 'htf_daily_ma', (self.htf_ma,), keys[:1],
+                                  lambda: _htf_daily_ma(close, self.htf_ma))
         else:
-            daily_ma = np.zeros(len(df))
+            daily_ma = _unused(bars)
 
         # 2. RVOL (Relative Volume)
         if self.use_rvol:
-            avg_vol = ta.sma(df['volume'], length=20).fillna(1.0) # Avoid div/0
-            rvol = df['volume'] / avg_vol
-            rvol = rvol.fillna(0).values
+            def compute_rvol():
+                avg_vol = ta.sma(volume, length=20).fillna(1.0) # Avoid div/0
+                return (volume / avg_vol).fillna(0).to_numpy(np.float64)
+            rvol = _indicator(bars, 'rvol', (20,), (bars.fingerprint('volume'),), compute_rvol)
         else:
-            rvol = np.zeros(len(df))
+            rvol = _unused(bars)
 
         # 3. Hurst Exponent (requires specialized calc, ta libs usually lack rolling hurst)
         # We will use a simplified Efficiency Ratio (ER) as a proxy if simple Hurst isn't avail.
@@ -234,39 +988,42 @@ class VectorizedNQORB(VectorStrategy):
         if self.use_hurst:
             # Using KAMA Efficiency Ratio as fast Trend Persistence proxy
             # ER = abs(Change) / Volatility-Sum
-            change = df['close'].diff(10).abs()
-            volatility = df['close'].diff().abs().rolling(10).sum()
-            er = change / volatility
-            hurst_proxy = er.fillna(0.5).values
             # Note: ER ranges 0-1. ER > 0.5 implies trendiness similar to Hurst > 0.5
+            hurst_proxy = _indicator(bars, 'efficiency_ratio', (10,), keys[:1],
+                                     lambda: _efficiency_ratio(close, 10))
         else:
-            hurst_proxy = np.zeros(len(df))
+            hurst_proxy = _unused(bars)
 
         # 4. ADX
         if self.use_adx:
-            # Custom ta.adx returns a Series of ADX values
-            adx_series = ta.adx(df['high'], df['low'], df['close'], length=14)
-            adx_val = adx_series.fillna(0).values
+            adx_val = _indicator(bars, 'adx', (14,), keys,
+                                 lambda: _fillna(fast_ta.adx(high, low, close, 14)))
         else:
-            adx_val = np.zeros(len(df))
+            adx_val = _unused(bars)
 
-        volume = df['volume'].values
+        return self._inputs(bars, bars.sessions, ema, atr,
+                            daily_ma=daily_ma, rvol=rvol, hurst=hurst_proxy, adx=adx_val)
 
+    def _inputs(self, bars, sessions, ema, atr, daily_ma=None, rvol=None, hurst=None, adx=None):
+        """Kernel inputs from computed indicators (a disabled filter's may be None)."""
         # Convert Time logic to integers for faster comparison
         # We'll use minute of day: 9:30 = 9*60 + 30 = 570
-        times = df.index.hour * 60 + df.index.minute
-
         # Create trading day IDs for proper session detection.
         # NQ trades nearly 24h, so times[i] < times[i-1] is unreliable.
-        # Instead, use calendar date to detect new trading sessions.
-        dates = df.index.date
-        # Convert dates to integer day IDs that Numba can compare
-        # Use ordinal day number (integer)
-        day_ids = np.array([d.toordinal() for d in dates], dtype=np.int64)
-
-        # For backward compat
-        timestamps = df.index.values.astype(np.int64)
+        # Instead, use calendar date (ordinal) to detect new trading sessions.
+        # Both come from the per-dataset session index (computed once).
+        return {
+            'arrays': (sessions.day_ids, sessions.minute_of_day,
+                       bars.close, bars.high, bars.low, bars.open, ema, atr),
+            'window': self._session_window(),
+            'daily_ma': _unused(bars) if daily_ma is None else daily_ma,
+            'rvol': _unused(bars) if rvol is None else rvol,
+            'hurst': _unused(bars) if hurst is None else hurst,
+            'adx': _unused(bars) if adx is None else adx,
+        }
 
+    def _session_window(self):
+        """(start_min, end_min, exit_min): the ORB window and the exit time as minutes of day."""
         # Parse Strategy Times
         t_start = pd.to_datetime(self.orb_start).time()
         start_min = t_start.hour * 60 + t_start.minute
@@ -276,27 +1033,117 @@ class VectorizedNQORB(VectorStrategy):
 
         # Exit time typically 15:45
         exit_min = 15 * 60 + 45
+        return start_min, end_min, exit_min
+
+    def _streamable(self):
+        """
+        Whether ``streaming.StreamingBacktest`` can extend this strategy's
+        kernel state: its EMA/ATR resume exactly, the optional filters
+        (pandas rolling means, daily resampling) do not.
+        """
+        return not (self.use_htf or self.use_rvol or self.use_hurst or self.use_adx)
 
-        # extract numpy arrays (enforce float64 for Numba JIT compatibility)
-        closes = df['close'].values.astype(np.float64)
-        highs = df['high'].values.astype(np.float64)
-        lows = df['low'].values.astype(np.float64)
+    def _state_resets(self, sessions):
+        """
+        Bars at which every kernel variable resets (the first bar of a
+        day): the kernel run from the bar before one, if flat there,
+        matches the full run from there on.
+        """
+        day_ids = sessions.day_ids
+        return np.r_[False, day_ids[1:] != day_ids[:-1]]
 
-        # Run Numba Core
-        signals = _numba_orb_logic(
-            day_ids, times.values, closes, highs, lows, ema, atr,
-            start_min, end_min, exit_min,
-            self.atr_max_mult, self.sl_atr_mult, self.tp_atr_mult,
-            self.use_htf, daily_ma,
-            self.use_rvol, rvol, self.rvol_thresh,
-            self.use_hurst, hurst_proxy, self.hurst_thresh,
-            self.use_adx, adx_val, self.adx_thresh,
-            self.use_trailing_stop, self.ts_atr_mult
-        )
+# Held while a parallel ORB kernel runs. Numba's workqueue threading
+# layer (selected at import) must not be entered from two threads at once, so a
+# concurrent backtest (e.g. one outliving its timeout thread) runs the
+# serial kernel instead; the signals are identical either way.
+_parallel_lock = threading.Lock()
+
+
+def parallel_threads():
+    """
+    Threads the parallel kernels may use: numba's configured count, or
+    what ``limit_parallel_threads`` set. Unlike numba's
+    ``get_num_threads`` this does not launch the thread pool.
+    """
+    return _parallel_threads
+
+
+def limit_parallel_threads(n):
+    """Caps ``parallel_threads`` (pool workers run single-threaded)."""
+    global _parallel_threads
+    _parallel_threads = max(1, min(int(n), _parallel_threads))
+
+
+def _use_parallel(bars):
+    """Whether a single ORB run on ``bars`` should split its days across threads."""
+    return len(bars) >= PARALLEL_MIN_BARS and parallel_threads() > 1
+
+
+def _run_parallel(bars, args):
+    """(signals, exits) from the per-day parallel kernel, serial if it is busy."""
+    if not _parallel_lock.acquire(blocking=False):
+        return _numba_orb_trades(*args)
+    try:
+        return _numba_orb_trades_parallel(bars.sessions.day_starts, *args)
+    finally:
+        _parallel_lock.release()
+
+
+def _unused(bars):
+    """
+    Placeholder for a disabled filter's array. Read-only and in the bars'
+    dtype like the cached indicators, so the kernels see one array type
+    and compile once.
+    """
+    arr = np.zeros(len(bars), dtype=bars.dtype)
+    arr.flags.writeable = False
+    return arr
 
-        return pd.Series(signals, index=df.index)
 
-@jit(nopython=True)
+def _indicator(bars, name, params, inputs, compute):
+    """
+    ``cached_indicator`` in the bars' dtype. Indicators are computed in
+    float64 either way; float32 bars cache a float32 copy (under their own
+    fingerprints), so reduced-precision sweeps cast each one once.
+    """
+    if bars.dtype == np.float64:
+        return cached_indicator(name, params, inputs, compute)
+    return cached_indicator(name, params, inputs,
+                            lambda: _read_only(compute(), bars.dtype))
+
+
+def _fillna(values, value=0.0):
+    """``Series.fillna`` for indicator arrays (infinities are kept)."""
+    return np.where(np.isnan(values), value, values)
+
+
+def _price_keys(bars):
+    """Indicator-cache fingerprints of (close, high, low), hashed once per BarFrame."""
+    return (bars.fingerprint('close'), bars.fingerprint('high'), bars.fingerprint('low'))
+
+
+def _htf_daily_ma(close, length):
+    """Daily close SMA, shifted one day (no lookahead) and ffilled intraday."""
+    from . import ta
+
+    daily_close = close.resample('D').last().dropna()
+    daily_ma = ta.sma(daily_close, length=length)
+
+    if daily_ma is None or daily_ma.empty:
+        # Not enough data for MA
+        daily_ma = pd.Series(0, index=daily_close.index)
+
+    # Reindex and ffill (careful: avoid lookahead bias, shift 1 day)
+    # Daily MA for today should be based on YESTERDAY's close
+    return daily_ma.shift(1).reindex(close.index).ffill().fillna(0).to_numpy(np.float64)
+
+
+def _efficiency_ratio(close, length):
+    """Kaufman efficiency ratio |change| / sum(|diff|), neutral 0.5 when undefined."""
+    return _fillna(fast_ta.efficiency_ratio(close, length), 0.5)
+
+
+@jit(nopython=True, cache=True)
 def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
                      start_min, end_min, exit_min,
                      atr_max_mult, sl_mult, tp_mult,
@@ -305,9 +1152,143 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
                      use_hurst, hurst, hurst_thresh,
                      use_adx, adx, adx_thresh,
                      use_ts, ts_mult):
-    n = len(closes)
-    signals = np.zeros(n, dtype=np.int32)
-
+    """
+    ORB signals with the default (stop-first) tie-break. Opens only move
+    fill prices, which this signals-only entry point does not return.
+    """
+    return _numba_orb_trades(day_ids, times, closes, highs, lows, closes, ema, atr,
+                             start_min, end_min, exit_min,
+                             atr_max_mult, sl_mult, tp_mult,
+                             use_htf, daily_ma,
+                             use_rvol, rvol, rvol_thresh,
+                             use_hurst, hurst, hurst_thresh,
+                             use_adx, adx, adx_thresh,
+                             use_ts, ts_mult, False)[0]
+
+
+@jit(nopython=True, cache=True)
+def _numba_orb_trades(day_ids, times, closes, highs, lows, opens, ema, atr,
+                      start_min, end_min, exit_min,
+                      atr_max_mult, sl_mult, tp_mult,
+                      use_htf, daily_ma,
+                      use_rvol, rvol, rvol_thresh,
+                      use_hurst, hurst, hurst_thresh,
+                      use_adx, adx, adx_thresh,
+                      use_ts, ts_mult, tv_ties):
+    """
+    The ORB kernel: (signals, exits, fills) with the per-bar exit reasons
+    and exit fill prices (see ``_orb_fill``).
+    """
+    signals = np.zeros(len(closes), dtype=np.int32)
+    exits = np.zeros(len(closes), dtype=np.int8)
+    fills = np.full(len(closes), np.nan)
+    _orb_fill(signals, exits, fills, 1, len(closes),
+              day_ids, times, closes, highs, lows, opens, ema, atr,
+              start_min, end_min, exit_min,
+              atr_max_mult, sl_mult, tp_mult,
+              use_htf, daily_ma,
+              use_rvol, rvol, rvol_thresh,
+              use_hurst, hurst, hurst_thresh,
+              use_adx, adx, adx_thresh,
+              use_ts, ts_mult, tv_ties)
+    return signals, exits, fills
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def _numba_orb_trades_parallel(day_starts, day_ids, times, closes, highs, lows, opens, ema, atr,
+                               start_min, end_min, exit_min,
+                               atr_max_mult, sl_mult, tp_mult,
+                               use_htf, daily_ma,
+                               use_rvol, rvol, rvol_thresh,
+                               use_hurst, hurst, hurst_thresh,
+                               use_adx, adx, adx_thresh,
+                               use_ts, ts_mult, tv_ties):
+    """
+    ``_numba_orb_trades`` with the trading days (``SessionIndex.day_starts``)
+    spread over numba threads. All kernel state resets at a day change, so
+    each day runs from a flat start; the only cross-day outputs, the
+    ``EXIT_DAY`` (and its fill) of a position still open at the previous
+    day's last bar, are filled in afterwards from that bar's signal.
+    """
+    signals = np.zeros(len(closes), dtype=np.int32)
+    exits = np.zeros(len(closes), dtype=np.int8)
+    fills = np.full(len(closes), np.nan)
+    n_days = len(day_starts) - 1
+    for d in prange(n_days):
+        _orb_fill(signals, exits, fills, day_starts[d], day_starts[d + 1],
+                  day_ids, times, closes, highs, lows, opens, ema, atr,
+                  start_min, end_min, exit_min,
+                  atr_max_mult, sl_mult, tp_mult,
+                  use_htf, daily_ma,
+                  use_rvol, rvol, rvol_thresh,
+                  use_hurst, hurst, hurst_thresh,
+                  use_adx, adx, adx_thresh,
+                  use_ts, ts_mult, tv_ties)
+    for d in range(1, n_days):
+        i = day_starts[d]
+        if signals[i - 1] != 0:
+            exits[i] = EXIT_DAY
+            fills[i] = closes[i]
+    return signals, exits, fills
+
+
+@jit(nopython=True, cache=True)
+def _numba_orb_batch(day_ids, times, closes, highs, lows, opens, ema, atr,
+                     start_min, end_min, exit_min,
+                     atr_max_mults, sl_mults, tp_mults,
+                     use_htf, daily_ma,
+                     use_rvol, rvol, rvol_threshs,
+                     use_hurst, hurst, hurst_threshs,
+                     use_adx, adx, adx_threshs,
+                     use_ts, ts_mults, tv_ties):
+    """
+    ``_numba_orb_trades`` for a parameter matrix: row k of the result uses
+    the k-th entry of every per-row array (``*_mults``, ``*_threshs``,
+    ``use_ts``); indicators and session arrays are shared. Rows run
+    serially: ``VectorizedGridSearch`` already spreads chunks across pool
+    workers, so a threaded kernel would only oversubscribe the cores.
+
+    Returns (signals, fill_ptr, fill_bars, fill_prices): the int8 signal
+    matrix and the fills of row k at ``fill_ptr[k]:fill_ptr[k + 1]``.
+    """
+    n_rows = len(sl_mults)
+    signals = np.zeros((n_rows, len(closes)), dtype=np.int8)
+    exits = np.zeros(len(closes), dtype=np.int8)  # scratch, not returned
+    fills = np.empty(len(closes))  # scratch, compressed per row
+    fill_ptr = np.zeros(n_rows + 1, dtype=np.int64)
+    fill_bars = np.empty(64, dtype=np.int64)
+    fill_prices = np.empty(64)
+    for k in range(n_rows):
+        fills[:] = np.nan
+        _orb_fill(signals[k], exits, fills, 1, len(closes),
+                  day_ids, times, closes, highs, lows, opens, ema, atr,
+                  start_min, end_min, exit_min,
+                  atr_max_mults[k], sl_mults[k], tp_mults[k],
+                  use_htf, daily_ma,
+                  use_rvol, rvol, rvol_threshs[k],
+                  use_hurst, hurst, hurst_threshs[k],
+                  use_adx, adx, adx_threshs[k],
+                  use_ts[k], ts_mults[k], tv_ties)
+        fill_bars, fill_prices, fill_ptr[k + 1] = _append_fills(fills, fill_ptr[k], fill_bars, fill_prices)
+    return signals, fill_ptr, fill_bars[:fill_ptr[n_rows]], fill_prices[:fill_ptr[n_rows]]
+
+
+@jit(nopython=True, cache=True)
+def _orb_fill(signals, exits, fills, lo, hi, day_ids, times, closes, highs, lows, opens, ema, atr,
+              start_min, end_min, exit_min,
+              atr_max_mult, sl_mult, tp_mult,
+              use_htf, daily_ma,
+              use_rvol, rvol, rvol_thresh,
+              use_hurst, hurst, hurst_thresh,
+              use_adx, adx, adx_thresh,
+              use_ts, ts_mult, tv_ties):
+    """
+    Writes the ORB signals of one parameter set into ``signals``, and at
+    each bar that closes a position the ``EXIT_*`` reason into ``exits``
+    and the fill price into ``fills`` (see ``_stop_first`` and
+    ``_level_fill``; time exits fill at the close), for bars ``lo:hi``
+    starting flat (bar 0 is never traded).
+    """
     # State Variables
     orb_high = -1.0
     orb_low = 1e9
@@ -320,7 +1301,7 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
     tp_price = 0.0
 
     # We iterate chronologically
-    for i in range(1, n):
+    for i in range(max(lo, 1), hi):
         t = times[i]
 
         # 1. Detect New Trading Day using calendar date ordinals
@@ -329,6 +1310,9 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
             orb_high = -1.0
             orb_low = 1e9
             traded_today = False
+            if in_pos != 0:
+                exits[i] = EXIT_DAY
+                fills[i] = closes[i]
             in_pos = 0
 
         # ORB Calculation Window
@@ -362,13 +1346,19 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
                         if new_sl > sl_price:
                             sl_price = new_sl
 
-                    if lows[i] <= sl_price:
+                    hit_sl = lows[i] <= sl_price
+                    # TP only if Fixed Target is used
+                    hit_tp = not use_ts and highs[i] >= tp_price
+                    if hit_sl and (not hit_tp or _stop_first(1, opens[i], highs[i], lows[i],
+                                                             sl_price, tp_price, tv_ties)):
                         # Stop Hit
-                        signals[i] = 0
                         in_pos = 0
-                    elif not use_ts and highs[i] >= tp_price:
-                        # TP Hit (Only if Fixed Target is used)
+                        exits[i] = EXIT_TRAIL if use_ts else EXIT_STOP
+                        fills[i] = _level_fill(-1, opens[i], sl_price)
+                    elif hit_tp:
                         in_pos = 0
+                        exits[i] = EXIT_TARGET
+                        fills[i] = _level_fill(1, opens[i], tp_price)
 
                 elif in_pos == -1:
                     # Short Exit // Trailing Stop
@@ -377,10 +1367,17 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
                         if new_sl < sl_price:
                             sl_price = new_sl
 
-                    if highs[i] >= sl_price:
+                    hit_sl = highs[i] >= sl_price
+                    hit_tp = not use_ts and lows[i] <= tp_price
+                    if hit_sl and (not hit_tp or _stop_first(-1, opens[i], highs[i], lows[i],
+                                                             sl_price, tp_price, tv_ties)):
                         in_pos = 0
-                    elif not use_ts and lows[i] <= tp_price:
+                        exits[i] = EXIT_TRAIL if use_ts else EXIT_STOP
+                        fills[i] = _level_fill(1, opens[i], sl_price)
+                    elif hit_tp:
                         in_pos = 0
+                        exits[i] = EXIT_TARGET
+                        fills[i] = _level_fill(-1, opens[i], tp_price)
 
             # Check Entries
             if in_pos == 0 and not traded_today and orb_high != -1.0:
@@ -422,6 +1419,9 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
 
         # Session End
         elif t >= exit_min:
+            if in_pos != 0:
+                exits[i] = EXIT_SESSION
+                fills[i] = closes[i]
             in_pos = 0
 
         # Record Signal
@@ -429,7 +1429,66 @@ def _numba_orb_logic(day_ids, times, closes, highs, lows, ema, atr,
         # So signals[i] determines position at i+1.
         signals[i] = in_pos
 
-    return signals
+
+@jit(nopython=True, cache=True)
+def _stop_first(side, open_, high, low, sl_price, tp_price, tv_ties):
+    """
+    Whether a bar that reaches both the stop and the target of a ``side``
+    position hits the stop first. PESSIMISTIC (``tv_ties`` False) always
+    assumes the stop. TV_BROKER_EMULATOR follows TradingView's intrabar
+    path: a level the bar opens beyond is hit at the open, otherwise price
+    moves from the open to the nearer extreme (the low on a tie) first.
+    """
+    if not tv_ties:
+        return True
+    high_first = high - open_ < open_ - low
+    if side > 0:
+        if open_ <= sl_price:
+            return True
+        if open_ >= tp_price:
+            return False
+        return not high_first
+    if open_ >= sl_price:
+        return True
+    if open_ <= tp_price:
+        return False
+    return high_first
+
+
+@jit(nopython=True, cache=True)
+def _level_fill(direction, open_, level):
+    """
+    Fill price of a resting order at ``level`` reached by price rising
+    (``direction`` 1) or falling (-1): the level, or the open if the bar
+    gapped through it (like ``SimulatedExecutionHandler``'s stop and limit
+    fills). A NaN open fills at the level.
+    """
+    if direction > 0:
+        return open_ if open_ > level else level
+    return open_ if open_ < level else level
+
+
+@jit(nopython=True, cache=True)
+def _append_fills(fills, start, fill_bars, fill_prices):
+    """
+    Appends the (bar, price) of every non-NaN ``fills`` entry to the
+    buffers from position ``start``, doubling them when full. Returns
+    (fill_bars, fill_prices, end).
+    """
+    m = start
+    for i in range(len(fills)):
+        if fills[i] == fills[i]:
+            if m == len(fill_bars):
+                grown_bars = np.empty(2 * m, dtype=np.int64)
+                grown_prices = np.empty(2 * m)
+                grown_bars[:m] = fill_bars
+                grown_prices[:m] = fill_prices
+                fill_bars = grown_bars
+                fill_prices = grown_prices
+            fill_bars[m] = i
+            fill_prices[m] = fills[i]
+            m += 1
+    return fill_bars, fill_prices, m
 
 
 class VectorizedOvernight(VectorStrategy):
@@ -450,12 +1509,12 @@ class VectorizedOvernight(VectorStrategy):
     """
     def __init__(self, session_start="18:00", session_end="08:00",
                  range_minutes=60, ema_filter=50, atr_filter=14,
-                 sl_atr_mult=2.0, tp_atr_mult=3.0, **kwargs):
+                 sl_atr_mult=2.0, tp_atr_mult=3.0, tie_break=TIE_PESSIMISTIC, **kwargs):
         super().__init__(
             session_start=session_start, session_end=session_end,
             range_minutes=range_minutes, ema_filter=ema_filter,
             atr_filter=atr_filter, sl_atr_mult=sl_atr_mult,
-            tp_atr_mult=tp_atr_mult, **kwargs
+            tp_atr_mult=tp_atr_mult, tie_break=tie_break, **kwargs
         )
         self.session_start = session_start
         self.session_end = session_end
@@ -464,31 +1523,85 @@ class VectorizedOvernight(VectorStrategy):
         self.atr_filter = int(atr_filter)
         self.sl_atr_mult = float(sl_atr_mult)
         self.tp_atr_mult = float(tp_atr_mult)
+        self.tie_break = _check_tie_break(tie_break)
 
-    def generate_signals(self, df):
-        from . import ta
+    # Parameters that only enter the kernel as scalars
+    KERNEL_PARAMS = ('sl_atr_mult', 'tp_atr_mult')
 
-        # Ensure lowercase column names
-        if 'close' not in df.columns:
-            df = df.rename(columns={'Close': 'close', 'High': 'high', 'Low': 'low'})
-        if 'high' not in df.columns and 'High' in df.columns:
-            df = df.rename(columns={'High': 'high'})
-        if 'low' not in df.columns and 'Low' in df.columns:
-            df = df.rename(columns={'Low': 'low'})
+    # One entry per session, and a calendar day holds the end of one
+    # session and the start of the next
+    MAX_TRADES_PER_DAY = 2
 
-        # Calculate indicators
-        ema = ta.ema(df['close'], length=self.ema_filter).fillna(0).values.astype(np.float64)
-        atr = ta.atr(df['high'], df['low'], df['close'], length=self.atr_filter).fillna(0).values.astype(np.float64)
+    def generate_signals(self, df):
+        bars = as_bar_frame(df)
+        signals = self._run_kernel(bars, self._kernel_inputs(bars))[0]
+
+        return pd.Series(signals, index=bars.index)
+
+    def generate_signals_and_trades(self, df):
+        bars = as_bar_frame(df)
+        signals, exits, fills = self._run_kernel(bars, self._kernel_inputs(bars))
+        return pd.Series(signals, index=bars.index), _ledger_records(
+            _numba_trade_ledger(signals, exits, fills, bars.close, bars.high, bars.low))
+
+    def _run_kernel(self, bars, inputs):
+        """(signals, exits, fills) of ``_numba_overnight_trades``."""
+        return _numba_overnight_trades(
+            *inputs['arrays'], *inputs['window'],
+            self.sl_atr_mult, self.tp_atr_mult,
+            self.tie_break == TIE_TV_BROKER_EMULATOR
+        )
 
-        # Time arrays
-        times = (df.index.hour * 60 + df.index.minute).values
-        day_ids = np.array([d.toordinal() for d in df.index.date], dtype=np.int64)
+    @classmethod
+    def generate_signal_matrix(cls, df, param_sets):
+        return cls.generate_signal_matrix_and_fills(df, param_sets)[0]
 
-        # Price arrays
-        closes = df['close'].values.astype(np.float64)
-        highs = df['high'].values.astype(np.float64)
-        lows = df['low'].values.astype(np.float64)
+    @classmethod
+    def generate_signal_matrix_and_fills(cls, df, param_sets):
+        """
+        Batched ``generate_signals``: one ``_numba_overnight_batch`` call per
+        group of parameter sets sharing session and indicator settings.
+        """
+        bars = as_bar_frame(df)
+        strategies = [cls(**params) for params in param_sets]
+        matrix = np.zeros((len(strategies), len(bars)), dtype=np.int8)
+        fills = [None] * len(strategies)
+        for rows in _group_rows(strategies, cls.KERNEL_PARAMS).values():
+            group = [strategies[k] for k in rows]
+            inputs = group[0]._kernel_inputs(bars)
+            signals, fill_ptr, fill_bars, fill_prices = _numba_overnight_batch(
+                *inputs['arrays'], *inputs['window'],
+                np.array([s.sl_atr_mult for s in group], dtype=np.float64),
+                np.array([s.tp_atr_mult for s in group], dtype=np.float64),
+                group[0].tie_break == TIE_TV_BROKER_EMULATOR
+            )
+            matrix[rows] = signals
+            _scatter_fills(fills, rows, fill_ptr, fill_bars, fill_prices)
+        return matrix, _join_fills(fills)
+
+    def _kernel_inputs(self, bars):
+        """Indicator and session arrays fed to the overnight kernels (``bars`` is a BarFrame)."""
+        # Calculate indicators (memoized per dataset, see indicator_cache.py)
+        close, high, low = bars['close'], bars['high'], bars['low']
+        keys = _price_keys(bars)
+        ema = _indicator(bars, 'ema', (self.ema_filter,), keys[:1],
+                         lambda: _fillna(fast_ta.ema(close, self.ema_filter)))
+        atr = _indicator(bars, 'atr', (self.atr_filter,), keys,
+                         lambda: _fillna(fast_ta.atr(high, low, close, self.atr_filter)))
+
+        # Time arrays (cached per dataset, see sessions.py)
+        return self._inputs(bars, bars.sessions, ema, atr)
+
+    def _inputs(self, bars, sessions, ema, atr):
+        """Kernel inputs from computed indicators."""
+        return {
+            'arrays': (sessions.day_ids, sessions.minute_of_day,
+                       bars.close, bars.high, bars.low, bars.open, ema, atr),
+            'window': self._session_window(),
+        }
 
+    def _session_window(self):
+        """(start_min, end_min, range_end_min): the session and its range formation as minutes of day."""
         # Parse session times
         t_start = pd.to_datetime(self.session_start).time()
         start_min = t_start.hour * 60 + t_start.minute
@@ -500,20 +1613,80 @@ class VectorizedOvernight(VectorStrategy):
         range_end_min = start_min + self.range_minutes
         if range_end_min >= 1440:
             range_end_min -= 1440  # wrap past midnight
+        return start_min, end_min, range_end_min
 
-        signals = _numba_overnight_logic(
-            day_ids, times, closes, highs, lows, ema, atr,
-            start_min, end_min, range_end_min,
-            self.sl_atr_mult, self.tp_atr_mult
-        )
+    def _streamable(self):
+        """Whether ``streaming.StreamingBacktest`` can extend the kernel state (always)."""
+        return True
 
-        return pd.Series(signals, index=df.index)
+    def _state_resets(self, sessions):
+        """
+        Bars at which every kernel variable resets: a new day starting in
+        the evening session, or the session's first bar after a bar
+        outside it. The kernel run from the bar before one, if flat
+        there, matches the full run from there on.
+        """
+        start_min, end_min, _ = self._session_window()
+        day_ids, times = sessions.day_ids, sessions.minute_of_day
+        if start_min > end_min:
+            in_session = (times >= start_min) | (times < end_min)
+        else:
+            in_session = (times >= start_min) & (times < end_min)
+        new_day = np.r_[False, day_ids[1:] != day_ids[:-1]]
+        after_session = np.r_[False, ~in_session[:-1]]
+        session_start = (times >= start_min) & (times < start_min + 5)
+        return (new_day & (times >= start_min)) | (after_session & session_start)
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
                            start_min, end_min, range_end_min,
                            sl_mult, tp_mult):
+    """Overnight signals with the default (stop-first) tie-break."""
+    return _numba_overnight_trades(day_ids, times, closes, highs, lows, closes, ema, atr,
+                                   start_min, end_min, range_end_min, sl_mult, tp_mult, False)[0]
+
+
+@jit(nopython=True, cache=True)
+def _numba_overnight_trades(day_ids, times, closes, highs, lows, opens, ema, atr,
+                            start_min, end_min, range_end_min,
+                            sl_mult, tp_mult, tv_ties):
+    """The overnight kernel: (signals, exits, fills), see ``_overnight_fill``."""
+    signals = np.zeros(len(closes), dtype=np.int32)
+    exits = np.zeros(len(closes), dtype=np.int8)
+    fills = np.full(len(closes), np.nan)
+    _overnight_fill(signals, exits, fills, day_ids, times, closes, highs, lows, opens, ema, atr,
+                    start_min, end_min, range_end_min, sl_mult, tp_mult, tv_ties)
+    return signals, exits, fills
+
+
+@jit(nopython=True, cache=True)
+def _numba_overnight_batch(day_ids, times, closes, highs, lows, opens, ema, atr,
+                           start_min, end_min, range_end_min,
+                           sl_mults, tp_mults, tv_ties):
+    """
+    ``_numba_overnight_trades`` for per-row SL/TP multipliers; returns
+    fills like ``_numba_orb_batch``.
+    """
+    n_rows = len(sl_mults)
+    signals = np.zeros((n_rows, len(closes)), dtype=np.int8)
+    exits = np.zeros(len(closes), dtype=np.int8)  # scratch, not returned
+    fills = np.empty(len(closes))  # scratch, compressed per row
+    fill_ptr = np.zeros(n_rows + 1, dtype=np.int64)
+    fill_bars = np.empty(64, dtype=np.int64)
+    fill_prices = np.empty(64)
+    for k in range(n_rows):
+        fills[:] = np.nan
+        _overnight_fill(signals[k], exits, fills, day_ids, times, closes, highs, lows, opens, ema, atr,
+                        start_min, end_min, range_end_min, sl_mults[k], tp_mults[k], tv_ties)
+        fill_bars, fill_prices, fill_ptr[k + 1] = _append_fills(fills, fill_ptr[k], fill_bars, fill_prices)
+    return signals, fill_ptr, fill_bars[:fill_ptr[n_rows]], fill_prices[:fill_ptr[n_rows]]
+
+
+@jit(nopython=True, cache=True)
+def _overnight_fill(signals, exits, fills, day_ids, times, closes, highs, lows, opens, ema, atr,
+                    start_min, end_min, range_end_min,
+                    sl_mult, tp_mult, tv_ties):
     """Numba-accelerated overnight session mean-reversion logic.
 
     Session timing: The overnight session spans across midnight.
@@ -532,9 +1705,11 @@ def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
       (short if close < ema, long if close > ema).
 
     Hard exit at session_end to avoid RTH open volatility.
+    Writes the signals of one parameter set into ``signals``, and at each
+    bar that closes a position the ``EXIT_*`` reason into ``exits`` and
+    the fill price into ``fills`` (like ``_orb_fill``).
     """
     n = len(closes)
-    signals = np.zeros(n, dtype=np.int32)
 
     # Determine if session crosses midnight
     # If start_min > end_min, the session wraps (e.g., 18:00 -> 08:00)
@@ -565,6 +1740,8 @@ def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
             # Force exit any held position on day boundary
             if in_pos != 0:
                 in_pos = 0
+                exits[i] = EXIT_DAY
+                fills[i] = closes[i]
             # If we were in the evening portion, a new day means we continue
             # the same overnight session into the morning.
             # But if we're entering a new evening session, reset.
@@ -599,6 +1776,8 @@ def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
             # Outside session -- flatten
             if in_pos != 0:
                 in_pos = 0
+                exits[i] = EXIT_SESSION
+                fills[i] = closes[i]
             in_session = False
             signals[i] = 0
             continue
@@ -639,6 +1818,9 @@ def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
             else:
                 near_exit = t >= end_min - 5
             if near_exit:
+                if in_pos != 0:
+                    exits[i] = EXIT_SESSION
+                    fills[i] = closes[i]
                 in_pos = 0
                 signals[i] = 0
                 continue
@@ -647,16 +1829,28 @@ def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
             if in_pos != 0:
                 if in_pos == 1:
                     # Long: check SL/TP
-                    if lows[i] <= sl_price:
+                    hit_tp = highs[i] >= tp_price
+                    if lows[i] <= sl_price and (not hit_tp or _stop_first(
+                            1, opens[i], highs[i], lows[i], sl_price, tp_price, tv_ties)):
                         in_pos = 0
-                    elif highs[i] >= tp_price:
+                        exits[i] = EXIT_STOP
+                        fills[i] = _level_fill(-1, opens[i], sl_price)
+                    elif hit_tp:
                         in_pos = 0
+                        exits[i] = EXIT_TARGET
+                        fills[i] = _level_fill(1, opens[i], tp_price)
                 elif in_pos == -1:
                     # Short: check SL/TP
-                    if highs[i] >= sl_price:
+                    hit_tp = lows[i] <= tp_price
+                    if highs[i] >= sl_price and (not hit_tp or _stop_first(
+                            -1, opens[i], highs[i], lows[i], sl_price, tp_price, tv_ties)):
                         in_pos = 0
-                    elif lows[i] <= tp_price:
+                        exits[i] = EXIT_STOP
+                        fills[i] = _level_fill(1, opens[i], sl_price)
+                    elif hit_tp:
                         in_pos = 0
+                        exits[i] = EXIT_TARGET
+                        fills[i] = _level_fill(-1, opens[i], tp_price)
 
             # Check entries (max 1 per session)
             if in_pos == 0 and not traded_session and range_high > range_low:
@@ -693,5 +1887,3 @@ def _numba_overnight_logic(day_ids, times, closes, highs, lows, ema, atr,
                     broke_low = False
 
         signals[i] = in_pos
-
-    return signals
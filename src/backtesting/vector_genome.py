@@ -0,0 +1,404 @@
+"""
+Genome Strategies
+=================
+One compiled kernel that backtests any ``StrategyFactory`` genome.
+
+``EvolutionaryOptimizer`` used to hand every genome to
+``VectorizedNQORB``, which ignores ``entry_logic``, ``filter_logic`` and
+``exit_logic``: RSI, moving-average and Bollinger genomes were all scored
+as ORB with their stop multipliers. ``VectorizedGenome`` runs the genome
+as designed. Each genome is encoded as one float row (``GENOME_FIELDS``,
+see ``encode_genome``) and ``_genome_fill`` switches on its codes:
+
+- entries: ORB (first close beyond the ``orb_start``-``orb_end`` range,
+  once per day), RSI_Cross (RSI(``rsi_period``) back above
+  ``RSI_OVERSOLD`` -> long, back below ``RSI_OVERBOUGHT`` -> short),
+  MA_Cross (close crossing EMA(``ema_period``)), Bollinger_Breakout
+  (close crossing out of the ``BB_LENGTH``/``BB_MULT`` bands);
+- filters: None, EMA_Trend (longs above / shorts below the EMA), RVOL
+  (volume / ``RVOL_LENGTH``-bar average above ``RVOL_THRESH``),
+  ADX_Regime (ADX(``ADX_LENGTH``) above ``ADX_THRESH``);
+- exits: Fixed_RR (``sl_mult``/``tp_mult`` x ATR(``atr_period``) stop
+  and target), Trailing_ATR (a ``sl_mult`` x ATR stop trailed like
+  ``VectorizedNQORB``'s, no target), Time_Exit (the stop, then the close
+  after ``hold_bars`` bars).
+
+Every genome only enters between ``orb_end`` and ``exit_time`` (the
+opening range is the ORB window for the other entries too), is flat at
+``exit_time`` and at each new day, and fills stops and targets intrabar
+like the ORB kernel (``tie_break``).
+
+A population needs no strategy objects: ``generate_signal_matrix_and_fills``
+encodes the parameter dicts and runs them through ``_numba_genome_batch``
+in one call, sorted so that genomes sharing indicator periods reuse them,
+and ``VectorEngine.run_batch`` scores the matrix.
+
+Usage:
+    engine = VectorEngine(VectorizedGenome(**genome.to_params()))
+    result = engine.run(bars)
+    scores = engine.run_batch(bars, [g.to_params() for g in population])
+"""
+
+import numpy as np
+import pandas as pd
+
+from .bar_frame import as_bar_frame
+from .ta_numba import _adx, _ewm_mean, _rolling_std, _rolling_sum, _rsi, _true_range
+from .vector_engine import (
+    EXIT_DAY, EXIT_SESSION, EXIT_STOP, EXIT_TARGET, EXIT_TIME, EXIT_TRAIL,
+    TIE_PESSIMISTIC, TIE_TV_BROKER_EMULATOR, VectorStrategy, _append_fills, _check_tie_break,
+    _join_fills, _ledger_records, _level_fill, _numba_trade_ledger, _scatter_fills, _stop_first,
+    jit,
+)
+
+ENTRY_TYPES = ('ORB', 'RSI_Cross', 'MA_Cross', 'Bollinger_Breakout')
+FILTER_TYPES = ('None', 'EMA_Trend', 'RVOL', 'ADX_Regime')
+EXIT_TYPES = ('Fixed_RR', 'Trailing_ATR', 'Time_Exit')
+
+# Columns of an encoded genome; the block types are indices into the
+# tuples above, times are minutes of day
+GENOME_FIELDS = ('entry', 'filter', 'exit', 'ema_period', 'rsi_period', 'atr_period',
+                 'sl_mult', 'tp_mult', 'hold_bars', 'start_min', 'end_min', 'exit_min', 'tv_ties')
+_ENTRY, _FILTER, _EXIT, _EMA, _RSI, _ATR, _SL, _TP, _HOLD, _START, _END, _EXIT_MIN, _TV = range(13)
+
+ENTRY_ORB, ENTRY_RSI, ENTRY_MA, ENTRY_BB = range(4)
+FILTER_NONE, FILTER_EMA, FILTER_RVOL, FILTER_ADX = range(4)
+EXIT_FIXED, EXIT_TRAILING, EXIT_TIMED = range(3)
+
+# Fixed settings of the blocks (genomes carry no genes for them)
+RSI_OVERSOLD = 30.0
+RSI_OVERBOUGHT = 70.0
+BB_LENGTH = 20
+BB_MULT = 2.0
+RVOL_LENGTH = 20
+RVOL_THRESH = 1.5
+ADX_LENGTH = 14
+ADX_THRESH = 20.0
+
+GENOME_DEFAULTS = {
+    'entry_logic': 'ORB', 'filter_logic': 'None', 'exit_logic': 'Fixed_RR',
+    'ema_period': 50, 'rsi_period': 14, 'atr_period': 14,
+    'sl_mult': 2.0, 'tp_mult': 4.0, 'hold_bars': 12,
+    'orb_start': '09:30', 'orb_end': '09:45', 'exit_time': '15:45',
+    'tie_break': TIE_PESSIMISTIC,
+}
+
+
+def _minute_of_day(value) -> int:
+    t = pd.to_datetime(value).time()
+    return t.hour * 60 + t.minute
+
+
+def _code(choices, value, gene):
+    if value not in choices:
+        raise ValueError(f"{gene} must be one of {choices}, got {value!r}")
+    return choices.index(value)
+
+
+def encode_genome(params) -> np.ndarray:
+    """
+    ``GENOME_FIELDS`` row of a genome's parameter dict (``GENOME_DEFAULTS``
+    for missing genes; other keys, e.g. the factory's ``use_*`` flags or
+    result columns, are ignored).
+    """
+    genes = {**GENOME_DEFAULTS, **{k: v for k, v in params.items() if k in GENOME_DEFAULTS}}
+    return np.array([
+        _code(ENTRY_TYPES, genes['entry_logic'], 'entry_logic'),
+        _code(FILTER_TYPES, genes['filter_logic'], 'filter_logic'),
+        _code(EXIT_TYPES, genes['exit_logic'], 'exit_logic'),
+        int(genes['ema_period']), int(genes['rsi_period']), int(genes['atr_period']),
+        float(genes['sl_mult']), float(genes['tp_mult']), int(genes['hold_bars']),
+        _minute_of_day(genes['orb_start']), _minute_of_day(genes['orb_end']),
+        _minute_of_day(genes['exit_time']),
+        _check_tie_break(genes['tie_break']) == TIE_TV_BROKER_EMULATOR,
+    ], dtype=np.float64)
+
+
+def encode_genomes(param_sets) -> np.ndarray:
+    """(rows x ``GENOME_FIELDS``) matrix of ``encode_genome`` rows."""
+    rows = np.empty((len(param_sets), len(GENOME_FIELDS)))
+    for k, params in enumerate(param_sets):
+        rows[k] = encode_genome(params)
+    return rows
+
+
+class VectorizedGenome(VectorStrategy):
+    """A ``StrategyFactory`` genome as a vector strategy (see module docstring)."""
+
+    def __init__(self, **genes):
+        super().__init__(**genes)
+        self.genome = encode_genome(genes)
+
+    def generate_signals(self, df):
+        return self.generate_signals_and_trades(df)[0]
+
+    def generate_signals_and_trades(self, df):
+        bars = as_bar_frame(df)
+        arrays = _genome_arrays(bars)
+        signals, exits, fills = _numba_genome_trades(*arrays, self.genome)
+        return pd.Series(signals, index=bars.index), _ledger_records(
+            _numba_trade_ledger(signals, exits, fills, bars.close, bars.high, bars.low))
+
+    @classmethod
+    def generate_signal_matrix(cls, df, param_sets):
+        return cls.generate_signal_matrix_and_fills(df, param_sets)[0]
+
+    @classmethod
+    def generate_signal_matrix_and_fills(cls, df, param_sets):
+        """
+        All genomes in one ``_numba_genome_batch`` call, ordered by their
+        indicator periods so runs of equal periods compute them once.
+        """
+        bars = as_bar_frame(df)
+        genomes = encode_genomes(param_sets)
+        order = np.lexsort((genomes[:, _RSI], genomes[:, _EMA], genomes[:, _ATR]))
+        signals, fill_ptr, fill_bars, fill_prices = _numba_genome_batch(
+            *_genome_arrays(bars), np.ascontiguousarray(genomes[order]))
+        matrix = np.empty_like(signals)
+        matrix[order] = signals
+        fills = [None] * len(genomes)
+        _scatter_fills(fills, order, fill_ptr, fill_bars, fill_prices)
+        return matrix, _join_fills(fills)
+
+
+def _genome_arrays(bars):
+    """Session and price arrays fed to the genome kernels."""
+    sessions = bars.sessions
+    return (sessions.day_ids, sessions.minute_of_day,
+            bars.close, bars.high, bars.low, bars.open, bars.volume)
+
+
+@jit(nopython=True, cache=True, error_model='numpy')
+def _shared_indicators(closes, highs, lows, volumes, genomes):
+    """
+    (upper, lower, rvol, adx): the fixed-length indicators, each computed
+    only if one of ``genomes`` uses it (else empty).
+    """
+    upper = np.empty(0)
+    lower = np.empty(0)
+    rvol = np.empty(0)
+    adx = np.empty(0)
+    entries = genomes[:, _ENTRY]
+    filters = genomes[:, _FILTER]
+    if np.any(entries == ENTRY_BB):
+        basis = _rolling_sum(closes, BB_LENGTH) / BB_LENGTH
+        dev = BB_MULT * _rolling_std(closes, BB_LENGTH)
+        upper = basis + dev
+        lower = basis - dev
+    if np.any(filters == FILTER_RVOL):
+        # Relative volume as VectorizedNQORB computes it (warmup -> raw volume)
+        avg = _rolling_sum(volumes, RVOL_LENGTH) / RVOL_LENGTH
+        rvol = np.empty(len(volumes))
+        for i in range(len(volumes)):
+            a = avg[i] if avg[i] == avg[i] else 1.0
+            r = volumes[i] / a
+            rvol[i] = r if r == r else 0.0
+    if np.any(filters == FILTER_ADX):
+        adx = _adx(highs, lows, closes, ADX_LENGTH)
+    return upper, lower, rvol, adx
+
+
+@jit(nopython=True, cache=True)
+def _uses_ema(genome):
+    return genome[_ENTRY] == ENTRY_MA or genome[_FILTER] == FILTER_EMA
+
+
+@jit(nopython=True, cache=True)
+def _numba_genome_trades(day_ids, times, closes, highs, lows, opens, volumes, genome):
+    """One genome: (signals, exits, fills) like ``_numba_orb_trades``."""
+    n = len(closes)
+    genomes = genome.reshape((1, len(genome)))
+    upper, lower, rvol, adx = _shared_indicators(closes, highs, lows, volumes, genomes)
+    ema = _ewm_mean(closes, 2.0 / (genome[_EMA] + 1.0)) if _uses_ema(genome) else np.empty(0)
+    rsi = _rsi(closes, int(genome[_RSI])) if genome[_ENTRY] == ENTRY_RSI else np.empty(0)
+    atr = _ewm_mean(_true_range(highs, lows, closes), 1.0 / genome[_ATR])
+    signals = np.zeros(n, dtype=np.int32)
+    exits = np.zeros(n, dtype=np.int8)
+    fills = np.full(n, np.nan)
+    _genome_fill(signals, exits, fills, day_ids, times, closes, highs, lows, opens, genome,
+                 ema, rsi, atr, upper, lower, rvol, adx)
+    return signals, exits, fills
+
+
+@jit(nopython=True, cache=True)
+def _numba_genome_batch(day_ids, times, closes, highs, lows, opens, volumes, genomes):
+    """
+    ``_numba_genome_trades`` for every row of ``genomes``; an indicator is
+    recomputed only when its period differs from the previous row's.
+    Returns (signals, fill_ptr, fill_bars, fill_prices) like
+    ``_numba_orb_batch``.
+    """
+    n_rows = len(genomes)
+    n = len(closes)
+    signals = np.zeros((n_rows, n), dtype=np.int8)
+    exits = np.zeros(n, dtype=np.int8)  # scratch, not returned
+    fills = np.empty(n)  # scratch, compressed per row
+    fill_ptr = np.zeros(n_rows + 1, dtype=np.int64)
+    fill_bars = np.empty(64, dtype=np.int64)
+    fill_prices = np.empty(64)
+    upper, lower, rvol, adx = _shared_indicators(closes, highs, lows, volumes, genomes)
+    ema = np.empty(0)
+    rsi = np.empty(0)
+    atr = np.empty(0)
+    ema_period = -1.0
+    rsi_period = -1.0
+    atr_period = -1.0
+    for k in range(n_rows):
+        genome = genomes[k]
+        if _uses_ema(genome) and genome[_EMA] != ema_period:
+            ema_period = genome[_EMA]
+            ema = _ewm_mean(closes, 2.0 / (ema_period + 1.0))
+        if genome[_ENTRY] == ENTRY_RSI and genome[_RSI] != rsi_period:
+            rsi_period = genome[_RSI]
+            rsi = _rsi(closes, int(rsi_period))
+        if genome[_ATR] != atr_period:
+            atr_period = genome[_ATR]
+            atr = _ewm_mean(_true_range(highs, lows, closes), 1.0 / atr_period)
+        fills[:] = np.nan
+        _genome_fill(signals[k], exits, fills, day_ids, times, closes, highs, lows, opens, genome,
+                     ema, rsi, atr, upper, lower, rvol, adx)
+        fill_bars, fill_prices, fill_ptr[k + 1] = _append_fills(fills, fill_ptr[k], fill_bars, fill_prices)
+    return signals, fill_ptr, fill_bars[:fill_ptr[n_rows]], fill_prices[:fill_ptr[n_rows]]
+
+
+@jit(nopython=True, cache=True)
+def _entry_direction(entry, i, closes, orb_high, orb_low, traded_today, ema, rsi, upper, lower):
+    """1 / -1 if the entry block fires long / short at bar i, else 0."""
+    c = closes[i]
+    if entry == ENTRY_ORB:
+        if traded_today or orb_high == -1.0 or not orb_high > orb_low:
+            return 0
+        if c > orb_high:
+            return 1
+        if c < orb_low:
+            return -1
+    elif entry == ENTRY_RSI:
+        if rsi[i - 1] < RSI_OVERSOLD and rsi[i] >= RSI_OVERSOLD:
+            return 1
+        if rsi[i - 1] > RSI_OVERBOUGHT and rsi[i] <= RSI_OVERBOUGHT:
+            return -1
+    elif entry == ENTRY_MA:
+        if c > ema[i] and closes[i - 1] <= ema[i - 1]:
+            return 1
+        if c < ema[i] and closes[i - 1] >= ema[i - 1]:
+            return -1
+    else:
+        if c > upper[i] and closes[i - 1] <= upper[i - 1]:
+            return 1
+        if c < lower[i] and closes[i - 1] >= lower[i - 1]:
+            return -1
+    return 0
+
+
+@jit(nopython=True, cache=True)
+def _genome_fill(signals, exits, fills, day_ids, times, closes, highs, lows, opens, genome,
+                 ema, rsi, atr, upper, lower, rvol, adx):
+    """
+    Writes one genome's signals into ``signals``, and at each bar that
+    closes a position the ``EXIT_*`` reason into ``exits`` and the fill
+    price into ``fills`` (like ``_orb_fill``; bar 0 is never traded).
+    """
+    entry = int(genome[_ENTRY])
+    filter_type = int(genome[_FILTER])
+    exit_type = int(genome[_EXIT])
+    sl_mult = genome[_SL]
+    tp_mult = genome[_TP]
+    hold_bars = genome[_HOLD]
+    start_min = genome[_START]
+    end_min = genome[_END]
+    exit_min = genome[_EXIT_MIN]
+    tv_ties = genome[_TV] != 0
+    use_ts = exit_type == EXIT_TRAILING
+    use_tp = exit_type == EXIT_FIXED
+
+    orb_high = -1.0
+    orb_low = 1e9
+    traded_today = False
+    in_pos = 0
+    sl_price = 0.0
+    tp_price = 0.0
+    held = 0
+
+    for i in range(1, len(closes)):
+        t = times[i]
+        exited = False
+        if day_ids[i] != day_ids[i - 1]:
+            orb_high = -1.0
+            orb_low = 1e9
+            traded_today = False
+            if in_pos != 0:
+                exits[i] = EXIT_DAY
+                fills[i] = closes[i]
+                exited = True
+            in_pos = 0
+
+        if t >= start_min and t < end_min:
+            if orb_high == -1.0:
+                orb_high = highs[i]
+                orb_low = lows[i]
+            else:
+                if highs[i] > orb_high: orb_high = highs[i]
+                if lows[i] < orb_low: orb_low = lows[i]
+
+        elif t >= end_min and t < exit_min:
+            if in_pos != 0:
+                held += 1
+                if use_ts:
+                    # Trailed from this bar's extreme, as in _orb_fill
+                    if in_pos == 1:
+                        new_sl = highs[i] - atr[i] * sl_mult
+                        if new_sl > sl_price:
+                            sl_price = new_sl
+                    else:
+                        new_sl = lows[i] + atr[i] * sl_mult
+                        if new_sl < sl_price:
+                            sl_price = new_sl
+                if in_pos == 1:
+                    hit_sl = lows[i] <= sl_price
+                    hit_tp = use_tp and highs[i] >= tp_price
+                else:
+                    hit_sl = highs[i] >= sl_price
+                    hit_tp = use_tp and lows[i] <= tp_price
+                if hit_sl and (not hit_tp or _stop_first(in_pos, opens[i], highs[i], lows[i],
+                                                         sl_price, tp_price, tv_ties)):
+                    exits[i] = EXIT_TRAIL if use_ts else EXIT_STOP
+                    fills[i] = _level_fill(-in_pos, opens[i], sl_price)
+                    exited = True
+                elif hit_tp:
+                    exits[i] = EXIT_TARGET
+                    fills[i] = _level_fill(in_pos, opens[i], tp_price)
+                    exited = True
+                elif exit_type == EXIT_TIMED and held >= hold_bars:
+                    exits[i] = EXIT_TIME
+                    fills[i] = closes[i]
+                    exited = True
+                if exited:
+                    in_pos = 0
+
+            # No re-entry on an exit bar: the signal could not show it
+            if in_pos == 0 and not exited and atr[i] > 0:
+                side = _entry_direction(entry, i, closes, orb_high, orb_low, traded_today,
+                                        ema, rsi, upper, lower)
+                if side != 0:
+                    if filter_type == FILTER_EMA:
+                        valid = closes[i] > ema[i] if side > 0 else closes[i] < ema[i]
+                    elif filter_type == FILTER_RVOL:
+                        valid = rvol[i] > RVOL_THRESH
+                    elif filter_type == FILTER_ADX:
+                        valid = adx[i] > ADX_THRESH
+                    else:
+                        valid = True
+                    if valid:
+                        in_pos = side
+                        sl_price = closes[i] - side * atr[i] * sl_mult
+                        tp_price = closes[i] + side * atr[i] * tp_mult
+                        held = 0
+                        traded_today = True
+
+        elif t >= exit_min:
+            if in_pos != 0:
+                exits[i] = EXIT_SESSION
+                fills[i] = closes[i]
+            in_pos = 0
+
+        signals[i] = in_pos
@@ -158,6 +158,8 @@ if (hour == 15 and minute == 45)
         self.atr_max_mult = float(atr_max_mult)
         self.use_adx = use_adx
         self.use_macro_filter = use_macro_filter
+        # 5200 ~= 200 daily bars * 26 (15m bars per 6.5h session)
+        self.history_bars = 5500 if use_macro_filter else (max(self.ema_filter, self.atr_filter) + 100)
         self.use_rvol = use_rvol
         self.rvol_thresh = float(rvol_thresh)
         self.use_chop_filter = False # params.get('use_chop_filter', False) - passed in kwargs usually
@@ -189,9 +191,7 @@ if (hour == 15 and minute == 45)
             return
 
         # 3. Indicators (Need History)
-        # 5200 ~= 200 daily bars * 26 (15m bars per 6.5h session)
-        req_history = 5500 if self.use_macro_filter else (max(self.ema_filter, self.atr_filter) + 100)
-        bars = self.bars.get_latest_bars(symbol, N=req_history)
+        bars = self.bars.get_latest_bars(symbol, N=self.history_bars)
         if len(bars) < max(self.ema_filter, self.atr_filter) + 5: return
         
         from src.backtesting import ta
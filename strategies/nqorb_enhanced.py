@@ -43,6 +43,8 @@ class NqOrbEnhanced(NqOrb15m):
         self.daily_sma_cache = 0.0
         self.daily_sma_50_cache = 0.0
         self.cache_date = None
+        # Bars fetched for the daily SMA recalculation (see calculate_signals)
+        self.history_bars = 10000 if use_htf else 500
 
     def on_fill(self, event):
         from backtesting.schema import OrderSide
@@ -133,7 +135,7 @@ class NqOrbEnhanced(NqOrb15m):
         # Optimize Lookback: Only fetch 10000 bars if we need to recalculate Daily SMA (once per day)
         # Otherwise, just need enough for EMA/ATR (e.g. 500)
         need_htf_recalc = self.use_htf and (self.cache_date != ts.date())
-        lookback = 10000 if need_htf_recalc else 500
+        lookback = self.history_bars if need_htf_recalc else 500
         
         bars = self.bars.get_latest_bars(symbol, N=lookback)
         if len(bars) < 100:
@@ -248,15 +248,19 @@ def temp_sandbox_dir():
 # ============================================
 
 @pytest.fixture
-def mock_gpu_unavailable():
+def mock_gpu_unavailable(monkeypatch):
     """Mock GPU as unavailable for consistent CPU-only testing."""
-    with patch.dict('sys.modules', {'cudf': None, 'cupy': None}):
-        try:
-            from backtesting import accelerate
-            with patch.object(accelerate, 'GPU_AVAILABLE', False):
-                yield
-        except ImportError:
+    # setitem restores just these keys; patch.dict would also unload every
+    # module first imported during the test (e.g. numba internals loaded by
+    # a JIT compile), which breaks later compiles in the same process
+    monkeypatch.setitem(sys.modules, 'cudf', None)
+    monkeypatch.setitem(sys.modules, 'cupy', None)
+    try:
+        from backtesting import accelerate
+        with patch.object(accelerate, 'GPU_AVAILABLE', False):
             yield
+    except ImportError:
+        yield
 
 
 @pytest.fixture
@@ -0,0 +1,315 @@
+"""
+Tests for the columnar bar cache and its SmartDataHandler integration.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _write_offset_csv(path, periods=50):
+    """CSV in the A2API format: ET wall clock with a UTC offset suffix."""
+    index = pd.date_range('2024-01-02 09:30', periods=periods, freq='5min')
+    rng = np.random.default_rng(7)
+    close = 17000 + np.cumsum(rng.normal(0, 5, periods))
+    df = pd.DataFrame({
+        'time': [f"{ts:%Y-%m-%d %H:%M:%S} -05:00" for ts in index],
+        'open': close + 1.0,
+        'high': close + 3.0,
+        'low': close - 3.0,
+        'close': close,
+        'volume': rng.integers(100, 1000, periods),
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+class TestBarCache:
+    """Tests for BarCache storage and invalidation."""
+
+    def test_round_trip_preserves_frame(self, tmp_path):
+        """Stored frames should load back identically."""
+        from backtesting.bar_cache import BarCache
+
+        src = tmp_path / 'NQ.csv'
+        src.write_text('placeholder')
+        df = pd.DataFrame({
+            'Open': [1.0, 2.0], 'Close': [1.5, 2.5], 'Volume': [10, 20],
+        }, index=pd.DatetimeIndex(['2024-01-02 09:30', '2024-01-02 09:35'], name='Time'))
+
+        cache = BarCache(str(tmp_path / 'cache'))
+        assert cache.store(str(src), df)
+        loaded = cache.load(str(src))
+
+        pd.testing.assert_frame_equal(loaded, df)
+
+    def test_modified_source_invalidates_entry(self, tmp_path):
+        """A changed source file should read as a cache miss."""
+        from backtesting.bar_cache import BarCache
+
+        src = tmp_path / 'NQ.csv'
+        src.write_text('a,b\n1,2\n')
+        df = pd.DataFrame({'Close': [1.0]}, index=pd.DatetimeIndex(['2024-01-02']))
+        cache = BarCache(str(tmp_path / 'cache'))
+        cache.store(str(src), df)
+
+        src.write_text('a,b\n1,3\n')
+        os.utime(src, (time.time() + 10, time.time() + 10))
+
+        assert cache.load(str(src)) is None
+
+
+    def test_prune_drops_orphans_and_oldest(self, tmp_path):
+        """Entries of deleted sources go first, then the oldest beyond the bound."""
+        from backtesting.bar_cache import BarCache
+
+        df = pd.DataFrame({'Close': [1.0]}, index=pd.DatetimeIndex(['2024-01-02']))
+        cache = BarCache(str(tmp_path / 'cache'), max_entries=2)
+        sources = []
+        for i, name in enumerate(['A.csv', 'B.csv', 'C.csv']):
+            src = tmp_path / name
+            src.write_text('a,b\n1,2\n')
+            sources.append(src)
+            cache.store(str(src), df)
+            manifest = os.path.join(cache.entry_dir(str(src)), 'manifest.json')
+            os.utime(manifest, (1000 + i, 1000 + i))
+        # Storing C pruned the oldest entry (A)
+        assert cache.load(str(sources[0])) is None
+        assert cache.load(str(sources[1])) is not None
+
+        sources[1].unlink()
+        assert cache.prune() == 1
+        assert sorted(os.listdir(cache.cache_dir)) == [os.path.basename(cache.entry_dir(str(sources[2])))]
+
+
+class TestSmartDataHandlerCache:
+    """SmartDataHandler should serve reloads from the bar cache."""
+
+    def test_second_load_hits_cache(self, tmp_path):
+        """Cached reload should match the parsed frame without re-reading the CSV."""
+        from backtesting.data import SmartDataHandler
+
+        _write_offset_csv(tmp_path / 'NQ.csv')
+        cache_dir = str(tmp_path / 'cache')
+
+        first = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(pd, 'read_csv', lambda *a, **k: pytest.fail("CSV parsed on cached load"))
+            second = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+
+        pd.testing.assert_frame_equal(first.symbol_data['NQ'], second.symbol_data['NQ'])
+        assert second.symbol_data['NQ'].index[0] == pd.Timestamp('2024-01-02 09:30')
+        assert list(second.symbol_data['NQ'].columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+
+    def test_cache_disabled(self, tmp_path):
+        """use_cache=False should not write any cache entries."""
+        from backtesting.data import SmartDataHandler
+
+        _write_offset_csv(tmp_path / 'NQ.csv')
+        cache_dir = tmp_path / 'cache'
+
+        SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m',
+                         use_cache=False, cache_dir=str(cache_dir))
+
+        assert not cache_dir.exists()
+
+
+class TestStreamingIngestion:
+    """Chunked CSV ingestion and date-range pushdown."""
+
+    def test_writer_rejects_out_of_order_chunks(self, tmp_path):
+        """Appending an older chunk should abort the entry."""
+        from backtesting.bar_cache import BarCache
+
+        src = tmp_path / 'NQ.csv'
+        src.write_text('placeholder')
+        df = pd.DataFrame({'Close': [1.0, 2.0, 3.0, 4.0]},
+                          index=pd.date_range('2024-01-02 09:30', periods=4, freq='5min'))
+        cache = BarCache(str(tmp_path / 'cache'))
+
+        writer = cache.open_writer(str(src))
+        assert writer.append(df.iloc[2:])
+        assert not writer.append(df.iloc[:2])
+        assert not writer.commit()
+        assert cache.load(str(src)) is None
+
+    def test_windowed_cache_read(self, tmp_path):
+        """A windowed load should match filtering the full cached frame."""
+        from backtesting.bar_cache import BarCache
+
+        src = tmp_path / 'NQ.csv'
+        src.write_text('placeholder')
+        df = pd.DataFrame({'Close': np.arange(100.0), 'Volume': np.arange(100)},
+                          index=pd.date_range('2024-01-02 09:30', periods=100, freq='5min'))
+        cache = BarCache(str(tmp_path / 'cache'))
+
+        writer = cache.open_writer(str(src))
+        for i in range(0, 100, 30):
+            writer.append(df.iloc[i:i + 30])
+        assert writer.commit()
+
+        start, end = pd.Timestamp('2024-01-02 10:00'), pd.Timestamp('2024-01-02 11:00')
+        window = cache.load(str(src), start, end)
+        pd.testing.assert_frame_equal(window, df[(df.index >= start) & (df.index <= end)], check_freq=False)
+        pd.testing.assert_frame_equal(cache.load(str(src)), df, check_freq=False)
+
+    def test_chunked_load_matches_full_load(self, tmp_path):
+        """Streaming with a date range should give the same bars as a full load."""
+        from backtesting.data import SmartDataHandler
+
+        _write_offset_csv(tmp_path / 'NQ.csv', periods=200)
+        start, end = '2024-01-02 11:00', '2024-01-02 20:00'
+
+        full = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', use_cache=False)
+        expected = full.symbol_data['NQ']
+        expected = expected[(expected.index >= start) & (expected.index <= end)]
+
+        cached = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', chunk_rows=17,
+                                  start_date=start, end_date=end, cache_dir=str(tmp_path / 'cache'))
+        uncached = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', chunk_rows=17,
+                                    start_date=start, end_date=end, use_cache=False)
+        reloaded = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m',
+                                    start_date=start, end_date=end, cache_dir=str(tmp_path / 'cache'))
+
+        for handler in (cached, uncached, reloaded):
+            pd.testing.assert_frame_equal(handler.symbol_data['NQ'], expected)
+
+    def test_stream_stops_after_end_date(self, tmp_path):
+        """Without a cache to fill, chunks past end_date should not be parsed."""
+        from backtesting.data import SmartDataHandler
+
+        _write_offset_csv(tmp_path / 'NQ.csv', periods=1000)
+        real_read_csv = pd.read_csv
+        chunks_read = []
+
+        def counting_read_csv(*args, **kwargs):
+            for chunk in real_read_csv(*args, **kwargs):
+                chunks_read.append(len(chunk))
+                yield chunk
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(pd, 'read_csv', counting_read_csv)
+            SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', chunk_rows=10,
+                             start_date='2024-01-02', end_date='2024-01-02 10:00', use_cache=False)
+
+        # End date + one-day margin covers ~300 of the 1000 rows
+        assert len(chunks_read) < 40
+
+
+class TestCompressedSources:
+    """Compressed CSV archives are read directly and cached on first touch."""
+
+    @pytest.mark.parametrize('ext', ['.zip', '.gz'])
+    def test_archive_matches_plain_csv(self, tmp_path, ext):
+        """A .csv.zip/.csv.gz source loads the same bars as the plain CSV."""
+        import gzip
+        import zipfile
+        from backtesting.data import SmartDataHandler
+
+        plain_dir, archive_dir = tmp_path / 'plain', tmp_path / 'archive'
+        plain_dir.mkdir()
+        archive_dir.mkdir()
+        _write_offset_csv(plain_dir / 'NQ.csv', periods=120)
+
+        raw = (plain_dir / 'NQ.csv').read_bytes()
+        if ext == '.zip':
+            with zipfile.ZipFile(archive_dir / 'NQ.csv.zip', 'w', zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr('NQ.csv', raw)
+        else:
+            (archive_dir / 'NQ.csv.gz').write_bytes(gzip.compress(raw))
+        cache_dir = str(tmp_path / 'cache')
+
+        expected = SmartDataHandler(['NQ'], search_dirs=[str(plain_dir)], interval='5m', use_cache=False)
+        first = SmartDataHandler(['NQ'], search_dirs=[str(archive_dir)], interval='5m', cache_dir=cache_dir)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(pd, 'read_csv', lambda *a, **k: pytest.fail("archive decompressed on cached load"))
+            second = SmartDataHandler(['NQ'], search_dirs=[str(archive_dir)], interval='5m', cache_dir=cache_dir)
+
+        pd.testing.assert_frame_equal(first.symbol_data['NQ'], expected.symbol_data['NQ'])
+        pd.testing.assert_frame_equal(second.symbol_data['NQ'], expected.symbol_data['NQ'])
+
+
+class TestTailAppend:
+    """A source that only grew is extended in the cache, not re-parsed."""
+
+    @staticmethod
+    def _split_csv(tmp_path, periods=300, keep=200):
+        _write_offset_csv(tmp_path / 'full.csv', periods=periods)
+        lines = (tmp_path / 'full.csv').read_text().splitlines(keepends=True)
+        head, tail = lines[:keep + 1], lines[keep + 1:]
+        (tmp_path / 'NQ.csv').write_text(''.join(head))
+        return ''.join(tail)
+
+    def test_appended_rows_are_parsed_alone(self, tmp_path):
+        """Only the new rows go through the CSV parser on reload."""
+        from backtesting.data import SmartDataHandler
+
+        tail = self._split_csv(tmp_path)
+        cache_dir = str(tmp_path / 'cache')
+        SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+
+        with open(tmp_path / 'NQ.csv', 'a') as f:
+            f.write(tail)
+        os.utime(tmp_path / 'NQ.csv', (time.time() + 10, time.time() + 10))
+
+        real_read_csv = pd.read_csv
+        parsed_rows = []
+
+        def counting_read_csv(*args, **kwargs):
+            for chunk in real_read_csv(*args, **kwargs):
+                parsed_rows.append(len(chunk))
+                yield chunk
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(pd, 'read_csv', counting_read_csv)
+            grown = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+
+        full = SmartDataHandler(['full'], search_dirs=[str(tmp_path)], interval='5m', use_cache=False)
+        assert sum(parsed_rows) == 100
+        pd.testing.assert_frame_equal(grown.symbol_data['NQ'], full.symbol_data['full'])
+
+    def test_rewritten_source_is_rebuilt(self, tmp_path):
+        """Changing already-cached bytes falls back to a full rebuild."""
+        from backtesting.bar_cache import BarCache
+        from backtesting.data import SmartDataHandler
+
+        tail = self._split_csv(tmp_path)
+        cache_dir = str(tmp_path / 'cache')
+        SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+
+        text = (tmp_path / 'NQ.csv').read_text()
+        (tmp_path / 'NQ.csv').write_text(text.replace('2024-01-02 09:30:00', '2024-01-02 09:25:00') + tail)
+
+        assert BarCache(cache_dir).appended_offset(str(tmp_path / 'NQ.csv')) is None
+        handler = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+        assert handler.symbol_data['NQ'].index[0] == pd.Timestamp('2024-01-02 09:25')
+        assert len(handler.symbol_data['NQ']) == 300
+
+    def test_overlapping_append_is_rejected(self, tmp_path):
+        """Appended rows must start after the last cached bar."""
+        from backtesting.data import SmartDataHandler
+
+        self._split_csv(tmp_path)
+        cache_dir = str(tmp_path / 'cache')
+        SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+
+        lines = (tmp_path / 'NQ.csv').read_text().splitlines(keepends=True)
+        with open(tmp_path / 'NQ.csv', 'a') as f:
+            f.write(lines[-1])
+
+        handler = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+        assert len(handler.symbol_data['NQ']) == 201
+
+    def test_is_stale_after_growth(self, tmp_path):
+        """Handlers report when their source file changed."""
+        from backtesting.data import SmartDataHandler
+
+        tail = self._split_csv(tmp_path)
+        handler = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', use_cache=False)
+        assert not handler.is_stale()
+
+        with open(tmp_path / 'NQ.csv', 'a') as f:
+            f.write(tail)
+        assert handler.is_stale()
@@ -0,0 +1,152 @@
+"""
+Tests for the read-only BarFrame handed to the vector strategies.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(days=5, seed=3):
+    idx = pd.date_range('2024-01-02', periods=days * 288, freq='5min')
+    rng = np.random.default_rng(seed)
+    close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+    return pd.DataFrame({
+        'Open': close, 'High': close + rng.uniform(0, 10, len(idx)),
+        'Low': close - rng.uniform(0, 10, len(idx)), 'Close': close,
+        'Volume': rng.integers(100, 5000, len(idx)).astype(float),
+    }, index=idx)
+
+
+class TestBarFrame:
+    """Construction, read-only views and slicing."""
+
+    def test_from_frame_views_float_columns_read_only(self):
+        """Float64 columns are viewed, not copied, and cannot be written."""
+        from backtesting.bar_frame import BarFrame
+
+        df = _frame(days=1)
+        bars = BarFrame.from_frame(df)
+
+        assert np.shares_memory(bars.close, df['Close'].to_numpy())
+        for arr in (bars.open, bars.high, bars.low, bars.close, bars.volume):
+            assert arr.dtype == np.float64 and arr.flags.c_contiguous
+            assert not arr.flags.writeable
+        with pytest.raises(ValueError):
+            bars.close[0] = 0.0
+        pd.testing.assert_series_equal(bars['close'], df['Close'])
+
+    def test_column_fallbacks(self):
+        """Any capitalization; missing high/low -> close, missing volume -> 1.0."""
+        from backtesting.bar_frame import BarFrame
+
+        idx = pd.date_range('2024-01-02', periods=4, freq='5min')
+        bars = BarFrame.from_frame(pd.DataFrame({'close': [1, 2, 3, 4]}, index=idx))
+
+        np.testing.assert_array_equal(bars.high, [1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(bars.volume, np.ones(4))
+        with pytest.raises(KeyError):
+            BarFrame.from_frame(pd.DataFrame({'open': [1.0]}))
+
+    def test_select_and_cached_sessions(self):
+        """Slices share memory; sessions and fingerprints are computed once."""
+        from backtesting.bar_frame import BarFrame
+        from backtesting.sessions import session_index
+
+        df = _frame(days=2)
+        bars = BarFrame.from_frame(df)
+        head = bars.select(slice(0, 288))
+
+        assert len(head) == 288 and np.shares_memory(head.close, bars.close)
+        assert bars.select(bars.index >= df.index[100]).index[0] == df.index[100]
+        assert bars.sessions is session_index(df.index)
+        assert bars.fingerprint('Close') is bars.fingerprint('close')
+
+    def test_window_uses_views_on_sorted_index(self):
+        """Sorted indexes give inclusive views; unsorted ones fall back to a mask."""
+        from backtesting.bar_frame import BarFrame, window_bounds, window_frame
+
+        df = _frame(days=3)
+        bars = BarFrame.from_frame(df)
+        start, end = df.index[300], df.index[500]
+        expected = df[(df.index >= start) & (df.index <= end)]
+
+        window = bars.window(start, end)
+        assert np.shares_memory(window.close, bars.close)
+        pd.testing.assert_frame_equal(window.to_frame(), expected, check_freq=False)
+        assert np.shares_memory(window_frame(df, start, end)['Close'].to_numpy(), df['Close'].to_numpy())
+        assert window_bounds(df.index, end=df.index[0] - pd.Timedelta('1D')) == slice(0, 0)
+
+        shuffled = df.iloc[::-1]
+        rows = window_bounds(shuffled.index, start, end)
+        assert not isinstance(rows, slice) and rows.sum() == len(expected)
+
+
+    def test_astype_float32(self):
+        """astype copies into read-only float32 arrays; same dtype returns self."""
+        from backtesting.bar_frame import BarFrame
+
+        bars = BarFrame.from_frame(_frame(days=1))
+        reduced = bars.astype(np.float32)
+
+        assert bars.astype(np.float64) is bars and reduced.astype('float32') is reduced
+        assert reduced.dtype == np.float32 and not reduced.close.flags.writeable
+        np.testing.assert_allclose(reduced.close, bars.close, rtol=1e-7)
+        assert reduced.select(slice(0, 10)).dtype == np.float32
+
+
+class TestStrategiesOnBarFrames:
+    """Strategies and the engine leave the caller's data untouched."""
+
+    @pytest.mark.parametrize('strategy', ['orb', 'overnight', 'ma'])
+    def test_run_does_not_modify_dataframe(self, strategy):
+        """engine.run(df) keeps df's columns and matches engine.run(bars)."""
+        from backtesting.bar_frame import BarFrame
+        from backtesting.vector_engine import VectorEngine, VectorizedMA, VectorizedNQORB, VectorizedOvernight
+
+        strategies = {
+            'orb': lambda: VectorizedNQORB(ema_filter=10, use_rvol=True, rvol_thresh=0.5),
+            'overnight': lambda: VectorizedOvernight(ema_filter=10),
+            'ma': lambda: VectorizedMA(short_window=5, long_window=20),
+        }
+        df = _frame().drop(columns='Volume')
+        before = df.copy()
+        engine = VectorEngine(strategies[strategy](), commission=2.0)
+
+        from_df = engine.run(df)
+        from_bars = engine.run(BarFrame.from_frame(df))
+
+        pd.testing.assert_frame_equal(df, before)
+        pd.testing.assert_series_equal(from_df['equity_curve'], from_bars['equity_curve'])
+        np.testing.assert_array_equal(from_df['trades'], from_bars['trades'])
+
+    def test_backtester_reuses_bars_for_date_windows(self, tmp_path):
+        """backtest_strategy windows the shared bars instead of copying the frame."""
+        from backtesting.stage2_rigorous_backtest import RigorousBacktester
+
+        df = _frame()
+        backtester = RigorousBacktester(config={'db_path': str(tmp_path / 'runs.db')})
+        backtester._dataframe = df
+        backtester.start_date = str(df.index[288].date())
+        idea = {'strategy_name': 'orb', 'archetype': 'orb_breakout'}
+
+        result = backtester.backtest_strategy(idea)
+
+        assert result['status'] == 'completed'
+        assert np.shares_memory(backtester._bars.close, df['Close'].to_numpy())
+        assert len(result['equity_curve_raw']) == len(df) - 288
+
+    def test_backtest_strategy_date_overrides(self, tmp_path):
+        """Per-run start/end dates window the bars without touching the backtester."""
+        from backtesting.stage2_rigorous_backtest import RigorousBacktester
+
+        df = _frame()
+        backtester = RigorousBacktester(config={'db_path': str(tmp_path / 'runs.db')})
+        backtester._dataframe = df
+        idea = {'strategy_name': 'orb', 'archetype': 'orb_breakout'}
+        start, end = str(df.index[288].date()), str(df.index[3 * 288].date())
+
+        result = backtester.backtest_strategy(idea, start_date=start, end_date=end)
+
+        assert result['status'] == 'completed'
+        assert len(result['equity_curve_raw']) == 2 * 288 + 1  # end date is inclusive (midnight bar)
+        assert backtester.start_date != start
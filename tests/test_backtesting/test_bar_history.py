@@ -0,0 +1,107 @@
+"""
+Tests for the bounded per-symbol bar history.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _bars(n, symbol='NQ'):
+    from backtesting.schema import Bar
+
+    index = pd.date_range('2024-01-02 09:30', periods=n, freq='1min')
+    return [Bar(symbol, ts, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, float(i)) for i, ts in enumerate(index)]
+
+
+class TestBarHistory:
+    """Tests for BarHistory / BarWindow."""
+
+    def test_window_matches_list_tail(self):
+        """Across many compactions, window(N) equals the tail of the full list."""
+        from backtesting.bar_history import BarHistory
+
+        history = BarHistory(capacity=50)
+        bars = _bars(537)
+        for i, bar in enumerate(bars):
+            history.append(bar)
+            if i % 37 == 0:
+                assert history.window(20) == bars[:i + 1][-20:]
+
+        assert len(history) == 50
+        assert history.latest() is bars[-1]
+        assert history.window(50) == bars[-50:]
+        assert history.window(500) == bars[-50:]
+
+    def test_field_views_are_zero_copy_and_read_only(self):
+        """Field arrays are read-only views of the ring buffer."""
+        from backtesting.bar_history import BarHistory
+
+        history = BarHistory(capacity=10)
+        bars = _bars(25)
+        for bar in bars:
+            history.append(bar)
+        window = history.window(5)
+
+        np.testing.assert_array_equal(window.close, [b.close for b in bars[-5:]])
+        assert window.close.base is not None
+        assert not window.close.flags.writeable
+        assert list(window.timestamps) == [b.timestamp for b in bars[-5:]]
+        assert window[-1] is bars[-1]
+        assert window[1:3] == bars[-4:-2]
+
+    def test_reserve_keeps_bars(self):
+        """Growing the capacity keeps the retained bars."""
+        from backtesting.bar_history import BarHistory
+
+        history = BarHistory(capacity=5)
+        bars = _bars(12)
+        for bar in bars[:8]:
+            history.append(bar)
+        history.reserve(20)
+        for bar in bars[8:]:
+            history.append(bar)
+
+        assert history.window(20) == bars[-9:]
+
+
+class TestHandlerHistory:
+    """Data handlers keep O(capacity) history."""
+
+    def test_memory_handler_history_is_bounded(self):
+        """get_latest_bars works past the capacity without growing storage."""
+        from backtesting.data import MemoryDataHandler
+
+        df = pd.DataFrame({
+            'Open': np.arange(300.0), 'High': np.arange(300.0) + 1,
+            'Low': np.arange(300.0) - 1, 'Close': np.arange(300.0), 'Volume': np.ones(300),
+        }, index=pd.date_range('2024-01-02', periods=300, freq='1min'))
+        handler = MemoryDataHandler({'NQ': df}, history=32)
+        while handler.update_bars():
+            pass
+
+        bars = handler.get_latest_bars('NQ', N=10)
+        assert [b.close for b in bars] == list(np.arange(290.0, 300.0))
+        assert len(handler.latest_symbol_data['NQ']) == 32
+
+        handler.reserve_history(100)
+        assert handler.latest_symbol_data['NQ'].capacity == 100
+
+    def test_window_past_dropped_bars_raises(self):
+        """A window longer than the retained bars raises once bars were dropped, without growing."""
+        from backtesting.data import MemoryDataHandler
+
+        df = pd.DataFrame({
+            'Open': np.arange(50.0), 'High': np.arange(50.0) + 1,
+            'Low': np.arange(50.0) - 1, 'Close': np.arange(50.0), 'Volume': np.ones(50),
+        }, index=pd.date_range('2024-01-02', periods=50, freq='1min'))
+        handler = MemoryDataHandler({'NQ': df}, history=32)
+        for _ in range(10):
+            handler.update_bars()
+        assert len(handler.get_latest_bars('NQ', N=40)) == 10  # nothing dropped yet
+
+        while handler.update_bars():
+            pass
+        assert len(handler.get_latest_bars('NQ', N=32)) == 32
+        with pytest.raises(ValueError, match='history_bars'):
+            handler.get_latest_bars('NQ', N=40)
+        assert handler.latest_symbol_data['NQ'].capacity == 32
@@ -0,0 +1,99 @@
+"""
+Tests for the multi-timeframe bar pyramid.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _minute_bars(start='2024-01-02 00:00', days=3):
+    """Continuous 1m OHLCV bars (naive ET wall clock)."""
+    index = pd.date_range(start, periods=days * 1440, freq='1min')
+    rng = np.random.default_rng(11)
+    close = 17000 + np.cumsum(rng.normal(0, 2, len(index)))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 1, len(index)),
+        'High': close + 3.0,
+        'Low': close - 3.0,
+        'Close': close,
+        'Volume': rng.integers(1, 100, len(index)).astype(float),
+    }, index=index)
+
+
+class TestBarPyramid:
+    """Tests for resample_bars / build_pyramid."""
+
+    def test_interval_parsing(self):
+        """Intervals should map to minutes and pandas frequencies."""
+        from backtesting.bar_pyramid import interval_minutes, interval_to_freq
+
+        assert interval_minutes('15m') == 15
+        assert interval_minutes('1h') == 60
+        assert interval_minutes('1d') == 1440
+        assert interval_minutes('1wk') is None
+        assert interval_to_freq('15m') == '15min'
+        assert interval_to_freq('4h') == '4h'
+
+    def test_cascade_matches_direct_resample(self):
+        """Every cascaded level should equal resampling the 1m base directly."""
+        from backtesting.bar_pyramid import build_pyramid, resample_bars
+
+        base = _minute_bars()
+        pyramid = build_pyramid(base)
+
+        assert set(pyramid) == {'5m', '15m', '30m', '1h', '1d'}
+        for level, bars in pyramid.items():
+            pd.testing.assert_frame_equal(bars, resample_bars(base, level), check_freq=False)
+
+    def test_sub_hour_levels_match_legacy_resample(self):
+        """Sub-hour levels keep the historical midnight-anchored bins."""
+        from backtesting.bar_pyramid import resample_bars
+
+        base = _minute_bars()
+        legacy = base.resample('15min').apply({
+            'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum',
+        }).dropna()
+
+        pd.testing.assert_frame_equal(resample_bars(base, '15m'), legacy)
+
+    def test_session_alignment(self):
+        """Hourly bars start at :30; daily bars run 18:00 -> 18:00."""
+        from backtesting.bar_pyramid import resample_bars
+
+        base = _minute_bars()
+        hourly = resample_bars(base, '1h')
+        assert pd.Timestamp('2024-01-02 09:30') in hourly.index
+        assert (hourly.index.minute == 30).all()
+
+        daily = resample_bars(base, '1d')
+        session = base.loc['2024-01-02 18:00':'2024-01-03 17:59']
+        bar = daily.loc[pd.Timestamp('2024-01-03')]
+        assert bar['Open'] == session['Open'].iloc[0]
+        assert bar['Close'] == session['Close'].iloc[-1]
+        assert bar['Volume'] == session['Volume'].sum()
+
+
+class TestSmartDataHandlerPyramid:
+    """SmartDataHandler should serve other intervals from the stored pyramid."""
+
+    def test_other_interval_served_from_pyramid(self, tmp_path):
+        """After one resampled load, a different interval needs no CSV parse."""
+        from backtesting.data import SmartDataHandler
+        from backtesting.bar_pyramid import resample_bars
+
+        base = _minute_bars(days=2)
+        csv = base.copy()
+        csv.index = [f"{ts:%Y-%m-%d %H:%M:%S} -05:00" for ts in base.index]
+        csv.index.name = 'time'
+        csv.to_csv(tmp_path / 'NQ.csv')
+        cache_dir = str(tmp_path / 'cache')
+
+        SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='5m', cache_dir=cache_dir)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(pd, 'read_csv', lambda *a, **k: pytest.fail("CSV parsed on pyramid load"))
+            handler = SmartDataHandler(['NQ'], search_dirs=[str(tmp_path)], interval='15m',
+                                       cache_dir=cache_dir)
+
+        expected = resample_bars(base, '15m')
+        pd.testing.assert_frame_equal(handler.symbol_data['NQ'], expected,
+                                      check_freq=False, check_names=False, check_dtype=False)
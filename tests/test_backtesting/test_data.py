@@ -204,7 +204,8 @@ class TestSmartDataHandler:
 
         handler = SmartDataHandler(
             symbol_list=['TEST'],
-            search_dirs=[str(tmp_path)]
+            search_dirs=[str(tmp_path)],
+            cache_dir=str(tmp_path / 'cache')
         )
 
         assert 'TEST' in handler.symbol_data
@@ -230,7 +231,8 @@ class TestSmartDataHandler:
             symbol_list=['TEST'],
             search_dirs=[str(tmp_path)],
             start_date=datetime(2024, 1, 10),
-            end_date=datetime(2024, 1, 20)
+            end_date=datetime(2024, 1, 20),
+            cache_dir=str(tmp_path / 'cache')
         )
 
         # Should only have 11 days (10th to 20th inclusive)
@@ -279,3 +279,40 @@ class TestBacktestEngineIntegration:
         if portfolio.trade_log:
             fill_price = portfolio.trade_log[0]['price']
             assert fill_price == 110  # Next bar open
+
+    def test_strategy_lookback_past_default_history(self):
+        """NqOrbEnhanced's 10000-bar HTF lookback runs past DEFAULT_HISTORY without truncation."""
+        from backtesting.bar_history import DEFAULT_HISTORY
+        from backtesting.data import MemoryDataHandler
+        from backtesting.engine import BacktestEngine
+        from backtesting.execution import SimulatedExecutionHandler
+        from backtesting.portfolio import Portfolio
+        from strategies.nqorb_enhanced import NqOrbEnhanced
+
+        # 09:30-09:45 of each day: 15 opening-range bars (no lookback) and
+        # one bar after the range that fetches the history
+        days = pd.bdate_range('2023-01-02', periods=DEFAULT_HISTORY // 16 + 20)
+        idx = pd.DatetimeIndex([day + pd.Timedelta(hours=9, minutes=30 + m) for day in days for m in range(16)])
+        close = 15000 + np.cumsum(np.random.default_rng(0).normal(0, 5, len(idx)))
+        df = pd.DataFrame({'Open': close, 'High': close + 4, 'Low': close - 4, 'Close': close,
+                           'Volume': 1000.0}, index=idx)
+
+        events = Queue()
+        handler = MemoryDataHandler({'NQ': df})
+        fetched = []
+        get_latest_bars = handler.get_latest_bars
+
+        def recording(symbol, N=1):
+            bars = get_latest_bars(symbol, N)
+            fetched.append(len(bars))
+            return bars
+
+        handler.get_latest_bars = recording
+        strategy = NqOrbEnhanced(handler, events, verbose=False)
+        engine = BacktestEngine(handler, strategy, Portfolio(handler, events, initial_capital=100000.0),
+                                SimulatedExecutionHandler(events, handler))
+        engine.run()
+
+        assert len(df) > DEFAULT_HISTORY
+        assert fetched[-1] == len(df)
+        assert handler.latest_symbol_data['NQ'].dropped == 0
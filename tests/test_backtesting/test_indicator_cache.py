@@ -0,0 +1,119 @@
+"""
+Tests for the memoized indicator cache.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(periods=3 * 288, seed=11):
+    idx = pd.date_range('2024-01-02', periods=periods, freq='5min')
+    rng = np.random.default_rng(seed)
+    close = 15000 + np.cumsum(rng.normal(0, 6, periods))
+    return pd.DataFrame({
+        'Open': close, 'High': close + rng.uniform(0, 10, periods),
+        'Low': close - rng.uniform(0, 10, periods), 'Close': close,
+        'Volume': rng.integers(100, 5000, periods).astype(float),
+    }, index=idx)
+
+
+class TestIndicatorCache:
+    """Tests for IndicatorCache keys, bounds and spilling."""
+
+    def test_hit_for_same_data_miss_for_changed_data(self):
+        """Renamed copies hit; changed values or a different window miss."""
+        from backtesting.indicator_cache import IndicatorCache
+
+        cache = IndicatorCache()
+        df = _frame()
+        calls = []
+
+        def ema(close):
+            calls.append(1)
+            return close.ewm(span=10, adjust=False).mean().to_numpy()
+
+        first = cache.get_or_compute('ema', (10,), (df['Close'],), lambda: ema(df['Close']))
+        renamed = df.rename(columns={'Close': 'close'})
+        again = cache.get_or_compute('ema', (10,), (renamed['close'],), lambda: ema(renamed['close']))
+        assert again is first
+        assert not first.flags.writeable
+
+        changed = df['Close'].copy()
+        changed.iloc[5] += 1.0
+        cache.get_or_compute('ema', (10,), (changed,), lambda: ema(changed))
+        window = df['Close'].iloc[1:]
+        cache.get_or_compute('ema', (10,), (window,), lambda: ema(window))
+        cache.get_or_compute('ema', (20,), (df['Close'],), lambda: ema(df['Close']))
+
+        assert len(calls) == 4
+        assert cache.stats()['hits'] == 1
+
+    def test_byte_bound_evicts_and_spills(self, tmp_path):
+        """The oldest entry is evicted past max_bytes and reloaded from disk."""
+        from backtesting.indicator_cache import IndicatorCache
+
+        arrays = [np.full(100, float(i)) for i in range(3)]
+        cache = IndicatorCache(max_bytes=2 * 800, spill_dir=str(tmp_path))
+        for i, arr in enumerate(arrays):
+            cache.get_or_compute('x', (i,), (arr,), lambda arr=arr: arr)
+
+        assert len(cache) == 2
+        assert cache.nbytes <= 1600
+        assert len(list(tmp_path.glob('*.npy'))) == 1
+
+        reloaded = cache.get_or_compute('x', (0,), (arrays[0],), lambda: pytest.fail("recomputed"))
+        np.testing.assert_array_equal(reloaded, arrays[0])
+
+    def test_spill_dir_is_bounded(self, tmp_path):
+        """Spilled files beyond max_spill_bytes are deleted oldest first."""
+        from backtesting.indicator_cache import IndicatorCache
+
+        cache = IndicatorCache(max_bytes=800, spill_dir=str(tmp_path), max_spill_bytes=2000)
+        for i in range(6):
+            arr = np.full(100, float(i))
+            cache.get_or_compute('x', (i,), (arr,), lambda arr=arr: arr)
+
+        assert sum(f.stat().st_size for f in tmp_path.glob('*.npy')) <= 2000
+
+
+class TestStrategiesUseCache:
+    """Vectorized strategies and the regime filter consult the process cache."""
+
+    def test_orb_sweep_reuses_indicators(self):
+        """Varying only kernel scalars recomputes no indicator, signals unchanged."""
+        from backtesting.indicator_cache import configure_indicator_cache, get_indicator_cache
+        from backtesting.vector_engine import VectorizedNQORB
+
+        df = _frame()
+        params = dict(use_htf=True, htf_ma=2, use_rvol=True, use_hurst=True, use_adx=True)
+        configure_indicator_cache()
+        try:
+            first = VectorizedNQORB(sl_atr_mult=1.0, **params).generate_signals(df.copy())
+            misses = get_indicator_cache().misses
+            second = VectorizedNQORB(sl_atr_mult=2.0, **params).generate_signals(df.copy())
+
+            assert get_indicator_cache().misses == misses
+            assert get_indicator_cache().hits >= misses
+
+            configure_indicator_cache()
+            uncached = VectorizedNQORB(sl_atr_mult=2.0, **params).generate_signals(df.copy())
+            pd.testing.assert_series_equal(second, uncached)
+            assert len(first) == len(df)
+        finally:
+            configure_indicator_cache()
+
+    def test_regime_labels_match_uncached(self):
+        """Cached regime labels equal a fresh computation."""
+        from backtesting.indicator_cache import configure_indicator_cache, get_indicator_cache
+        from backtesting.regime import RegimeFilter
+
+        df = _frame()
+        configure_indicator_cache()
+        try:
+            fresh = RegimeFilter(sma_period=20).label_regime(df)
+            cached = RegimeFilter(sma_period=20).label_regime(df)
+
+            assert get_indicator_cache().hits == 2
+            pd.testing.assert_series_equal(fresh, cached)
+        finally:
+            configure_indicator_cache()
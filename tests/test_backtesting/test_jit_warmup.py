@@ -0,0 +1,83 @@
+"""
+Tests for the numba disk cache and kernel warmup.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+
+# A cheap production path through ta_numba, vector_engine (fused equity
+# pass, trade ledger) and metrics_numba; compiling every warmup kernel
+# twice in cold processes takes about a minute
+_PROBE = """
+import json
+from backtesting import jit_warmup, metrics_numba, ta_numba, vector_engine
+df = jit_warmup._warmup_frame()
+h, l, c = (df[col].to_numpy() for col in ('High', 'Low', 'Close'))
+ta_numba.ema(c, 10)
+ta_numba.atr(h, l, c, 14)
+result = vector_engine.VectorEngine(vector_engine.VectorizedMA(short_window=5, long_window=20)).run(df)
+metrics_numba.compute_metrics(result['equity_curve'], result['returns'], trade_returns=result['trades']['net_return'])
+misses = {}
+for module in (metrics_numba, ta_numba, vector_engine):
+    for name in dir(module):
+        stats = getattr(getattr(module, name), 'stats', None)
+        if stats is not None and stats.cache_misses:
+            misses[name] = sum(stats.cache_misses.values())
+print(json.dumps(misses))
+"""
+
+
+def _probe(cache_dir):
+    env = dict(os.environ, NUMBA_CACHE_DIR=str(cache_dir), PYTHONPATH=os.path.abspath(SRC))
+    out = subprocess.run([sys.executable, '-c', _PROBE], env=env, capture_output=True,
+                         text=True, check=True, timeout=300)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class TestJitWarmup:
+    """Tests for warmup_kernels and the persistent JIT cache."""
+
+    @pytest.mark.slow
+    def test_fresh_process_loads_kernels_from_disk(self, tmp_path):
+        """A second process compiles nothing: the probed kernels come from the cache."""
+        pytest.importorskip('numba')
+
+        first = _probe(tmp_path)
+        second = _probe(tmp_path)
+
+        assert {'_ewm_mean', '_fused_fill', '_numba_trade_ledger', '_numba_metrics'} <= set(first)
+        assert second == {}
+
+    def test_production_calls_reuse_warmed_signatures(self):
+        """After warmup, strategy and batch runs trigger no new compilation."""
+        pytest.importorskip('numba')
+        import numpy as np
+        from backtesting import metrics_numba, ta_numba, vector_engine as ve, vector_genome as vg
+        from backtesting.jit_warmup import warmup_kernels, _warmup_frame
+
+        report = warmup_kernels(force=True)
+        assert set(report['kernels']) >= {'orb_logic', 'orb_batch', 'overnight_logic',
+                                          'overnight_batch', 'batch_stats', 'metrics', 'ta.atr'}
+
+        kernels = [getattr(module, name) for module in (ve, vg) for name in dir(module)
+                   if name.startswith('_numba_')]
+        kernels += [getattr(module, name) for module in (ta_numba, metrics_numba) for name in dir(module)
+                    if hasattr(getattr(module, name), 'signatures')]
+        before = [len(k.signatures) for k in kernels]
+
+        df = _warmup_frame(days=5)
+        ve.VectorizedNQORB(use_adx=1, adx_thresh=25, sl_atr_mult=3).generate_signals(df.copy())
+        ve.VectorEngine(ve.VectorizedNQORB()).run_batch(
+            df.copy(), [{'sl_atr_mult': 1}, {'sl_atr_mult': 2, 'use_trailing_stop': True}])
+        ve.VectorizedOvernight(sl_atr_mult=1).generate_signals(df)
+        vg.VectorizedGenome(entry_logic='MA_Cross', exit_logic='Time_Exit').generate_signals(df)
+        ve.VectorEngine(vg.VectorizedGenome()).run_batch(
+            df, [{'entry_logic': 'RSI_Cross'}, {'filter_logic': 'ADX_Regime', 'ema_period': 30}])
+        ta_numba.atr(df['High'].to_numpy().copy(), df['Low'], df['Close'].to_numpy().copy(), 14)
+
+        assert [len(k.signatures) for k in kernels] == before
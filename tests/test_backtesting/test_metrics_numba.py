@@ -0,0 +1,126 @@
+"""
+Tests for the compiled metrics pass against the pandas formulas it replaces.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(days=20, seed=5):
+    idx = pd.date_range('2024-01-02', periods=days * 288, freq='5min')
+    rng = np.random.default_rng(seed)
+    close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+    return pd.DataFrame({
+        'Open': close, 'High': close + rng.uniform(0, 10, len(idx)),
+        'Low': close - rng.uniform(0, 10, len(idx)), 'Close': close,
+        'Volume': rng.integers(100, 5000, len(idx)).astype(float),
+    }, index=idx)
+
+
+def _pandas_metrics(equity, returns, signals, bars_per_year):
+    """The pandas implementation _extract_metrics used before metrics_numba."""
+    clean = returns.dropna()
+    sharpe = float(np.sqrt(bars_per_year) * clean.mean() / clean.std()) if clean.std() > 0 else 0.0
+    peak = equity.cummax()
+    max_dd = float(((equity - peak) / peak.replace(0, np.nan)).fillna(0).min())
+    pos = signals.shift(1).fillna(0)
+    trade_ids = (pos.diff().fillna(0) != 0).cumsum()
+    pnls = returns.groupby(trade_ids).sum()[pos.groupby(trade_ids).first() != 0]
+    return {
+        'sharpe_ratio': sharpe,
+        'max_drawdown': max_dd,
+        'total_trades': len(pnls),
+        'win_trades': int((pnls > 0).sum()),
+        'loss_trades': int((pnls < 0).sum()),
+        'profit_factor': pnls[pnls > 0].sum() / -pnls[pnls < 0].sum(),
+        'equity_returns': equity.pct_change(fill_method=None).dropna().to_numpy(),
+    }
+
+
+class TestComputeMetrics:
+    """compute_metrics matches the pandas formulas."""
+
+    def test_matches_pandas_on_engine_run(self):
+        """Sharpe, drawdown, position-run trades and equity returns agree."""
+        from backtesting.metrics_numba import compute_metrics
+        from backtesting.vector_engine import VectorEngine, VectorizedMA
+
+        result = VectorEngine(VectorizedMA(short_window=5, long_window=20), commission=2.0).run(_frame())
+        equity, returns, signals = result['equity_curve'], result['returns'], result['signals']
+
+        expected = _pandas_metrics(equity, returns, signals, 252 * 78)
+        actual = compute_metrics(equity, returns, signals=signals, bars_per_year=252 * 78)
+
+        assert expected['total_trades'] > 10
+        for key in ('sharpe_ratio', 'max_drawdown', 'profit_factor'):
+            assert actual[key] == pytest.approx(expected[key], rel=1e-9)
+        for key in ('total_trades', 'win_trades', 'loss_trades'):
+            assert actual[key] == expected[key]
+        np.testing.assert_allclose(actual['equity_returns'], expected['equity_returns'], rtol=1e-12)
+
+    def test_nan_gaps_and_ledger_trades(self):
+        """NaN returns/equity/signals are skipped; ledger returns replace grouping."""
+        from backtesting.metrics_numba import compute_metrics
+
+        idx = pd.date_range('2024-01-02', periods=12, freq='4h')
+        returns = pd.Series([0.0, 0.01, np.nan, -0.02, 0.03, 0.0, 0.01, -0.01, np.nan, 0.02, 0.0, -0.005], index=idx)
+        equity = 1e5 * (1 + returns.fillna(0)).cumprod()
+        equity.iloc[[2, 8]] = np.nan
+        signals = pd.Series([1, 1, np.nan, -1, -1, 0, 1, 1, 1, 0, -1, -1], index=idx, dtype=float)
+
+        expected = _pandas_metrics(equity, returns, signals, 252)
+        actual = compute_metrics(equity, returns, signals=signals)
+        for key in ('sharpe_ratio', 'max_drawdown', 'profit_factor'):
+            assert actual[key] == pytest.approx(expected[key], rel=1e-12)
+        assert actual['total_trades'] == expected['total_trades']
+        np.testing.assert_allclose(actual['equity_returns'], expected['equity_returns'], rtol=1e-12)
+
+        ledger = compute_metrics(equity, returns, signals=signals, trade_returns=[0.02, np.nan, -0.01, 0.0])
+        assert (ledger['total_trades'], ledger['win_trades'], ledger['loss_trades']) == (3, 1, 1)
+        assert ledger['win_rate'] == pytest.approx(100 / 3)
+        assert ledger['profit_factor'] == pytest.approx(2.0)
+
+    def test_daily_returns_compound_per_calendar_day(self):
+        """daily_returns equals (1 + r).prod() - 1 grouped by date."""
+        from backtesting.metrics_numba import compute_metrics
+        from backtesting.sessions import session_index
+
+        df = _frame(days=4)
+        returns = df['Close'].pct_change()
+        equity = 1e5 * (1 + returns.fillna(0)).cumprod()
+
+        daily = compute_metrics(equity, returns, day_ids=session_index(df.index).day_ids)['daily_returns']
+        expected = (1 + returns.fillna(0)).groupby(df.index.normalize()).prod() - 1
+
+        pd.testing.assert_series_equal(daily, expected, check_names=False, check_freq=False,
+                                       check_index_type=False, rtol=1e-12)
+
+    def test_empty_inputs(self):
+        """No bars or no returns give zero metrics instead of errors."""
+        from backtesting.metrics_numba import compute_metrics
+
+        assert compute_metrics(np.array([1e5, 1e5]))['sharpe_ratio'] == 0.0
+        metrics = compute_metrics(np.empty(0), np.empty(0), signals=np.empty(0))
+        assert metrics['total_trades'] == 0 and metrics['total_return'] == 0.0
+        assert len(metrics['daily_returns']) == 0
+
+
+class TestExtractMetrics:
+    """RigorousBacktester._extract_metrics uses the compiled pass."""
+
+    def test_reads_ledger_and_reports_daily_returns(self, tmp_path):
+        """Trade counts come from the ledger; daily returns cover every day."""
+        from backtesting.stage2_rigorous_backtest import RigorousBacktester
+        from backtesting.vector_engine import VectorEngine, VectorizedNQORB
+
+        df = _frame()
+        result = VectorEngine(VectorizedNQORB(ema_filter=10, atr_max_mult=4.0)).run(df)
+        backtester = RigorousBacktester(config={'db_path': str(tmp_path / 'runs.db')})
+        metrics = backtester._extract_metrics(result, 'orb')
+
+        trades = result['trades']
+        assert metrics['status'] == 'completed'
+        assert metrics['total_trades'] == len(trades) > 0
+        assert metrics['win_trades'] == int((trades['net_return'] > 0).sum())
+        assert len(metrics['daily_returns']) == 20
+        assert (1 + metrics['daily_returns']).prod() == pytest.approx(1 + metrics['total_return'], rel=1e-12)
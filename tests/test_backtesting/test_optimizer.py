@@ -211,3 +211,112 @@ class TestVectorizedGridSearch:
         assert optimizer.initial_capital == 50000.0
         assert optimizer.n_jobs == 2
         assert optimizer.param_grid == param_grid
+
+    def test_batched_matches_per_combination(self):
+        """Batched grid search returns the same results as one run per combination."""
+        from backtesting.optimizer import VectorizedGridSearch
+        from backtesting.strategy import Strategy
+        from backtesting.vector_engine import VectorizedNQORB
+
+        class NqOrb(Strategy):
+            def calculate_signals(self, event):
+                pass
+
+        idx = pd.date_range('2024-01-02', periods=20 * 288, freq='5min')
+        rng = np.random.default_rng(3)
+        close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+        df = pd.DataFrame({'Open': close, 'High': close + rng.uniform(0, 10, len(idx)),
+                           'Low': close - rng.uniform(0, 10, len(idx)), 'Close': close,
+                           'Volume': 1000.0}, index=idx)
+
+        class FrameHandler:
+            def __init__(self, symbol_list):
+                self.symbol_data = {symbol_list[0]: df.copy()}
+
+        grid = {'sl_atr_mult': [1.0, 2.0], 'tp_atr_mult': [2.0, 4.0], 'atr_max_mult': [4.0]}
+
+        results = []
+        for batched in (True, False):
+            optimizer = VectorizedGridSearch(
+                data_handler_cls=FrameHandler,
+                data_handler_args=(['NQ'],),
+                strategy_cls=NqOrb,
+                param_grid=grid,
+                n_jobs=1,
+                vector_strategy_cls=VectorizedNQORB,
+                batched=batched,
+            )
+            out = optimizer.run().sort_values(['sl_atr_mult', 'tp_atr_mult']).reset_index(drop=True)
+            results.append(out)
+
+        assert len(results[0]) == 4
+        assert 'Error' not in results[0].columns
+        pd.testing.assert_frame_equal(results[0], results[1], rtol=1e-12)
+
+    def test_float32_sweep_reverifies_top_results(self):
+        """float32 sweeps report float64 metrics for the top-K and flag mismatches."""
+        from backtesting.optimizer import VectorizedGridSearch, verify_top_results
+        from backtesting.strategy import Strategy
+        from backtesting.vector_engine import VectorEngine, VectorizedNQORB
+
+        class NqOrb(Strategy):
+            def calculate_signals(self, event):
+                pass
+
+        idx = pd.date_range('2024-01-02', periods=20 * 288, freq='5min')
+        rng = np.random.default_rng(3)
+        close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+        df = pd.DataFrame({'Open': close, 'High': close + rng.uniform(0, 10, len(idx)),
+                           'Low': close - rng.uniform(0, 10, len(idx)), 'Close': close,
+                           'Volume': 1000.0}, index=idx)
+        grid = {'sl_atr_mult': [1.0, 2.0], 'tp_atr_mult': [2.0, 4.0], 'atr_max_mult': [4.0]}
+
+        def search(**kwargs):
+            return VectorizedGridSearch(
+                data_handler_cls=None, data_handler_args=(), data=df, strategy_cls=NqOrb,
+                param_grid=grid, n_jobs=1, vector_strategy_cls=VectorizedNQORB, **kwargs,
+            ).run().set_index(['sl_atr_mult', 'tp_atr_mult'])
+
+        exact = search()
+        reduced = search(dtype=np.float32, verify_top_k=3)
+
+        verified = reduced[reduced['Verified']]
+        assert len(verified) == 3 and not verified['Precision Mismatch'].any()
+        assert sorted(verified['Rank (float32)']) == [1, 2, 3]
+        pd.testing.assert_series_equal(verified['Total Return'], exact.loc[verified.index, 'Total Return'],
+                                       rtol=1e-12)
+        np.testing.assert_allclose(reduced['Total Return (float32)'].dropna(), verified['Total Return'], atol=1e-5)
+
+        # A fabricated float32 result far from its float64 re-run is flagged
+        wrong = [{'sl_atr_mult': 1.0, 'tp_atr_mult': 2.0, 'atr_max_mult': 4.0,
+                  'Total Return': 0.5, 'Sharpe Ratio': 9.0, 'Max Drawdown': 0.0}]
+        flagged = verify_top_results(wrong, grid.keys(), VectorEngine, VectorizedNQORB, 100000.0, df)
+        assert flagged[0]['Precision Mismatch'] and flagged[0]['Total Return (float32)'] == 0.5
+
+    def test_verified_and_unverified_results_share_columns(self):
+        """Results outside the top-K (and failed ones) get the same report columns, as NaN."""
+        from backtesting.optimizer import VERIFIED_METRICS, verify_top_results
+        from backtesting.vector_engine import VectorEngine, VectorizedNQORB
+
+        idx = pd.date_range('2024-01-02', periods=10 * 288, freq='5min')
+        close = 15000 + np.cumsum(np.random.default_rng(5).normal(0, 6, len(idx)))
+        df = pd.DataFrame({'Open': close, 'High': close + 5, 'Low': close - 5, 'Close': close,
+                           'Volume': 1000.0}, index=idx)
+        keys = ('sl_atr_mult', 'tp_atr_mult')
+        results = [{'sl_atr_mult': sl, 'tp_atr_mult': 4.0, 'Total Return': ret, 'Final Equity': 1.0,
+                    'Sharpe Ratio': 0.0, 'Max Drawdown': 0.0}
+                   for sl, ret in [(1.0, 0.3), (1.5, 0.1), (2.0, 0.2), (2.5, -0.1)]]
+        results.append({'sl_atr_mult': 3.0, 'tp_atr_mult': 4.0, 'Total Return': 0.0,
+                        'Final Equity': 1.0, 'Error': 'failed'})
+
+        out = verify_top_results(results, keys, VectorEngine, VectorizedNQORB, 100000.0, df, top_k=2)
+
+        assert [row['Verified'] for row in out] == [True, False, True, False, False]
+        columns = set(out[0])
+        assert all(set(row) == columns for row in out[:4])
+        report = {'Verified', 'Rank (float32)', 'Precision Mismatch'} | {f'{m} (float32)' for m in VERIFIED_METRICS}
+        assert report <= columns and report | {'Error'} <= set(out[4])
+        for row in (out[1], out[3]):
+            assert np.isnan(row['Rank (float32)']) and not row['Precision Mismatch']
+            assert all(np.isnan(row[f'{metric} (float32)']) for metric in VERIFIED_METRICS)
+        assert [out[0]['Rank (float32)'], out[2]['Rank (float32)']] == [1, 2]
@@ -0,0 +1,126 @@
+"""
+Tests for array-backed bar replay.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(rows=10000, volume=True):
+    index = pd.date_range('2024-01-02 09:30', periods=rows, freq='5min')
+    rng = np.random.default_rng(3)
+    close = 17000 + np.cumsum(rng.normal(0, 5, rows))
+    df = pd.DataFrame({
+        'Open': close + 1.0, 'High': close + 3.0, 'Low': close - 3.0, 'Close': close,
+    }, index=index)
+    if volume:
+        df['Volume'] = rng.integers(100, 1000, rows)
+    return df
+
+
+class TestBarReplay:
+    """BarReplay should reproduce the iterrows() bars exactly."""
+
+    def test_matches_iterrows(self):
+        """Every replayed bar should equal the bar built from iterrows()."""
+        from backtesting.replay import BarReplay
+        from backtesting.schema import Bar
+
+        df = _frame()
+        replay = BarReplay('NQ', df)
+        for ts, row in df.iterrows():
+            bar = replay.next_bar()
+            assert bar == Bar('NQ', ts, row['Open'], row['High'], row['Low'], row['Close'], row['Volume'])
+        assert replay.next_bar() is None
+        assert replay.exhausted
+
+    def test_missing_volume_replays_zero(self):
+        """Frames without a Volume column replay volume as 0.0."""
+        from backtesting.replay import BarReplay
+
+        replay = BarReplay('NQ', _frame(rows=3, volume=False))
+        assert [replay.next_bar().volume for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_missing_price_column_raises(self):
+        """A frame without OHLC columns cannot be replayed."""
+        from backtesting.replay import BarReplay
+
+        with pytest.raises(KeyError):
+            BarReplay('NQ', _frame(rows=3).drop(columns=['High']))
+
+    def test_peek_does_not_advance(self):
+        """peek_timestamp reports the next bar without consuming it."""
+        from backtesting.replay import BarReplay
+
+        df = _frame(rows=2)
+        replay = BarReplay('NQ', df)
+        assert replay.peek_timestamp() == df.index[0]
+        assert replay.next_bar().timestamp == df.index[0]
+        assert replay.peek_timestamp() == df.index[1]
+
+
+def _feed(times, start_close=100.0):
+    index = pd.DatetimeIndex(times)
+    close = start_close + np.arange(len(index), dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1,
+                         'Close': close, 'Volume': np.ones(len(index))}, index=index)
+
+
+class TestBarMerger:
+    """Multi-symbol replay should follow timestamps, not row numbers."""
+
+    def test_arrival_emits_in_timestamp_order(self):
+        """A gap in one feed must not shift it against the other."""
+        from backtesting.data import MemoryDataHandler
+
+        nq = _feed(['2024-01-02 09:30', '2024-01-02 09:35', '2024-01-02 09:40'])
+        es = _feed(['2024-01-02 09:30', '2024-01-02 09:40'], start_close=200.0)
+        handler = MemoryDataHandler({'NQ': nq, 'ES': es})
+
+        steps = []
+        while handler.update_bars():
+            steps.append((handler.current_time, list(handler.updated_symbols)))
+
+        assert steps == [
+            (pd.Timestamp('2024-01-02 09:30'), ['NQ', 'ES']),
+            (pd.Timestamp('2024-01-02 09:35'), ['NQ']),
+            (pd.Timestamp('2024-01-02 09:40'), ['NQ', 'ES']),
+        ]
+        assert handler.get_latest_bar('ES').timestamp == pd.Timestamp('2024-01-02 09:40')
+
+    def test_synchronized_forward_fills(self):
+        """Synchronized steps fill missing symbols with the last close."""
+        from backtesting.data import MemoryDataHandler
+
+        nq = _feed(['2024-01-02 09:30', '2024-01-02 09:35', '2024-01-02 09:40'])
+        es = _feed(['2024-01-02 09:30', '2024-01-02 09:40'], start_close=200.0)
+        handler = MemoryDataHandler({'NQ': nq, 'ES': es}, align='synchronized')
+
+        handler.update_bars()
+        handler.update_bars()
+        filled = handler.get_latest_bar('ES')
+
+        assert handler.updated_symbols == ['NQ', 'ES']
+        assert filled.timestamp == pd.Timestamp('2024-01-02 09:35')
+        assert (filled.open, filled.close, filled.volume) == (200.0, 200.0, 0.0)
+        assert len(handler.get_latest_bars('ES', N=10)) == 2
+
+    def test_late_starting_feed_is_not_filled(self):
+        """Symbols are only forward-filled once they have a first bar."""
+        from backtesting.replay import BarMerger, BarReplay
+
+        nq = _feed(['2024-01-02 09:30', '2024-01-02 09:35'])
+        vix = _feed(['2024-01-02 09:35'])
+        merger = BarMerger({'NQ': BarReplay('NQ', nq), 'VIX': BarReplay('VIX', vix)},
+                           align='synchronized')
+
+        assert [b.symbol for b in merger.step()] == ['NQ']
+        assert [b.symbol for b in merger.step()] == ['NQ', 'VIX']
+        assert merger.step() == []
+
+    def test_unknown_policy_raises(self):
+        """Alignment policy names are validated."""
+        from backtesting.replay import BarMerger
+
+        with pytest.raises(ValueError):
+            BarMerger({}, align='lockstep')
@@ -0,0 +1,59 @@
+"""
+Tests for the cached session calendar index.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _index():
+    # Irregular 1m/5m bars across midnight, weekends and a pre-1970 stamp
+    return pd.DatetimeIndex([
+        '1969-12-31 23:55', '2024-01-05 17:55', '2024-01-05 18:00', '2024-01-05 23:59',
+        '2024-01-06 00:00', '2024-01-06 09:29', '2024-01-06 09:30', '2024-01-06 15:59',
+        '2024-01-06 16:00', '2024-01-08 09:30',
+    ])
+
+
+class TestSessionIndex:
+    """Tests for build_session_index / session_index."""
+
+    def test_matches_python_calendar(self):
+        """Vectorized ids should equal the per-bar date/time calculation."""
+        from backtesting.sessions import build_session_index
+
+        index = _index()
+        sessions = build_session_index(index)
+
+        np.testing.assert_array_equal(sessions.day_ids, [d.toordinal() for d in index.date])
+        np.testing.assert_array_equal(sessions.minute_of_day, index.hour * 60 + index.minute)
+        np.testing.assert_array_equal(sessions.day_starts, [0, 1, 4, 9, 10])
+        assert len(build_session_index(index[:0]).day_starts) == 1
+
+    def test_tz_aware_index_uses_wall_clock(self):
+        """A tz-aware index is read in its own timezone, like index.date."""
+        from backtesting.sessions import build_session_index
+
+        index = pd.date_range('2024-03-09 20:00', periods=300, freq='5min', tz='America/New_York')
+        sessions = build_session_index(index)
+
+        np.testing.assert_array_equal(sessions.day_ids, [d.toordinal() for d in index.date])
+        np.testing.assert_array_equal(sessions.minute_of_day, index.hour * 60 + index.minute)
+
+    def test_cached_per_dataset(self):
+        """Renamed copies of a frame share one cached index."""
+        from backtesting.sessions import session_index
+
+        df = pd.DataFrame({'Close': np.arange(10.0)}, index=_index())
+        first = session_index(df)
+
+        assert session_index(df.rename(columns={'Close': 'close'})) is first
+        assert session_index(pd.DatetimeIndex(_index())) is first
+        assert not first.day_ids.flags.writeable
+
+    def test_requires_datetime_index(self):
+        """Non-datetime indexes are rejected."""
+        from backtesting.sessions import session_index
+
+        with pytest.raises(TypeError):
+            session_index(pd.DataFrame({'a': [1, 2]}))
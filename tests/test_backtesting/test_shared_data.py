@@ -0,0 +1,109 @@
+"""
+Tests for shared-memory datasets used by the sweep worker pools.
+"""
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SRC = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+
+# The daemon's order: warm the kernels (launching numba's thread pool for
+# the parallel ORB kernel), then fork a worker pool
+_WARMUP_THEN_POOL = """
+from concurrent.futures import ProcessPoolExecutor
+from backtesting.jit_warmup import _warmup_frame, warmup_kernels
+from backtesting.optimizer import _run_single_vector_backtest
+from backtesting.shared_data import SharedDataset, init_worker
+from backtesting.vector_engine import VectorEngine, VectorizedMA
+
+assert 'orb_trades_parallel' in warmup_kernels(force=True)['kernels']
+with SharedDataset(_warmup_frame()) as shared:
+    with ProcessPoolExecutor(max_workers=2, initializer=init_worker,
+                             initargs=(shared.handle,)) as executor:
+        result = executor.submit(_run_single_vector_backtest, (
+            VectorEngine, VectorizedMA, {'short_window': 5, 'long_window': 20}, 1e5, shared.handle)).result()
+assert 'Error' not in result
+print('ok')
+"""
+
+
+class TestSharedDataset:
+    """Tests for SharedDataset publish/attach."""
+
+    def test_attach_matches_source(self, sample_ohlcv_data):
+        """Attached frame should equal the published frame."""
+        from backtesting.shared_data import SharedDataset, attach_frame
+
+        with SharedDataset(sample_ohlcv_data) as shared:
+            attached = attach_frame(shared.handle)
+            pd.testing.assert_frame_equal(attached, sample_ohlcv_data, check_freq=False)
+            del attached
+
+    def test_views_are_read_only(self, sample_ohlcv_data):
+        """Workers must not be able to write into the shared buffers."""
+        from backtesting.shared_data import SharedDataset, attach_frame
+
+        with SharedDataset(sample_ohlcv_data) as shared:
+            attached = attach_frame(shared.handle)
+            with pytest.raises(ValueError):
+                attached['Close'].to_numpy()[0] = 0.0
+            del attached
+
+    def test_resolve_frame_passes_dataframes_through(self, sample_ohlcv_data):
+        """resolve_frame should return DataFrames untouched."""
+        from backtesting.shared_data import resolve_frame
+
+        assert resolve_frame(sample_ohlcv_data) is sample_ohlcv_data
+
+    def test_pool_workers_receive_handle(self, sample_ohlcv_data, mock_gpu_unavailable):
+        """Vector backtests in worker processes should match in-process runs."""
+        from backtesting.optimizer import _run_single_vector_backtest
+        from backtesting.shared_data import SharedDataset, init_worker
+        from backtesting.vector_engine import VectorEngine, VectorizedMA
+
+        params = {'short_window': 5, 'long_window': 20}
+        expected = _run_single_vector_backtest(
+            (VectorEngine, VectorizedMA, params, 100000.0, sample_ohlcv_data))
+
+        with SharedDataset(sample_ohlcv_data) as shared:
+            with ProcessPoolExecutor(max_workers=2, initializer=init_worker,
+                                     initargs=(shared.handle,)) as executor:
+                result = executor.submit(
+                    _run_single_vector_backtest,
+                    (VectorEngine, VectorizedMA, params, 100000.0, shared.handle)).result()
+
+        assert 'Error' not in result
+        assert result['Final Equity'] == pytest.approx(expected['Final Equity'])
+
+    def test_process_exits_after_warmup_and_pool(self):
+        """Warming the parallel kernels before forking a pool does not hang the parent at exit."""
+        pytest.importorskip('numba')
+        env = dict(os.environ, NUMBA_NUM_THREADS='2', PYTHONPATH=os.path.abspath(SRC))
+        env.pop('NUMBA_THREADING_LAYER', None)
+
+        out = subprocess.run([sys.executable, '-c', _WARMUP_THEN_POOL], env=env, capture_output=True,
+                             text=True, timeout=240)
+
+        assert out.returncode == 0, out.stderr
+        assert out.stdout.strip().splitlines()[-1] == 'ok'
+
+    def test_window_handle_attaches_rows(self, sample_ohlcv_data):
+        """A window handle attaches exactly the rows between its dates."""
+        from backtesting.shared_data import SharedDataset, attach_bars, attach_frame
+
+        idx = sample_ohlcv_data.index
+        start, end = idx[10], idx[30]
+        expected = sample_ohlcv_data[(idx >= start) & (idx <= end)]
+
+        with SharedDataset(sample_ohlcv_data) as shared:
+            window = shared.window(start, end)
+            attached = attach_frame(window)
+            pd.testing.assert_frame_equal(attached, expected, check_freq=False)
+            assert len(window) == len(expected) == len(attach_bars(window))
+            assert len(attach_bars(shared.handle)) == len(sample_ohlcv_data)
+            del attached
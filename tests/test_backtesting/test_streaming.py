@@ -0,0 +1,104 @@
+"""
+Tests for backtests extended with new bars against full recomputation.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(days=12, seed=4):
+    """24h 5-min bars with some afternoons and evenings missing (carried positions, gaps)."""
+    idx = pd.date_range('2024-01-02', periods=days * 288, freq='5min')
+    rng = np.random.default_rng(seed)
+    close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+    df = pd.DataFrame({
+        'Open': close + rng.normal(0, 2, len(idx)),
+        'High': close + rng.uniform(0, 10, len(idx)),
+        'Low': close - rng.uniform(0, 10, len(idx)),
+        'Close': close,
+        'Volume': rng.integers(100, 5000, len(idx)).astype(float),
+    }, index=idx)
+    minute, day = idx.hour * 60 + idx.minute, idx.dayofyear
+    gaps = ((day % 3 == 0) & (minute >= 15 * 60)) | ((day % 4 == 1) & (minute >= 20 * 60) & (minute < 22 * 60))
+    return df[~gaps]
+
+
+def _chunks(df, seed=1):
+    """Random split points plus a run of single bars."""
+    cuts = np.random.default_rng(seed).integers(1, len(df), 30)
+    cuts = np.unique(np.r_[0, cuts, np.arange(1000, 1020), len(df)])
+    return [df.iloc[lo:hi] for lo, hi in zip(cuts[:-1], cuts[1:])]
+
+
+STRATEGIES = {
+    'orb': lambda ve: ve.VectorizedNQORB(ema_filter=10, atr_max_mult=4.0, sl_atr_mult=4.0, tp_atr_mult=8.0),
+    'orb_trailing': lambda ve: ve.VectorizedNQORB(ema_filter=10, atr_max_mult=4.0, use_trailing_stop=True,
+                                                  tie_break=ve.TIE_TV_BROKER_EMULATOR),
+    'overnight': lambda ve: ve.VectorizedOvernight(ema_filter=10),
+    'orb_rvol': lambda ve: ve.VectorizedNQORB(ema_filter=10, use_rvol=True, rvol_thresh=0.5),
+    'ma': lambda ve: ve.VectorizedMA(short_window=5, long_window=20),
+}
+
+
+class TestStreamingBacktest:
+    """Extending bar by bar equals one VectorEngine.run over all bars."""
+
+    @pytest.mark.parametrize('name', sorted(STRATEGIES))
+    def test_matches_full_run(self, name):
+        """Arrays, ledger and metrics equal the full run whatever the chunking."""
+        from backtesting import vector_engine as ve
+        from backtesting.metrics_numba import compute_metrics
+        from backtesting.streaming import StreamingBacktest
+
+        df = _frame()
+        engine = ve.VectorEngine(STRATEGIES[name](ve), commission=2.0)
+        full = engine.run(df)
+        stream = StreamingBacktest(engine, bars_per_year=252 * 78)
+        for chunk in _chunks(df):
+            metrics = stream.extend(chunk)
+        result = stream.result()
+
+        assert stream.incremental == (name not in ('orb_rvol', 'ma'))
+        for key in ('equity_curve', 'returns', 'turnover', 'signals'):
+            pd.testing.assert_series_equal(result[key], full[key], check_freq=False)
+        np.testing.assert_array_equal(result['trades'], full['trades'])
+        assert len(full['trades']) > 5
+
+        expected = compute_metrics(full['equity_curve'], full['returns'],
+                                   trade_returns=full['trades']['net_return'], bars_per_year=252 * 78)
+        for key, value in metrics.items():
+            assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-12), key
+
+    @pytest.mark.parametrize('options', [{'intrabar_fills': False}, {'dtype': np.float32}])
+    def test_engine_options_and_time_zones(self, options):
+        """Close-only fills, float32 runs and tz-aware indexes stream identically."""
+        from backtesting import vector_engine as ve
+        from backtesting.streaming import StreamingBacktest
+
+        df = _frame().tz_localize('America/New_York')
+        for make in (STRATEGIES['orb'], STRATEGIES['overnight']):
+            engine = ve.VectorEngine(make(ve), commission=2.0, **options)
+            full = engine.run(df)
+            stream = StreamingBacktest(engine)
+            for chunk in _chunks(df, seed=2):
+                stream.extend(chunk)
+            result = stream.result()
+
+            pd.testing.assert_series_equal(result['equity_curve'], full['equity_curve'], check_freq=False)
+            np.testing.assert_array_equal(result['trades'], full['trades'])
+
+    def test_replays_only_the_open_session(self):
+        """The kernel resumes within the last day; old or unsorted bars are rejected."""
+        from backtesting import vector_engine as ve
+        from backtesting.streaming import StreamingBacktest
+
+        df = _frame()
+        stream = StreamingBacktest(ve.VectorEngine(STRATEGIES['orb'](ve)))
+        stream.extend(df.iloc[:-100])
+
+        assert len(df) - 100 - stream._resume <= 2 * 288
+        with pytest.raises(ValueError):
+            stream.extend(df.iloc[-150:])
+        with pytest.raises(ValueError):
+            stream.extend(df.iloc[-100:].iloc[::-1])
+        assert len(stream.run(df)['trades']) == len(ve.VectorEngine(STRATEGIES['orb'](ve)).run(df)['trades'])
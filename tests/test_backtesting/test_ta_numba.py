@@ -0,0 +1,112 @@
+"""
+Parity tests: compiled indicators (ta_numba) against the pandas reference (ta).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ES_CSV = os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'backtesting', 'data', 'ES_5m.csv')
+
+
+@pytest.fixture(scope='module')
+def bars():
+    """Real ES 5-minute bars, with a few NaN gaps injected in a copy."""
+    df = pd.read_csv(ES_CSV, parse_dates=['Date'], index_col='Date')
+    gapped = df.copy()
+    gapped.iloc[[0, 1, 50, 51, 52, 300], gapped.columns.get_loc('Close')] = np.nan
+    gapped.iloc[[60, 61], gapped.columns.get_loc('High')] = np.nan
+    return {'clean': df, 'gapped': gapped}
+
+
+def _assert_parity(expected, actual, exact=True):
+    expected = np.asarray(expected, dtype=np.float64)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    if exact:
+        np.testing.assert_array_equal(actual, expected)
+    else:
+        np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-10)
+
+
+class TestRecursiveIndicators:
+    """EWM-based indicators replicate pandas' ewm update bit for bit."""
+
+    @pytest.mark.parametrize('kind', ['clean', 'gapped'])
+    @pytest.mark.parametrize('length', [9, 14, 50, 200])
+    def test_ema_rma(self, bars, kind, length):
+        """EMA and RMA match, including NaN gaps and warmup."""
+        from backtesting import ta, ta_numba
+
+        close = bars[kind]['Close']
+        _assert_parity(ta.ema(close, length), ta_numba.ema(close, length))
+        _assert_parity(ta.rma(close, length), ta_numba.rma(close, length))
+
+    @pytest.mark.parametrize('kind', ['clean', 'gapped'])
+    def test_tr_atr_rsi_adx(self, bars, kind):
+        """True range and the Wilder-smoothed indicators match."""
+        from backtesting import ta, ta_numba
+
+        df = bars[kind]
+        h, l, c = df['High'], df['Low'], df['Close']
+        _assert_parity(ta.tr(h, l, c), ta_numba.tr(h, l, c))
+        _assert_parity(ta.atr(h, l, c, 14), ta_numba.atr(h, l, c, 14))
+        _assert_parity(ta.rsi(c, 14), ta_numba.rsi(c, 14))
+        _assert_parity(ta.adx(h, l, c, 14), ta_numba.adx(h, l, c, 14))
+
+    @pytest.mark.parametrize('kind', ['clean', 'gapped'])
+    def test_resumed_ema_atr(self, bars, kind):
+        """EMA/ATR continued across splits (inside a NaN gap too) equal one pass."""
+        from backtesting import ta_numba
+
+        df = bars[kind]
+        h, l, c = (df[col].to_numpy() for col in ('High', 'Low', 'Close'))
+        ema_state, atr_state, ema, atr = (np.nan, 1.0), (np.nan, 1.0, np.nan), [], []
+        for lo, hi in [(0, 1), (1, 51), (51, 61), (61, 62), (62, len(df))]:
+            out, ema_state = ta_numba.ema_resume(c[lo:hi], 20, ema_state)
+            ema.append(out)
+            out, atr_state = ta_numba.atr_resume(h[lo:hi], l[lo:hi], c[lo:hi], 14, atr_state)
+            atr.append(out)
+
+        _assert_parity(ta_numba.ema(c, 20), np.concatenate(ema))
+        _assert_parity(ta_numba.atr(h, l, c, 14), np.concatenate(atr))
+
+
+class TestWindowIndicators:
+    """Rolling-window indicators match to floating-point noise."""
+
+    @pytest.mark.parametrize('kind', ['clean', 'gapped'])
+    @pytest.mark.parametrize('length', [10, 20])
+    def test_rolling(self, bars, kind, length):
+        """SMA, rolling max/min, efficiency ratio and Bollinger Bands match."""
+        from backtesting import ta, ta_numba
+
+        df = bars[kind]
+        _assert_parity(ta.sma(df['Close'], length), ta_numba.sma(df['Close'], length), exact=False)
+        _assert_parity(ta.rolling_max(df['High'], length), ta_numba.rolling_max(df['High'], length))
+        _assert_parity(ta.rolling_min(df['Low'], length), ta_numba.rolling_min(df['Low'], length))
+        _assert_parity(ta.efficiency_ratio(df['Close'], length),
+                       ta_numba.efficiency_ratio(df['Close'], length), exact=False)
+        for expected, actual in zip(ta.bollinger(df['Close'], length), ta_numba.bollinger(df['Close'], length)):
+            _assert_parity(expected, actual, exact=False)
+
+    @pytest.mark.parametrize('kind', ['clean', 'gapped'])
+    def test_chop_index(self, bars, kind):
+        """Choppiness Index matches, including NaN where the range is flat."""
+        from backtesting import ta, ta_numba
+
+        df = bars[kind]
+        h, l, c = df['High'], df['Low'], df['Close']
+        _assert_parity(ta.chop_index(h, l, c, 14), ta_numba.chop_index(h, l, c, 14), exact=False)
+
+    def test_session_vwap(self, bars):
+        """VWAP resets each calendar day and falls back to close without volume."""
+        from backtesting import ta, ta_numba
+        from backtesting.sessions import session_index
+
+        df = bars['clean']
+        expected = ta.vwap(df['High'], df['Low'], df['Close'], df['Volume'])
+        actual = ta_numba.vwap(df['High'], df['Low'], df['Close'], df['Volume'],
+                               session_index(df.index).day_ids)
+        _assert_parity(expected, actual, exact=False)
+        assert (df['Volume'].to_numpy() == 0).any()
@@ -189,3 +189,445 @@ class TestVectorizedNQORB:
         assert strategy.ema_filter == 100
         assert strategy.sl_atr_mult == 1.5
         assert strategy.tp_atr_mult == 3.0
+
+
+def _intraday_frame(days=30, seed=7):
+    """24h 5-min random walk with enough range for ORB/overnight trades."""
+    idx = pd.date_range('2024-01-02 00:00', periods=days * 288, freq='5min')
+    rng = np.random.default_rng(seed)
+    close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 2, len(idx)),
+        'High': close + rng.uniform(0, 10, len(idx)),
+        'Low': close - rng.uniform(0, 10, len(idx)),
+        'Close': close,
+        'Volume': rng.integers(100, 5000, len(idx)).astype(float),
+    }, index=idx)
+
+
+class TestBatchedRuns:
+    """Parameter-matrix kernels must match one-at-a-time runs exactly."""
+
+    ORB_GRID = [
+        dict(ema_filter=ema, sl_atr_mult=sl, tp_atr_mult=tp, atr_max_mult=4.0, use_trailing_stop=ts)
+        for ema in (10, 30) for sl in (1.0, 2.0) for tp in (2.0, 4.0) for ts in (False, True)
+    ]
+    OVERNIGHT_GRID = [
+        dict(ema_filter=ema, sl_atr_mult=sl, tp_atr_mult=tp, range_minutes=30)
+        for ema in (10, 30) for sl in (1.0, 2.0) for tp in (1.5, 3.0)
+    ]
+
+    @pytest.mark.parametrize('strategy_name, grid', [
+        ('VectorizedNQORB', ORB_GRID),
+        ('VectorizedOvernight', OVERNIGHT_GRID),
+        ('VectorizedMA', [dict(short_window=s, long_window=l) for s in (5, 10) for l in (20, 40)]),
+    ])
+    def test_signal_matrix_rows_match_generate_signals(self, strategy_name, grid):
+        """Row k of the matrix is the k-th strategy's signal series."""
+        from backtesting import vector_engine
+
+        cls = getattr(vector_engine, strategy_name)
+        df = _intraday_frame()
+        matrix = cls.generate_signal_matrix(df.copy(), grid)
+
+        assert matrix.shape == (len(grid), len(df))
+        assert (matrix != 0).any()
+        for k, params in enumerate(grid):
+            expected = cls(**params).generate_signals(df.copy()).to_numpy()
+            np.testing.assert_array_equal(matrix[k], expected)
+
+    def test_run_batch_matches_run(self):
+        """Batched final equity equals VectorEngine.run for every row."""
+        from backtesting.vector_engine import VectorEngine, VectorizedNQORB
+
+        df = _intraday_frame()
+        engine = VectorEngine(VectorizedNQORB(**self.ORB_GRID[0]), initial_capital=50000.0, commission=2.0)
+        batch = engine.run_batch(df.copy(), self.ORB_GRID, batch_rows=5)
+
+        for k, params in enumerate(self.ORB_GRID):
+            single = VectorEngine(VectorizedNQORB(**params), initial_capital=50000.0, commission=2.0)
+            final = single.run(df.copy())['equity_curve'].iloc[-1]
+            assert batch['final_equity'][k] == pytest.approx(final, rel=1e-12)
+            assert batch['total_return'][k] == pytest.approx(final / 50000.0 - 1.0, rel=1e-9)
+
+    def test_run_batch_metrics_match_compute_metrics(self):
+        """Batched Sharpe and drawdown equal compute_metrics on each run()."""
+        from backtesting.metrics_numba import compute_metrics
+        from backtesting.vector_engine import VectorEngine, VectorizedNQORB
+
+        df = _intraday_frame()
+        engine = VectorEngine(VectorizedNQORB(**self.ORB_GRID[0]), commission=2.0)
+        batch = engine.run_batch(df.copy(), self.ORB_GRID, bars_per_year=252 * 78)
+
+        for k, params in enumerate(self.ORB_GRID):
+            result = VectorEngine(VectorizedNQORB(**params), commission=2.0).run(df.copy())
+            metrics = compute_metrics(result['equity_curve'], result['returns'], bars_per_year=252 * 78)
+            assert batch['sharpe_ratio'][k] == pytest.approx(metrics['sharpe_ratio'], rel=1e-9)
+            assert batch['max_drawdown'][k] == pytest.approx(metrics['max_drawdown'], rel=1e-9)
+
+
+class TestParallelOrb:
+    """The per-day parallel ORB kernel must match the serial one exactly."""
+
+    @pytest.mark.parametrize('params', [
+        dict(ema_filter=10, atr_max_mult=4.0),
+        dict(ema_filter=10, atr_max_mult=4.0, use_trailing_stop=True, use_rvol=True, rvol_thresh=0.8),
+    ])
+    def test_matches_serial_kernel(self, params):
+        """Signals, exit reasons and fills agree, including positions carried across days."""
+        from backtesting.bar_frame import BarFrame
+        from backtesting.vector_engine import (
+            VectorizedNQORB, EXIT_DAY, _numba_orb_trades, _numba_orb_trades_parallel)
+
+        full = _intraday_frame(days=20)
+        # Days that stop before the 15:45 exit carry their position into the next day
+        cut = full.between_time('00:00', '15:00').iloc[:3000]
+        for df in (full, cut, cut.iloc[:1]):
+            bars = BarFrame.from_frame(df)
+            strategy = VectorizedNQORB(**params)
+            args = strategy._kernel_args(strategy._kernel_inputs(bars))
+
+            signals, exits, fills = _numba_orb_trades(*args)
+            par_signals, par_exits, par_fills = _numba_orb_trades_parallel(bars.sessions.day_starts, *args)
+
+            np.testing.assert_array_equal(par_signals, signals)
+            np.testing.assert_array_equal(par_exits, exits)
+            np.testing.assert_array_equal(par_fills, fills)
+            if df is cut:
+                assert (exits == EXIT_DAY).any()
+
+    def test_long_runs_use_parallel_kernel(self, monkeypatch):
+        """Above PARALLEL_MIN_BARS with several threads, results are unchanged."""
+        from backtesting import vector_engine as ve
+
+        df = _intraday_frame(days=20)
+        strategy = ve.VectorizedNQORB(ema_filter=10, atr_max_mult=4.0)
+        serial_signals, serial_trades = strategy.generate_signals_and_trades(df)
+
+        calls = []
+        kernel = ve._numba_orb_trades_parallel
+        monkeypatch.setattr(ve, 'PARALLEL_MIN_BARS', 1000)
+        monkeypatch.setattr(ve, '_parallel_threads', 4)
+        monkeypatch.setattr(ve, '_numba_orb_trades_parallel', lambda *a: calls.append(1) or kernel(*a))
+
+        signals, trades = strategy.generate_signals_and_trades(df)
+        pd.testing.assert_series_equal(strategy.generate_signals(df), serial_signals, check_dtype=False)
+
+        assert len(calls) == 2
+        pd.testing.assert_series_equal(signals, serial_signals)
+        for name in trades.dtype.names:
+            np.testing.assert_array_equal(trades[name], serial_trades[name])
+
+
+class TestFusedRun:
+    """The compiled run() must reproduce the pandas reference path."""
+
+    KEYS = ('equity_curve', 'returns', 'turnover', 'signals')
+
+    def _assert_same(self, fused, reference):
+        for key in self.KEYS:
+            pd.testing.assert_series_equal(fused[key], reference[key], check_dtype=False,
+                                           check_names=False, rtol=1e-13, atol=0)
+
+    @pytest.mark.parametrize('strategy_name, params', [
+        ('VectorizedNQORB', dict(ema_filter=10, sl_atr_mult=1.0, tp_atr_mult=2.0, atr_max_mult=4.0)),
+        ('VectorizedOvernight', dict(ema_filter=10, range_minutes=30)),
+        ('VectorizedMA', dict(short_window=5, long_window=20)),
+    ])
+    def test_matches_reference(self, strategy_name, params):
+        """Equity, net returns and turnover match run_reference."""
+        from backtesting import vector_engine
+
+        cls = getattr(vector_engine, strategy_name)
+        df = _intraday_frame()
+        engine = vector_engine.VectorEngine(cls(**params), initial_capital=50000.0, commission=2.0)
+
+        fused = engine.run(df.copy())
+        reference = engine.run_reference(df.copy())
+
+        assert (fused['turnover'] > 0).any()
+        self._assert_same(fused, reference)
+
+    def test_edge_cases_match_reference(self):
+        """NaN signals, NaN/zero prices and missing High/Low follow pandas."""
+        from backtesting.vector_engine import VectorEngine, VectorStrategy
+
+        class Fixed(VectorStrategy):
+            def __init__(self, signals):
+                super().__init__()
+                self.signals = signals
+
+            def generate_signals(self, df):
+                return pd.Series(self.signals, index=df.index)
+
+        df = _intraday_frame(days=1).rename(columns={'Close': 'close'})
+        rng = np.random.default_rng(3)
+        signals = rng.choice([-1.0, 0.0, 1.0, np.nan], size=len(df))
+        df.iloc[[0, 40, 41], df.columns.get_loc('close')] = np.nan
+        df.iloc[[60], df.columns.get_loc('close')] = 0.0
+        df.iloc[[80], df.columns.get_loc('High')] = np.nan
+
+        engine = VectorEngine(Fixed(signals), volatility_factor=0.05)
+        self._assert_same(engine.run(df.copy()), engine.run_reference(df.copy()))
+
+        no_range = df.drop(columns=['High', 'Low'])
+        self._assert_same(engine.run(no_range.copy()), engine.run_reference(no_range.copy()))
+
+
+class TestTradeLedger:
+    """Trade ledgers written from the strategy kernels."""
+
+    def test_orb_ledger_matches_signals_and_equity(self):
+        """One record per entry, kernel exit reasons, returns compound to equity."""
+        from backtesting.vector_engine import (
+            VectorEngine, VectorizedNQORB, EXIT_STOP, EXIT_TARGET, EXIT_SESSION, EXIT_TRAIL)
+
+        df = _intraday_frame(days=20)
+        for use_ts, reasons in ((False, {EXIT_STOP, EXIT_TARGET, EXIT_SESSION}),
+                                (True, {EXIT_TRAIL, EXIT_SESSION})):
+            strategy = VectorizedNQORB(ema_filter=10, atr_max_mult=4.0, use_trailing_stop=use_ts)
+            result = VectorEngine(strategy, commission=2.0).run(df.copy())
+            trades = result['trades']
+            signals = result['signals'].to_numpy()
+
+            entries = np.flatnonzero((signals != 0) & (np.r_[0, signals[:-1]] != signals))
+            np.testing.assert_array_equal(trades['entry_bar'], entries)
+            np.testing.assert_array_equal(trades['side'], signals[entries])
+            assert (signals[trades['exit_bar']] == 0).all()
+            assert set(trades['exit_reason']) <= reasons
+            assert (trades['mae'] >= 0).all() and (trades['mfe'] >= 0).all()
+
+            equity = result['equity_curve']
+            growth = np.prod(1 + trades['net_return'])
+            assert growth == pytest.approx(equity.iloc[-1] / equity.iloc[0], rel=1e-12)
+
+    def test_stop_and_target_exits_touch_their_levels(self):
+        """SL exits have the bar range through the stop; TP exits through the target."""
+        from backtesting.vector_engine import VectorEngine, VectorizedOvernight, EXIT_STOP, EXIT_TARGET
+
+        df = _intraday_frame(days=20)
+        strategy = VectorizedOvernight(ema_filter=10, range_minutes=30, sl_atr_mult=1.0, tp_atr_mult=1.0)
+        trades = VectorEngine(strategy).run(df.copy())['trades']
+        stops = trades[trades['exit_reason'] == EXIT_STOP]
+        targets = trades[trades['exit_reason'] == EXIT_TARGET]
+
+        assert len(stops) and len(targets)
+        # Excursions include the exit bar, which crossed the level
+        assert (stops['mae'] > 0).all()
+        assert (targets['mfe'] > 0).all()
+
+    def test_default_ledger_matches_trade_extractor(self):
+        """Strategies without a kernel get the signal-derived ledger."""
+        from backtesting.vector_engine import VectorEngine, VectorizedMA, EXIT_SIGNAL, EXIT_DATA_END
+        from backtesting.validation_runner import PythonTradeExtractor
+
+        df = _intraday_frame(days=5)
+        result = VectorEngine(VectorizedMA(short_window=5, long_window=20)).run(df.copy())
+        trades = result['trades']
+        expected = PythonTradeExtractor().extract_trades(df, result['signals'])
+        from_ledger = PythonTradeExtractor().from_ledger(df, trades)
+
+        assert len(from_ledger) == len(expected) > 0
+        assert [(t.entry_time, t.exit_time, t.direction) for t in from_ledger] == \
+            [(t.entry_time, t.exit_time, t.direction) for t in expected]
+        assert set(trades['exit_reason'][:-1]) == {EXIT_SIGNAL}
+        assert trades['exit_reason'][-1] in (EXIT_SIGNAL, EXIT_DATA_END)
+
+
+class TestIntrabarFills:
+    """Stop/target exits book at the level (or the gapped open), not the close."""
+
+    @pytest.mark.parametrize('strategy_name, params', [
+        ('VectorizedNQORB', dict(ema_filter=10, sl_atr_mult=1.0, tp_atr_mult=2.0, atr_max_mult=4.0)),
+        ('VectorizedOvernight', dict(ema_filter=10, range_minutes=30, sl_atr_mult=1.0, tp_atr_mult=1.0)),
+    ])
+    def test_exit_prices_and_equity_use_fills(self, strategy_name, params):
+        """Ledger exit prices lie beyond the entry on the right side; run/batch/reference agree."""
+        from backtesting import vector_engine as ve
+
+        df = _intraday_frame(days=20)
+        strategy = getattr(ve, strategy_name)(**params)
+        engine = ve.VectorEngine(strategy, commission=2.0)
+        result = engine.run(df.copy())
+        trades = result['trades']
+        move = trades['side'] * (trades['exit_price'] - trades['entry_price'])
+
+        stops = trades['exit_reason'] == ve.EXIT_STOP
+        targets = trades['exit_reason'] == ve.EXIT_TARGET
+        assert stops.any() and targets.any()
+        assert (move[stops] < 0).all() and (move[targets] > 0).all()
+        assert (trades['exit_price'][stops] != df['Close'].to_numpy()[trades['exit_bar'][stops]]).all()
+
+        reference = engine.run_reference(df.copy())
+        pd.testing.assert_series_equal(result['equity_curve'], reference['equity_curve'],
+                                       check_names=False, rtol=1e-13, atol=0)
+        batch = engine.run_batch(df.copy(), [params])
+        assert batch['final_equity'][0] == pytest.approx(result['equity_curve'].iloc[-1], rel=1e-12)
+
+    def test_close_to_close_mode(self):
+        """intrabar_fills=False books every bar at its close, as before."""
+        from backtesting.vector_engine import VectorEngine, VectorizedNQORB
+
+        df = _intraday_frame(days=20)
+        strategy = VectorizedNQORB(ema_filter=10, atr_max_mult=4.0)
+        closes = VectorEngine(strategy, intrabar_fills=False).run(df.copy())
+        fills = VectorEngine(strategy).run(df.copy())
+
+        gross = df['Close'].pct_change().fillna(0) * closes['signals'].shift(1).fillna(0)
+        untraded = closes['turnover'] == 0
+        np.testing.assert_allclose(closes['returns'][untraded], gross[untraded], rtol=1e-12, atol=1e-15)
+        assert closes['equity_curve'].iloc[-1] != fills['equity_curve'].iloc[-1]
+
+    def test_tie_break_modes(self):
+        """PESSIMISTIC always takes the stop; TV_BROKER_EMULATOR follows the bar path."""
+        from backtesting.vector_engine import (
+            VectorizedNQORB, EXIT_STOP, TIE_TV_BROKER_EMULATOR, _level_fill, _stop_first)
+
+        # Long with stop 95 / target 105 on a bar spanning both
+        assert _stop_first(1, 100.0, 106.0, 94.0, 95.0, 105.0, False)
+        assert not _stop_first(1, 103.0, 106.0, 94.0, 95.0, 105.0, True)   # open nearer the high
+        assert _stop_first(1, 99.0, 106.0, 94.0, 95.0, 105.0, True)        # open nearer the low
+        assert not _stop_first(1, 107.0, 108.0, 94.0, 95.0, 105.0, True)   # gapped past the target
+        assert _stop_first(-1, 103.0, 106.0, 94.0, 105.0, 95.0, True)      # short: high (stop) first
+        assert _level_fill(-1, 93.0, 95.0) == 93.0 and _level_fill(1, 104.0, 105.0) == 105.0
+
+        df = _intraday_frame(days=20)
+        # Tight levels put stop and target inside the same bar
+        params = dict(ema_filter=10, atr_max_mult=4.0, sl_atr_mult=0.1, tp_atr_mult=0.1)
+        pessimistic = VectorizedNQORB(**params).generate_signals_and_trades(df)[1]
+        emulated = VectorizedNQORB(tie_break=TIE_TV_BROKER_EMULATOR, **params).generate_signals_and_trades(df)[1]
+        np.testing.assert_array_equal(emulated['entry_bar'], pessimistic['entry_bar'])
+        assert (emulated['exit_reason'] == EXIT_STOP).sum() < (pessimistic['exit_reason'] == EXIT_STOP).sum()
+        with pytest.raises(ValueError):
+            VectorizedNQORB(tie_break='OPTIMISTIC')
+
+
+class TestFloat32Runs:
+    """Reduced-precision runs stay within float32 rounding of float64 ones."""
+
+    @pytest.mark.parametrize('strategy_name, params', [
+        ('VectorizedNQORB', dict(ema_filter=10, atr_max_mult=4.0, use_rvol=True, rvol_thresh=0.5)),
+        ('VectorizedOvernight', dict(ema_filter=10, range_minutes=30)),
+    ])
+    def test_run_and_batch_match_float64(self, strategy_name, params):
+        """Same trades; final equity within 1e-6 for run() and run_batch()."""
+        from backtesting import vector_engine as ve
+
+        df = _intraday_frame(days=20)
+        cls = getattr(ve, strategy_name)
+        exact = ve.VectorEngine(cls(**params)).run(df)
+        reduced = ve.VectorEngine(cls(**params), dtype=np.float32)
+        result = reduced.run(df)
+
+        np.testing.assert_array_equal(result['trades']['entry_bar'], exact['trades']['entry_bar'])
+        final = exact['equity_curve'].iloc[-1]
+        assert result['equity_curve'].iloc[-1] == pytest.approx(final, rel=1e-6)
+        assert reduced.run_batch(df, [params])['final_equity'][0] == pytest.approx(final, rel=1e-6)
+        with pytest.raises(ValueError):
+            ve.VectorEngine(cls(**params), dtype=np.float16)
+
+
+class TestPrunedRuns:
+    """Runs with PruneBounds stop early only where the full run fails the bound."""
+
+    STRATEGIES = [
+        ('VectorizedNQORB', dict(ema_filter=10, atr_max_mult=4.0)),
+        ('VectorizedNQORB', dict(ema_filter=10, atr_max_mult=4.0, use_trailing_stop=True, use_rvol=True,
+                                 rvol_thresh=0.8)),
+        ('VectorizedOvernight', dict(ema_filter=10, range_minutes=30)),
+        ('VectorizedMA', dict(short_window=5, long_window=20)),
+    ]
+
+    @pytest.mark.parametrize('strategy_name, params', STRATEGIES)
+    def test_unpruned_run_matches_run(self, strategy_name, params, monkeypatch):
+        """Bounds that never fail give run()'s arrays and ledger, carried positions included."""
+        from backtesting import vector_engine as ve
+
+        monkeypatch.setattr(ve, 'PRUNE_BLOCK_BARS', 700)
+        full = _intraday_frame(days=20)
+        # Days that stop before the 15:45 exit carry their position into the next day
+        cut = full.between_time('00:00', '15:00')
+        for df, options in ((full, {}), (cut, {}), (full, {'intrabar_fills': False})):
+            engine = ve.VectorEngine(getattr(ve, strategy_name)(**params), commission=2.0, **options)
+            expected = engine.run(df)
+            result = engine.run(df, prune=ve.PruneBounds(max_drawdown=1.0, min_trades=1))
+
+            assert result['pruned'] is None
+            for key in ('equity_curve', 'returns', 'turnover', 'signals'):
+                pd.testing.assert_series_equal(result[key], expected[key], check_freq=False)
+            np.testing.assert_array_equal(result['trades'], expected['trades'])
+
+    @pytest.mark.parametrize('strategy_name, params', STRATEGIES)
+    def test_pruned_runs_fail_the_full_run_too(self, strategy_name, params, monkeypatch):
+        """A pruned run is a prefix of the full run, which fails the same bound."""
+        from backtesting import vector_engine as ve
+        from backtesting.metrics_numba import compute_metrics
+
+        monkeypatch.setattr(ve, 'PRUNE_BLOCK_BARS', 700)
+        df = _intraday_frame(days=20)
+        engine = ve.VectorEngine(getattr(ve, strategy_name)(**params), commission=2.0)
+        full = engine.run(df)
+        metrics = compute_metrics(full['equity_curve'], full['returns'],
+                                  trade_returns=full['trades']['net_return'])
+
+        verdicts = set()
+        for bounds in (ve.PruneBounds(max_drawdown=-metrics['max_drawdown'] * 0.5),
+                       ve.PruneBounds(max_drawdown=-metrics['max_drawdown']),
+                       ve.PruneBounds(min_trades=metrics['total_trades'] + 1),
+                       ve.PruneBounds(min_trades=metrics['total_trades'])):
+            result = engine.run(df, prune=bounds)
+            stop = len(result['equity_curve'])
+            verdicts.add(result['pruned'])
+
+            pd.testing.assert_series_equal(result['equity_curve'], full['equity_curve'].iloc[:stop],
+                                           check_freq=False)
+            closed = full['trades'][full['trades']['exit_bar'] < stop - 1]
+            np.testing.assert_array_equal(result['trades'][:len(closed)], closed)
+            if result['pruned'] == 'max_drawdown':
+                assert -metrics['max_drawdown'] > bounds.max_drawdown
+            elif result['pruned'] == 'min_trades':
+                assert metrics['total_trades'] < bounds.min_trades
+            else:
+                assert stop == len(df)
+        assert 'max_drawdown' in verdicts and None in verdicts
+
+    def test_trade_capacity(self, monkeypatch):
+        """Strategies open at most MAX_TRADES_PER_DAY trades a day; ORB stops once short of min_trades."""
+        from backtesting import vector_engine as ve
+
+        monkeypatch.setattr(ve, 'PRUNE_BLOCK_BARS', 700)
+        df = _intraday_frame(days=20)
+        for strategy_name, params in self.STRATEGIES[:3]:
+            strategy = getattr(ve, strategy_name)(**params)
+            trades = ve.VectorEngine(strategy).run(df)['trades']
+            days = df.index[trades['entry_bar']].normalize()
+            assert pd.Series(days).value_counts().max() <= strategy.MAX_TRADES_PER_DAY
+
+        # More trades than days: out of reach after the first block
+        engine = ve.VectorEngine(ve.VectorizedNQORB(**self.STRATEGIES[0][1]))
+        result = engine.run(df, prune=ve.PruneBounds(min_trades=21))
+        assert result['pruned'] == 'min_trades'
+        assert len(result['equity_curve']) == 3 * 288
+
+    def test_quality_gates_prune(self, tmp_path, monkeypatch):
+        """batch_backtest's bounds are the gates of both QualityChecker paths."""
+        from backtesting import vector_engine as ve
+        from backtesting.stage2_rigorous_backtest import QualityChecker, RigorousBacktester
+
+        monkeypatch.setattr(ve, 'PRUNE_BLOCK_BARS', 700)
+        checker = QualityChecker({'min_trades': 120, 'max_drawdown': -0.2})
+        bounds = checker.prune_bounds()
+        assert (bounds.max_drawdown, bounds.min_trades) == (0.2, 60)
+
+        df = _intraday_frame(days=20)
+        backtester = RigorousBacktester(config={'db_path': str(tmp_path / 'runs.db')})
+        backtester._dataframe = df
+        backtester.start_date = str(df.index[0].date())
+        idea = {'strategy_name': 'orb', 'archetype': 'orb_breakout'}
+
+        result = backtester.backtest_strategy(idea, prune=bounds)
+
+        assert result['status'] == 'pruned' and result['prune_reason'] == 'min_trades'
+        assert result['pruned_at'] < str(df.index[-1])
+        assert not checker.check(result)[0]
+        assert backtester.backtest_strategy(idea)['status'] == 'completed'
@@ -0,0 +1,175 @@
+"""
+Tests for the genome kernel behind the evolutionary optimizer.
+"""
+import itertools
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _frame(days=15, seed=7):
+    """24h 5-min random walk with enough range for every entry type."""
+    idx = pd.date_range('2024-01-02', periods=days * 288, freq='5min')
+    rng = np.random.default_rng(seed)
+    close = 15000 + np.cumsum(rng.normal(0, 6, len(idx)))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 2, len(idx)),
+        'High': close + rng.uniform(0, 10, len(idx)),
+        'Low': close - rng.uniform(0, 10, len(idx)),
+        'Close': close,
+        'Volume': rng.integers(100, 5000, len(idx)).astype(float),
+    }, index=idx)
+
+
+def _genome(entry, filter_type='None', exit_type='Fixed_RR', **genes):
+    return {'entry_logic': entry, 'filter_logic': filter_type, 'exit_logic': exit_type,
+            'ema_period': 20, 'rsi_period': 7, 'atr_period': 14, 'sl_mult': 1.5, 'tp_mult': 3.0, **genes}
+
+
+class TestEncoding:
+    """Genomes become numeric rows; the block names follow the factory."""
+
+    def test_factory_genomes_encode(self):
+        """Every factory block is known; extra genes are ignored, unknown blocks rejected."""
+        from backtesting.factory import StrategyFactory
+        from backtesting.vector_genome import (ENTRY_TYPES, EXIT_TYPES, FILTER_TYPES, GENOME_FIELDS,
+                                               encode_genome, encode_genomes)
+
+        factory = StrategyFactory()
+        assert tuple(factory.registry['entry_type']) == ENTRY_TYPES
+        assert tuple(factory.registry['filter_type']) == FILTER_TYPES
+        assert tuple(factory.registry['exit_type']) == EXIT_TYPES
+
+        genomes = [factory.generate_random_genome().to_params() for _ in range(20)]
+        rows = encode_genomes(genomes)
+        assert rows.shape == (20, len(GENOME_FIELDS))
+        np.testing.assert_array_equal(rows[0], encode_genome({**genomes[0], 'Total Return': 0.1}))
+        with pytest.raises(ValueError):
+            encode_genome({'entry_logic': 'MACD'})
+
+
+class TestGenomeKernel:
+    """Each block trades as designed; batches match single runs."""
+
+    def test_batch_matches_single_runs(self):
+        """run_batch over every block combination equals one run per genome."""
+        from backtesting.metrics_numba import compute_metrics
+        from backtesting.vector_engine import VectorEngine
+        from backtesting.vector_genome import ENTRY_TYPES, EXIT_TYPES, FILTER_TYPES, VectorizedGenome
+
+        df = _frame(days=8)
+        param_sets = [_genome(*blocks, ema_period=period)
+                      for blocks, period in zip(itertools.product(ENTRY_TYPES, FILTER_TYPES, EXIT_TYPES),
+                                                itertools.cycle([20, 50]))]
+        batch = VectorEngine(VectorizedGenome(), commission=2.0).run_batch(df, param_sets)
+
+        for k, params in enumerate(param_sets):
+            result = VectorEngine(VectorizedGenome(**params), commission=2.0).run(df)
+            metrics = compute_metrics(result['equity_curve'], result['returns'])
+            assert batch['final_equity'][k] == pytest.approx(result['equity_curve'].iloc[-1], rel=1e-12)
+            assert batch['sharpe_ratio'][k] == pytest.approx(metrics['sharpe_ratio'], rel=1e-9, abs=1e-12)
+            assert batch['max_drawdown'][k] == pytest.approx(metrics['max_drawdown'], rel=1e-9, abs=1e-12)
+        assert len(set(np.round(batch['final_equity'], 6))) > len(param_sets) // 2
+
+    @pytest.mark.parametrize('entry', ['RSI_Cross', 'MA_Cross', 'Bollinger_Breakout'])
+    def test_entries_follow_their_indicator(self, entry):
+        """Trades open only where the entry indicator crosses, inside the trading window."""
+        from backtesting import ta_numba
+        from backtesting.vector_engine import VectorEngine
+        from backtesting.vector_genome import (BB_LENGTH, BB_MULT, RSI_OVERBOUGHT, RSI_OVERSOLD,
+                                               VectorizedGenome)
+
+        df = _frame()
+        close = df['Close'].to_numpy()
+        trades = VectorEngine(VectorizedGenome(**_genome(entry))).run(df)['trades']
+        bars, sides = trades['entry_bar'], trades['side']
+
+        if entry == 'RSI_Cross':
+            rsi = ta_numba.rsi(close, 7)
+            up = (rsi[bars - 1] < RSI_OVERSOLD) & (rsi[bars] >= RSI_OVERSOLD)
+            down = (rsi[bars - 1] > RSI_OVERBOUGHT) & (rsi[bars] <= RSI_OVERBOUGHT)
+        elif entry == 'MA_Cross':
+            ema = ta_numba.ema(close, 20)
+            up = (close[bars] > ema[bars]) & (close[bars - 1] <= ema[bars - 1])
+            down = (close[bars] < ema[bars]) & (close[bars - 1] >= ema[bars - 1])
+        else:
+            _, upper, lower = ta_numba.bollinger(close, BB_LENGTH, BB_MULT)
+            up = (close[bars] > upper[bars]) & (close[bars - 1] <= upper[bars - 1])
+            down = (close[bars] < lower[bars]) & (close[bars - 1] >= lower[bars - 1])
+
+        minutes = df.index.hour * 60 + df.index.minute
+        assert len(trades) > 20
+        assert np.all(np.where(sides > 0, up, down))
+        assert np.all((minutes[bars] >= 9 * 60 + 45) & (minutes[bars] < 15 * 60 + 45))
+
+    def test_exit_blocks(self):
+        """Time exits close after hold_bars, trailing stops never take profit, filters cut trades."""
+        from backtesting.vector_engine import (EXIT_DAY, EXIT_SESSION, EXIT_STOP, EXIT_TIME,
+                                               EXIT_TRAIL, VectorEngine)
+        from backtesting.vector_genome import VectorizedGenome
+
+        df = _frame()
+
+        def trades(**genes):
+            return VectorEngine(VectorizedGenome(**_genome('MA_Cross', **genes))).run(df)['trades']
+
+        timed = trades(exit_type='Time_Exit', hold_bars=6)
+        reasons = timed['exit_reason']
+        assert np.all(timed['exit_bar'][reasons == EXIT_TIME] - timed['entry_bar'][reasons == EXIT_TIME] == 6)
+        assert (reasons == EXIT_TIME).any() and set(reasons) <= {EXIT_TIME, EXIT_STOP, EXIT_SESSION, EXIT_DAY}
+
+        trailed = trades(exit_type='Trailing_ATR')
+        assert set(trailed['exit_reason']) <= {EXIT_TRAIL, EXIT_SESSION, EXIT_DAY}
+
+        assert len(trades(filter_type='ADX_Regime')) < len(trades())
+
+
+class TestEvolutionaryOptimizer:
+    """evaluate_fitness scores every genome with its own blocks."""
+
+    def test_population_scored_in_one_batch(self):
+        """Results equal single VectorizedGenome runs, so entry types differ."""
+        from backtesting.genetic import EvolutionaryOptimizer
+        from backtesting.vector_engine import VectorEngine
+        from backtesting.vector_genome import ENTRY_TYPES, VectorizedGenome
+
+        df = _frame(days=8)
+
+        class Loader:
+            def __init__(self, symbols):
+                self.symbol_data = {symbols[0]: df}
+
+        optimizer = EvolutionaryOptimizer(Loader, (['NQ'],), population_size=4, n_jobs=1)
+        optimizer.population = [optimizer.factory.generate_random_genome() for _ in ENTRY_TYPES]
+        for genome, entry in zip(optimizer.population, ENTRY_TYPES):
+            genome.genes['entry_logic'] = entry
+
+        results = optimizer.evaluate_fitness()
+
+        assert [r['entry_logic'] for r in results] == list(ENTRY_TYPES)
+        for result, genome in zip(results, optimizer.population):
+            single = VectorEngine(VectorizedGenome(**genome.to_params()), 100000.0).run(df)
+            assert result['Final Equity'] == pytest.approx(single['equity_curve'].iloc[-1], rel=1e-12)
+        assert len({round(r['Final Equity'], 6) for r in results}) > 1
+
+    def test_float32_generations_keep_only_genes(self):
+        """A float32 run verifies part of each generation and breeds from genes only."""
+        from backtesting.genetic import EvolutionaryOptimizer
+
+        df = _frame(days=6)
+
+        class Loader:
+            def __init__(self, symbols):
+                self.symbol_data = {symbols[0]: df}
+
+        random.seed(11)
+        optimizer = EvolutionaryOptimizer(Loader, (['NQ'],), population_size=10, generations=3,
+                                          n_jobs=1, dtype=np.float32, verify_top_k=3)
+        best = optimizer.run()
+
+        assert len(optimizer.history) == 3 and len(best) == 1
+        assert 'Rank (float32)' in best.columns
+        for genome in optimizer.population:
+            assert tuple(genome.genes) == optimizer.factory.GENE_KEYS